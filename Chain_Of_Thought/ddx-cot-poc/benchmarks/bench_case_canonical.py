@@ -0,0 +1,104 @@
+# benchmarks/bench_case_canonical.py
+
+"""
+Benchmark: case canonicalisation (src.utils.case_builder).
+
+Generates synthetic ED cases (the vocabulary of bench_case_index, plus a
+temperature), then writes each one out in several layouts the way
+different EHRs and clinicians do: vitals in another order, with other
+labels ("pulse", "sats", "Temp 101.3F") and separators, symptoms shuffled,
+random casing and stray whitespace. Reports how many summaries per minute
+build_case_summary + case_fingerprint produce on one core, and how many
+distinct prompts the variants collapse to with and without
+canonicalisation (the raw summary is the fields joined as-is, which is
+what build_case_summary used to do).
+
+Run:
+    python -m benchmarks.bench_case_canonical --cases 20000 --variants 5
+"""
+
+import argparse
+import random
+import re
+import time
+
+from benchmarks.bench_case_index import _case
+from src.utils.case_builder import build_case_summary, case_fingerprint
+
+HR_LABELS = ["HR {}", "HR: {}", "pulse {}", "{} bpm", "heart rate {}"]
+BP_LABELS = ["BP {}/{}", "BP: {} / {}", "{}/{} mmHg", "blood pressure {}/{}"]
+RR_LABELS = ["RR {}", "RR={}", "resp rate {}", "{} breaths/min"]
+SPO2_LABELS = ["SpO2 {}%", "sats {}%", "O2 sat {} %", "SpO2: {}"]
+
+
+def _with_vitals(case, rng: random.Random):
+    case = dict(case)
+    rr, spo2, hr, sbp, dbp = (int(n) for n in re.findall(r"\b\d+", case["vitals"]))
+    case["vitals_values"] = {"T": rng.choice([36.8, 37.4, 38.2, 38.9, 39.5]), "HR": hr, "BP": (sbp, dbp), "RR": rr,
+                             "SpO2": spo2}
+    return case
+
+
+def _layout(case, rng: random.Random):
+    values = case["vitals_values"]
+    celsius = values["T"]
+    temperature = rng.choice(
+        [f"T {celsius}", f"Temp {celsius}C", f"{celsius} °C", f"temp {celsius * 9 / 5 + 32:.1f}F"]
+    )
+    vitals = [
+        temperature,
+        rng.choice(HR_LABELS).format(values["HR"]),
+        rng.choice(BP_LABELS).format(*values["BP"]),
+        rng.choice(RR_LABELS).format(values["RR"]),
+        rng.choice(SPO2_LABELS).format(values["SpO2"]),
+    ]
+    rng.shuffle(vitals)
+    symptoms = case["symptoms"].split(", ")
+    rng.shuffle(symptoms)
+
+    def noisy(text):
+        text = text[:1].upper() + text[1:] if rng.random() < 0.5 else text
+        return text + rng.choice(["", " ", ".", "  "])
+
+    return {
+        "age": case["age"],
+        "sex": rng.choice({"male": ["male", "Male", "M"], "female": ["female", "Female", "F"]}[case["sex"]]),
+        "chief_complaint": noisy(case["chief_complaint"]),
+        "symptoms": rng.choice([", ", ",", "; "]).join(noisy(s) for s in symptoms),
+        "vitals": rng.choice([", ", " ", "; "]).join(vitals),
+        "history": noisy(case["history"]),
+    }
+
+
+def _raw_summary(case) -> str:
+    return " ".join(f"{field}: {value}" for field, value in case.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--variants", type=int, default=5, help="layouts written per case")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over all variants (best is reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = [_with_vitals(_case(rng), rng) for _ in range(args.cases)]
+    variants = [_layout(case, rng) for case in cases for _ in range(args.variants)]
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        fingerprints = [case_fingerprint(build_case_summary(v)) for v in variants]
+        best = min(best, time.perf_counter() - start)
+
+    raw = len({_raw_summary(v) for v in variants})
+    canonical = len(set(fingerprints))
+    print(f"cases={args.cases} variants={len(variants)}")
+    print(f"canonicalise + fingerprint: {best / len(variants) * 1e6:.1f} us/summary, "
+          f"{len(variants) / best * 60 / 1e6:.2f}M summaries/min")
+    print(f"distinct prompts: raw={raw} canonical={canonical} (ideal {args.cases})")
+
+
+if __name__ == "__main__":
+    main()
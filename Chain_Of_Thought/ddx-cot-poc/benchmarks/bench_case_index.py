@@ -0,0 +1,142 @@
+# benchmarks/bench_case_index.py
+
+"""
+Benchmark: near-duplicate case lookup (src.similarity.CaseIndex).
+
+Fills the index with synthetic ED case summaries built from a small
+vocabulary of complaints, symptoms, vitals and history (so unrelated cases
+still share many words), then queries with perturbed copies of stored
+cases: each vital nudged by a few percent, and half the time a symptom
+dropped or added. Reports add and
+search latency and recall@1 against an exact brute-force cosine scan over
+a sample of the same queries.
+
+Run:
+    python -m benchmarks.bench_case_index --cases 100000 --queries 2000
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+import numpy as np
+
+from src.similarity.case_index import DIM, CaseIndex, vectorize
+from src.utils.case_builder import build_case_summary
+
+COMPLAINTS = [
+    "fever and pleuritic chest pain", "shortness of breath", "abdominal pain", "headache",
+    "chest pain", "syncope", "back pain", "confusion", "palpitations", "cough",
+    "vomiting and diarrhoea", "leg swelling", "dizziness", "rash", "weakness",
+]
+SYMPTOMS = [
+    "fever", "productive cough", "dry cough", "pleuritic chest pain", "dyspnoea", "wheeze",
+    "haemoptysis", "nausea", "vomiting", "diarrhoea", "rigors", "night sweats", "weight loss",
+    "photophobia", "neck stiffness", "dysuria", "flank pain", "calf tenderness", "orthopnoea",
+    "chest tightness", "diaphoresis", "fatigue", "myalgia", "sore throat", "abdominal distension",
+]
+HISTORY = [
+    "No known chronic lung disease documented.", "Type 2 diabetes.", "Hypertension and CKD stage 3.",
+    "COPD on home oxygen.", "Recent long-haul flight.", "Atrial fibrillation on anticoagulation.",
+    "Smoker, 30 pack-years.", "Recent knee surgery.", "HIV on ART.", "No significant history.",
+]
+
+
+def _case(rng: random.Random):
+    return {
+        "age": rng.randint(18, 95),
+        "sex": rng.choice(["male", "female"]),
+        "chief_complaint": rng.choice(COMPLAINTS),
+        "symptoms": ", ".join(rng.sample(SYMPTOMS, rng.randint(2, 5))),
+        "vitals": _vitals(rng),
+        "history": rng.choice(HISTORY),
+    }
+
+
+def _vitals(rng: random.Random, rr=None, spo2=None, hr=None, sbp=None, dbp=None) -> str:
+    def near(value, low, high, spread):
+        if value is None:
+            return rng.randint(low, high)
+        return min(high, max(low, value + rng.randint(-spread, spread)))
+
+    return (
+        f"RR {near(rr, 12, 32, 2)}, SpO2 {near(spo2, 85, 99, 2)}%, "
+        f"HR {near(hr, 55, 140, 6)}, BP {near(sbp, 85, 180, 8)}/{near(dbp, 50, 100, 5)}"
+    )
+
+
+def _perturb(case, rng: random.Random):
+    numbers = [int(n) for n in re.findall(r"\b\d+", case["vitals"])]
+    near = dict(case, vitals=_vitals(rng, *numbers))
+    symptoms = near["symptoms"].split(", ")
+    if rng.random() < 0.5:
+        if len(symptoms) > 2 and rng.random() < 0.5:
+            symptoms.pop(rng.randrange(len(symptoms)))
+        else:
+            symptoms.append(rng.choice([s for s in SYMPTOMS if s not in symptoms]))
+    near["symptoms"] = ", ".join(symptoms)
+    return near
+
+
+def _exact_nearest(rows: np.ndarray, columns: np.ndarray, values: np.ndarray, summary: str) -> int:
+    """Brute-force cosine over every stored vector (flattened sparse rows)."""
+    query_indices, query_values = vectorize(summary)
+    query = np.zeros(DIM, dtype=np.float32)
+    query[query_indices] = query_values
+    return int(np.argmax(np.bincount(rows, weights=query[columns] * values)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--exact-sample", type=int, default=200, help="queries checked against a brute-force scan")
+    parser.add_argument("--candidates", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = [_case(rng) for _ in range(args.cases)]
+    summaries = [build_case_summary(c) for c in cases]
+
+    index = CaseIndex(max_items=args.cases, candidates=args.candidates)
+    start = time.perf_counter()
+    for slot, summary in enumerate(summaries):
+        index.add(summary, {"slot": slot})
+    add_s = time.perf_counter() - start
+
+    targets = [rng.randrange(args.cases) for _ in range(args.queries)]
+    queries = [build_case_summary(_perturb(cases[t], rng)) for t in targets]
+
+    latencies, found, similarities = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        best = index.search(query, k=1)[0]
+        latencies.append(time.perf_counter() - start)
+        found.append(best.final_output["slot"])
+        similarities.append(best.similarity)
+    latencies.sort()
+
+    sample = min(args.exact_sample, args.queries)
+    vectors = [vectorize(summary) for summary in summaries]
+    rows = np.repeat(np.arange(args.cases), [len(indices) for indices, _ in vectors])
+    columns = np.concatenate([indices for indices, _ in vectors])
+    values = np.concatenate([values for _, values in vectors])
+    agree = sum(_exact_nearest(rows, columns, values, queries[i]) == found[i] for i in range(sample))
+
+    print(f"cases={args.cases} queries={args.queries} candidates={args.candidates}")
+    print(f"add:    {add_s / args.cases * 1e6:.1f} us/case")
+    print(
+        f"search: p50={latencies[len(latencies) // 2] * 1e3:.3f} ms "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e3:.3f} ms"
+    )
+    print(f"perturbed copy found: {sum(f == t for f, t in zip(found, targets)) / args.queries:.1%}")
+    print(f"median similarity to perturbed copy: {statistics.median(similarities):.3f}")
+    if sample:
+        print(f"agrees with exact scan: {agree}/{sample}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_evidence_mode.py
+
+"""
+Benchmark: evidence_mode="single" (one long completion covering every
+candidate) vs "per_diagnosis" (one short completion per candidate, run in
+parallel via LangGraph Send).
+
+StubChatModel charges a fixed latency per call plus a per-output-token
+cost, so a single call that has to write evidence for 5 candidates takes
+roughly 5x longer to generate than one that writes a single entry.
+
+Run:
+    python -m benchmarks.bench_evidence_mode --latency-ms 300 --ms-per-token 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ["DDX_CACHE_ENABLED"] = "false"
+
+from benchmarks.stub_llm import StubChatModel  # noqa: E402
+from src.orchestration import build_ddx_graph  # noqa: E402
+
+CASE = {
+    "patient_case": {
+        "age": 65,
+        "sex": "male",
+        "chief_complaint": "fever and pleuritic chest pain",
+        "vitals": "RR 28, SpO2 90%, HR 102, BP 130/80",
+    }
+}
+
+
+async def _p50_ms(graph, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await graph.ainvoke(CASE)
+        samples.append(time.perf_counter() - start)
+    assert len(result["final_output"]["evidence"]) == len(result["final_output"]["diagnoses"])
+    return statistics.median(samples) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--ms-per-token", type=float, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    llm = StubChatModel(
+        latency_s=args.latency_ms / 1000,
+        seconds_per_output_token=args.ms_per_token / 1000,
+    )
+    print(
+        f"stub latency: {args.latency_ms:.0f} ms/call + {args.ms_per_token:.0f} ms/output token, "
+        f"5 candidates, {args.runs} runs"
+    )
+    for mode in ("single", "per_diagnosis"):
+        for fan_out in (False, True):
+            graph = build_ddx_graph(llm=llm, fan_out=fan_out, evidence_mode=mode)
+            p50 = asyncio.run(_p50_ms(graph, args.runs))
+            shape = "fan-out" if fan_out else "linear "
+            print(f"{mode:>13} / {shape}: p50 {p50:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
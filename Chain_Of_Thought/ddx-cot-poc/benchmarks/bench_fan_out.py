@@ -0,0 +1,75 @@
+# benchmarks/bench_fan_out.py
+
+"""
+Benchmark: linear pipeline vs parallel fan-out of evidence_for_against and
+suggest_investigations, with simulated LLM latency.
+
+The linear graph makes four sequential LLM round-trips; the fan-out graph
+makes three on the critical path. Both sync (graph.invoke) and async
+(graph.ainvoke) execution are measured.
+
+Run:
+    python -m benchmarks.bench_fan_out --latency-ms 300 --runs 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ["DDX_CACHE_ENABLED"] = "false"
+
+from benchmarks.stub_llm import StubChatModel  # noqa: E402
+from src.orchestration import build_ddx_graph  # noqa: E402
+
+CASE = {
+    "patient_case": {
+        "age": 65,
+        "sex": "male",
+        "chief_complaint": "fever and pleuritic chest pain",
+        "vitals": "RR 28, SpO2 90%, HR 102, BP 130/80",
+    }
+}
+
+
+def _p50_ms(samples) -> float:
+    return statistics.median(samples) * 1e3
+
+
+def _time_sync(graph, runs: int):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        graph.invoke(CASE)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _time_async(graph, runs: int):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await graph.ainvoke(CASE)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    llm = StubChatModel(latency_s=args.latency_ms / 1000)
+    print(f"simulated LLM latency: {args.latency_ms:.0f} ms, runs: {args.runs}")
+    for label, fan_out in (("linear ", False), ("fan-out", True)):
+        graph = build_ddx_graph(llm=llm, fan_out=fan_out)
+        sync_p50 = _p50_ms(_time_sync(graph, args.runs))
+        async_p50 = _p50_ms(asyncio.run(_time_async(graph, args.runs)))
+        print(f"{label}: p50 invoke {sync_p50:7.1f} ms | p50 ainvoke {async_p50:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
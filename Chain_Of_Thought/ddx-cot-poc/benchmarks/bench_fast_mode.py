@@ -0,0 +1,92 @@
+# benchmarks/bench_fast_mode.py
+
+"""
+Benchmark: four-call DDx pipeline vs single-call fast mode.
+
+Both graphs run against StubChatModel (fixed latency per call plus a
+per-output-token cost). Token counts come from the ddx_llm_* metrics,
+fed by the stub's usage estimate (~4 characters per token), so they are
+approximate but comparable between the two graphs.
+
+Run:
+    python -m benchmarks.bench_fast_mode --latency-ms 300 --ms-per-token 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ["DDX_CACHE_ENABLED"] = "false"
+
+from benchmarks.stub_llm import StubChatModel  # noqa: E402
+from src.observability import reset_metrics  # noqa: E402
+from src.observability.instrumentation import LLM_COMPLETION_TOKENS, LLM_PROMPT_TOKENS  # noqa: E402
+from src.orchestration import build_ddx_graph, build_fast_ddx_graph  # noqa: E402
+
+CASE = {
+    "patient_case": {
+        "age": 65,
+        "sex": "male",
+        "chief_complaint": "fever and pleuritic chest pain",
+        "symptoms": "fever, productive cough, pleuritic chest pain",
+        "vitals": "RR 28, SpO2 90%, HR 102, BP 130/80",
+        "history": "No known chronic lung disease documented.",
+    }
+}
+
+FULL_NODES = ("extract_key_findings", "generate_candidates", "evidence_for_against", "suggest_investigations")
+FAST_NODES = ("fast_ddx",)
+
+
+def _per_run(nodes, runs: int):
+    calls = prompt = completion = 0
+    for node in nodes:
+        n, p = LLM_PROMPT_TOKENS.snapshot(node, "ddx-stub")
+        _, c = LLM_COMPLETION_TOKENS.snapshot(node, "ddx-stub")
+        calls, prompt, completion = calls + n, prompt + p, completion + c
+    return calls / runs, prompt / runs, completion / runs
+
+
+async def _p50_ms(graph, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await graph.ainvoke(CASE)
+        samples.append(time.perf_counter() - start)
+    assert result["final_output"]["diagnoses"] and result["final_output"]["evidence"]
+    return statistics.median(samples) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--ms-per-token", type=float, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    llm = StubChatModel(
+        latency_s=args.latency_ms / 1000,
+        seconds_per_output_token=args.ms_per_token / 1000,
+    )
+    print(
+        f"stub latency: {args.latency_ms:.0f} ms/call + {args.ms_per_token:.0f} ms/output token, "
+        f"{args.runs} runs"
+    )
+    for label, graph, nodes in (
+        ("four-call (fan-out)", build_ddx_graph(llm=llm, metrics=True), FULL_NODES),
+        ("fast mode          ", build_fast_ddx_graph(llm=llm, metrics=True), FAST_NODES),
+    ):
+        reset_metrics()
+        p50 = asyncio.run(_p50_ms(graph, args.runs))
+        calls, prompt, completion = _per_run(nodes, args.runs)
+        print(
+            f"{label}: {calls:.0f} calls, ~{prompt:5.0f} prompt + ~{completion:5.0f} completion "
+            f"tokens/case, p50 {p50:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
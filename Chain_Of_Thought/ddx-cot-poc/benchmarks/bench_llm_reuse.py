@@ -0,0 +1,87 @@
+# benchmarks/bench_llm_reuse.py
+
+"""
+Micro-benchmark: per-request orchestration overhead before/after sharing
+the LLM client and precompiling the node chains.
+
+"before" reproduces what every request used to pay: for each of the four
+LLM nodes, build a new ChatOpenAI, parse a new ChatPromptTemplate and
+compose prompt | llm. "after" is the graph from build_ddx_graph(), whose
+chains are compiled once. Both run the LLM calls against StubChatModel so
+only orchestration overhead is measured.
+
+Run:
+    OPENAI_API_KEY=sk-bench python -m benchmarks.bench_llm_reuse
+"""
+
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ["DDX_CACHE_ENABLED"] = "false"
+
+from langchain_core.prompts import ChatPromptTemplate  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from benchmarks.stub_llm import StubChatModel  # noqa: E402
+from src.orchestration import build_ddx_graph  # noqa: E402
+from src.orchestration.prompts import (  # noqa: E402
+    BASE_SYSTEM_PROMPT,
+    EXTRACT_KEY_FINDINGS_USER,
+    GENERATE_CANDIDATES_USER,
+    EVIDENCE_FOR_AGAINST_USER,
+    SUGGEST_INVESTIGATIONS_USER,
+)
+
+USER_PROMPTS = [
+    EXTRACT_KEY_FINDINGS_USER,
+    GENERATE_CANDIDATES_USER,
+    EVIDENCE_FOR_AGAINST_USER,
+    SUGGEST_INVESTIGATIONS_USER,
+]
+
+CASE = {
+    "patient_case": {
+        "age": 65,
+        "sex": "male",
+        "chief_complaint": "fever and pleuritic chest pain",
+        "symptoms": "fever, productive cough, pleuritic chest pain",
+        "vitals": "RR 28, SpO2 90%, HR 102, BP 130/80",
+    }
+}
+
+
+def legacy_per_request_setup() -> None:
+    """What each request paid before: 4x client + template + chain."""
+    for user_prompt in USER_PROMPTS:
+        llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2, api_key="sk-bench")
+        prompt = ChatPromptTemplate.from_messages(
+            [("system", BASE_SYSTEM_PROMPT), ("user", user_prompt)]
+        )
+        _ = prompt | llm
+
+
+def _time_per_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def main(n: int = 200) -> None:
+    graph = build_ddx_graph(llm=StubChatModel())
+    graph.invoke(CASE)  # warm up
+
+    setup_only = _time_per_call(legacy_per_request_setup, n)
+    after = _time_per_call(lambda: graph.invoke(CASE), n)
+    before = setup_only + after
+
+    print(f"requests per variant       : {n}")
+    print(f"legacy setup per request   : {setup_only * 1e3:8.3f} ms")
+    print(f"before (setup + graph run) : {before * 1e3:8.3f} ms")
+    print(f"after  (shared chains)     : {after * 1e3:8.3f} ms")
+    print(f"overhead removed           : {(1 - after / before) * 100:6.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_stream_ttfb.py
+
+"""
+Benchmark: time to first useful byte for POST /ddx vs POST /ddx/stream.
+
+/ddx returns only after every node has finished; /ddx/stream starts
+emitting key_findings tokens as soon as the first LLM call produces them.
+Uses StubChatModel with simulated latency (spread across tokens when
+streaming) and the result cache disabled.
+
+Run:
+    python -m benchmarks.bench_stream_ttfb --latency-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ["DDX_CACHE_ENABLED"] = "false"
+
+from benchmarks.stub_llm import StubChatModel  # noqa: E402
+from src.api import server  # noqa: E402
+from src.orchestration import build_ddx_graph  # noqa: E402
+from src.orchestration.cases import CaseStore  # noqa: E402
+
+CASE = {"age": 65, "sex": "male", "chief_complaint": "fever and pleuritic chest pain"}
+
+
+async def _first_chunk_and_total(path: str, marker: bytes):
+    """
+    Drive the ASGI app directly (httpx's ASGITransport buffers the whole
+    body) and return (seconds until a body chunk containing `marker`,
+    seconds until the response is complete).
+    """
+    body = json.dumps(CASE).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("ddx", 80), "client": ("bench", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    sent_body = False
+    first = None
+    response_done = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    start = time.perf_counter()
+
+    async def send(message):
+        nonlocal first
+        if message["type"] == "http.response.body":
+            if first is None and marker in message.get("body", b""):
+                first = time.perf_counter() - start
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await server.app(scope, receive, send)
+    return first, time.perf_counter() - start
+
+
+async def _measure() -> None:
+    _, blocking = await _first_chunk_and_total("/ddx", b"output")
+    first_token, total = await _first_chunk_and_total("/ddx/stream", b"event: token")
+
+    print(f"/ddx         full response      : {blocking * 1e3:8.1f} ms")
+    print(f"/ddx/stream  first token event  : {first_token * 1e3:8.1f} ms")
+    print(f"/ddx/stream  stream complete    : {total * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    llm = StubChatModel(latency_s=args.latency_ms / 1000)
+    server.graph = build_ddx_graph(llm=llm)
+    server.case_store = CaseStore(lambda fast, checkpointer: build_ddx_graph(llm=llm, checkpointer=checkpointer))
+    asyncio.run(_measure())
+
+
+if __name__ == "__main__":
+    main()
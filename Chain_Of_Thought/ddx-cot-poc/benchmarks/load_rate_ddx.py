@@ -0,0 +1,121 @@
+# benchmarks/load_rate_ddx.py
+
+"""
+Fixed-rate (open-loop) load test for POST /ddx.
+
+Requests are started on a fixed schedule (--rate per second for
+--duration seconds) whether or not earlier ones have finished, and each
+latency is measured from its scheduled start, so a slow server shows up
+as growing latency instead of a lower send rate. Reports p50/p95/p99
+latency and completed throughput.
+
+By default the service runs in-process (src.api.server.app) on the
+replay LLM backend, so the numbers reflect orchestration overhead on top
+of the configured replay latency, with no network or API key. Pass --url
+to load an already running server instead.
+
+Run:
+    python -m benchmarks.load_rate_ddx --rate 20 --duration 15 --latency-ms 800 --jitter-ms 200
+    python -m benchmarks.load_rate_ddx --url http://127.0.0.1:8000 --rate 5
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import time
+from typing import List, Optional, Tuple
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=20, help="requests started per second")
+    parser.add_argument("--duration", type=float, default=15, help="seconds of load")
+    parser.add_argument("--latency-ms", type=float, default=800, help="replay latency per LLM call")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="replay jitter (+/-) per LLM call")
+    parser.add_argument("--url", default=None, help="base URL of a running server (skips in-process app)")
+    return parser.parse_args()
+
+
+def _percentile(sorted_samples: List[float], pct: float) -> float:
+    # Nearest-rank percentile.
+    if not sorted_samples:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def _case(i: int) -> dict:
+    # Vary the case so runs are not served from the result cache.
+    return {"age": 20 + i % 70, "sex": "male" if i % 2 else "female",
+            "chief_complaint": f"fever and pleuritic chest pain, day {i % 7 + 1}"}
+
+
+async def _run(client, rate: float, duration: float) -> Tuple[List[float], int, float]:
+    latencies: List[float] = []
+    errors = 0
+    total = int(rate * duration)
+    start = time.perf_counter()
+
+    async def one(i: int, scheduled: float) -> None:
+        nonlocal errors
+        try:
+            response = await client.post("/ddx", json=_case(i))
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - scheduled)
+        else:
+            errors += 1
+
+    tasks = []
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i, scheduled)))
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - start
+
+
+async def _drive(url: Optional[str], rate: float, duration: float):
+    import httpx
+
+    if url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        client = httpx.AsyncClient(base_url=url, timeout=None, limits=limits)
+    else:
+        from src.api.server import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://ddx", timeout=None)
+    async with client:
+        return await _run(client, rate, duration)
+
+
+def main() -> None:
+    args = _parse_args()
+    if not args.url:
+        os.environ["DDX_LLM_BACKEND"] = "replay"
+        os.environ["DDX_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+        os.environ["DDX_REPLAY_JITTER_MS"] = str(args.jitter_ms)
+        os.environ.setdefault("DDX_REPLAY_PATH", "tests/fixtures/ddx_replay.jsonl")
+        os.environ.setdefault("DDX_CACHE_ENABLED", "false")
+
+    latencies, errors, elapsed = asyncio.run(_drive(args.url, args.rate, args.duration))
+    latencies.sort()
+    done = len(latencies)
+    target = f"{args.url}" if args.url else f"in-process, replay {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms/call"
+    print(f"target: {target}")
+    print(f"offered: {args.rate:.1f} req/s for {args.duration:.0f}s ({int(args.rate * args.duration)} requests)")
+    print(f"completed: {done} ok, {errors} errors in {elapsed:.2f}s -> {done / elapsed:.1f} req/s")
+    print(
+        "latency ms: "
+        + "  ".join(f"p{p} {_percentile(latencies, p) * 1e3:8.1f}" for p in (50, 95, 99))
+        + f"  max {latencies[-1] * 1e3 if latencies else float('nan'):8.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
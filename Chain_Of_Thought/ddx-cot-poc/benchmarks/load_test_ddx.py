@@ -0,0 +1,86 @@
+# benchmarks/load_test_ddx.py
+
+"""
+Load test: sync vs async /ddx endpoint against the local stub LLM server.
+
+Both variants run the real graph and real ChatOpenAI clients over HTTP to
+benchmarks/stub_llm_server.py. The "sync" app reproduces the previous
+`def ddx_endpoint` + graph.invoke (one threadpool thread per in-flight
+case); the "async" app is src.api.server.app.
+
+Every request is a distinct case, with the result cache off, so each one
+runs the graph. Identical payloads would be merged by /ddx's single-flight
+coalescing into one run and measure nothing about concurrency.
+
+Run:
+    python -m benchmarks.load_test_ddx --requests 300 --latency-ms 2000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+PORT = 8765
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=2000)
+    return parser.parse_args()
+
+
+def _case(i: int) -> dict:
+    # Distinct for every i: age and complaint together never repeat.
+    return {"age": 20 + i % 70, "sex": "male" if i % 2 else "female",
+            "chief_complaint": f"fever and pleuritic chest pain, day {i // 70 + 1}"}
+
+
+async def _fire(app, n: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://ddx", timeout=None) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/ddx", json=_case(i)) for i in range(n)))
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses), {r.status_code for r in responses}
+    return elapsed
+
+
+def main() -> None:
+    args = _parse_args()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{PORT}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-stub")
+    # Both apps must reach the LLM: a result cache warmed by the first run
+    # would answer the second.
+    os.environ["DDX_CACHE_ENABLED"] = "false"
+
+    from fastapi import FastAPI
+
+    from benchmarks.stub_llm_server import start_subprocess
+    from src.api import server
+
+    stub = start_subprocess(PORT, latency_ms=args.latency_ms)
+
+    legacy_app = FastAPI()
+
+    @legacy_app.post("/ddx")
+    def legacy_ddx(case: server.PatientCase):
+        state = {"patient_case": case.model_dump(exclude_none=True)}
+        return {"output": server.get_graph().invoke(state)["final_output"]}
+
+    try:
+        for label, app in (("sync  (graph.invoke) ", legacy_app), ("async (graph.ainvoke)", server.app)):
+            elapsed = asyncio.run(_fire(app, args.requests))
+            print(
+                f"{label}: {args.requests} requests in {elapsed:6.2f}s "
+                f"-> {args.requests / elapsed:7.1f} req/s"
+            )
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# benchmarks/stub_llm.py
+
+"""
+Offline stand-in for ChatOpenAI used by the benchmark scripts.
+
+Returns a canned response per DDx node (chosen by looking at the prompt)
+and can sleep to simulate provider latency. No network, no API key.
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+CANNED_DIAGNOSES = [
+    {"name": "Community-acquired pneumonia", "rationale": "Fever, cough, crackles.", "likelihood": "High"},
+    {"name": "Pulmonary embolism", "rationale": "Pleuritic pain, hypoxia.", "likelihood": "Moderate"},
+    {"name": "Pleural effusion", "rationale": "Pleuritic pain.", "likelihood": "Low"},
+    {"name": "Acute bronchitis", "rationale": "Cough, fever.", "likelihood": "Low"},
+    {"name": "Pericarditis", "rationale": "Pleuritic chest pain.", "likelihood": "Low"},
+]
+
+
+def _evidence_entry(name: str) -> dict:
+    return {
+        "name": name,
+        "features_supporting": ["fever", "productive cough", "crackles on auscultation"],
+        "features_against_or_missing": ["no imaging yet", "no inflammatory markers"],
+        "potential_red_flags": ["SpO2 90%", "RR 28"],
+    }
+
+
+CANNED_RESPONSES = {
+    "key_findings": (
+        "1. Positive: fever, productive cough, pleuritic chest pain, tachypnoea, "
+        "hypoxia, right lower zone crackles.\n2. Negative: no chronic lung disease.\n"
+        "3. Acuity: moderate-high.\n"
+        "Reminder: This is NOT a final diagnosis. Check with the responsible clinician."
+    ),
+    "diagnoses": json.dumps({"diagnoses": CANNED_DIAGNOSES}),
+    "evidence": json.dumps({"evidence": [_evidence_entry(d["name"]) for d in CANNED_DIAGNOSES]}),
+    "investigations": json.dumps(
+        {"investigations": [{"name": "Chest X-ray", "why_it_helps": "Consolidation vs effusion."}]}
+    ),
+}
+# Fast mode: everything above in one object.
+CANNED_RESPONSES["fast"] = json.dumps(
+    {
+        "key_findings": CANNED_RESPONSES["key_findings"],
+        **json.loads(CANNED_RESPONSES["diagnoses"]),
+        **json.loads(CANNED_RESPONSES["evidence"]),
+        **json.loads(CANNED_RESPONSES["investigations"]),
+    }
+)
+
+_DIAGNOSIS_NAME = re.compile(r'Candidate diagnosis:\s*\{"name": "([^"]+)"')
+
+
+def _pick_response(messages: List[BaseMessage]) -> str:
+    prompt = str(messages[-1].content)
+    if '"key_findings"' in prompt:
+        return CANNED_RESPONSES["fast"]
+    if '"investigations"' in prompt:
+        return CANNED_RESPONSES["investigations"]
+    single = _DIAGNOSIS_NAME.search(prompt)
+    if single:
+        return json.dumps({"evidence": [_evidence_entry(single.group(1))]})
+    if '"evidence"' in prompt:
+        return CANNED_RESPONSES["evidence"]
+    if '"diagnoses"' in prompt:
+        return CANNED_RESPONSES["diagnoses"]
+    return CANNED_RESPONSES["key_findings"]
+
+
+def _tokens(text: str) -> List[str]:
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + words[-1:]
+
+
+def _usage(messages: List[BaseMessage], content: str) -> dict:
+    # Rough token counts (~4 characters per token) so usage metrics have data.
+    prompt = sum(len(str(m.content)) for m in messages) // 4
+    completion = len(content) // 4
+    return {"input_tokens": prompt, "output_tokens": completion, "total_tokens": prompt + completion}
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Chat model that answers instantly (or after `latency_s`) with canned JSON.
+
+    Latency per call is `latency_s` plus `seconds_per_output_token` for
+    every ~4 characters of output, so longer completions take longer, as
+    they do with a real provider. When streamed, the latency is spread
+    evenly across word-sized chunks, so the first chunk arrives long
+    before the full response.
+    """
+
+    latency_s: float = 0.0
+    seconds_per_output_token: float = 0.0
+
+    def _delay(self, content: str) -> float:
+        return self.latency_s + self.seconds_per_output_token * (len(content) / 4)
+
+    @property
+    def _llm_type(self) -> str:
+        return "ddx-stub"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content = _pick_response(messages)
+        if self._delay(content):
+            time.sleep(self._delay(content))
+        message = AIMessage(content=content, usage_metadata=_usage(messages, content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content = _pick_response(messages)
+        if self._delay(content):
+            await asyncio.sleep(self._delay(content))
+        message = AIMessage(content=content, usage_metadata=_usage(messages, content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        content = _pick_response(messages)
+        tokens = _tokens(content)
+        for i, token in enumerate(tokens):
+            if self._delay(content):
+                time.sleep(self._delay(content) / len(tokens))
+            usage = _usage(messages, content) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        content = _pick_response(messages)
+        tokens = _tokens(content)
+        for i, token in enumerate(tokens):
+            if self._delay(content):
+                await asyncio.sleep(self._delay(content) / len(tokens))
+            usage = _usage(messages, content) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
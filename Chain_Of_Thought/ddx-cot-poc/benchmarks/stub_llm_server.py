@@ -0,0 +1,105 @@
+# benchmarks/stub_llm_server.py
+
+"""
+Local OpenAI-compatible stub server for load tests.
+
+Implements just enough of POST /v1/chat/completions for ChatOpenAI, using
+the canned DDx responses from benchmarks.stub_llm and an artificial delay.
+
+Run standalone:
+    STUB_LATENCY_MS=200 uvicorn benchmarks.stub_llm_server:app --port 8765
+Then point the service at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=sk-stub ...
+
+With STUB_RPM_LIMIT=<n> the stub behaves like a rate-limited provider:
+requests beyond n in any rolling 60 s window get a 429 with Retry-After
+(e.g. to exercise DDX_LLM_RPM / the scheduler's shared backoff).
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from langchain_core.messages import HumanMessage
+
+from benchmarks.stub_llm import _pick_response
+
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "200"))
+STUB_RPM_LIMIT = int(os.getenv("STUB_RPM_LIMIT", "0"))
+
+# Arrival times of accepted requests in the last 60 s (STUB_RPM_LIMIT only)
+_accepted: deque = deque()
+
+app = FastAPI(title="Stub OpenAI chat completions")
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: Dict[str, Any]):
+    if STUB_RPM_LIMIT:
+        now = time.monotonic()
+        while _accepted and now - _accepted[0] >= 60:
+            _accepted.popleft()
+        if len(_accepted) >= STUB_RPM_LIMIT:
+            retry_after = max(0.1, 60 - (now - _accepted[0]))
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": f"{retry_after:.2f}"},
+            )
+        _accepted.append(now)
+    await asyncio.sleep(STUB_LATENCY_MS / 1000)
+    prompt = body["messages"][-1]["content"]
+    content = _pick_response([HumanMessage(content=prompt)])
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        },
+    }
+
+
+def start_subprocess(
+    port: int = 8765, latency_ms: float = STUB_LATENCY_MS, rpm_limit: int = STUB_RPM_LIMIT
+) -> subprocess.Popen:
+    """
+    Start the stub server in a child process and wait until it accepts
+    connections. A separate process keeps the stub from competing with the
+    service under test for the GIL.
+    """
+    env = dict(os.environ, STUB_LATENCY_MS=str(latency_ms), STUB_RPM_LIMIT=str(rpm_limit))
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.stub_llm_server:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError(f"stub LLM server did not start on port {port}")
@@ -0,0 +1,38 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PatientCase(BaseModel):
+    age: int | None = Field(None, example=65)
+    sex: str | None = Field(None, example="male")
+    chief_complaint: str | None = Field(
+        None, example="fever and pleuritic chest pain"
+    )
+    symptoms: str | None = Field(
+        None, example="fever, productive cough, pleuritic chest pain"
+    )
+    vitals: str | None = Field(
+        None, example="RR 28, SpO2 90%, HR 102, BP 130/80"
+    )
+    labs: str | None = None
+    history: str | None = Field(
+        None, example="No known chronic lung disease documented."
+    )
+    notes: str | None = Field(
+        None, example="Crackles in right lower lung field on auscultation."
+    )
+
+
+class DDXResponse(BaseModel):
+    output: Dict[str, Any]
+    # Pass to POST /ddx/{case_id}/amend to re-run with changed fields.
+    case_id: Optional[str] = None
+    # Nodes whose previous output was reused (amendments only).
+    reused_nodes: Optional[List[str]] = None
+    # Near-duplicate earlier case that answered ("return") or seeded this
+    # run: {"mode", "similarity", "case_summary"}.
+    similar_case: Optional[Dict[str, Any]] = None
+    # Route that served each LLM node run here: "primary:<model>" or
+    # "fallback:<model>" (DDX_ROUTING_ENABLED).
+    llm_routes: Optional[Dict[str, str]] = None
@@ -1,43 +1,358 @@
-from fastapi import FastAPI
-from pydantic import BaseModel, Field
-from typing import Any, Dict
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional
 
-from src.orchestration import build_ddx_graph
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-app = FastAPI(title="DDx CoT Explainer (POC)")
-graph = build_ddx_graph()
+from src.api.schemas import PatientCase, DDXResponse
+from src.api.single_flight import SingleFlight
+from src.batch import BatchCheckpoint, run_batch
+from src.cache import get_result_cache
+from src.config.settings import (
+    DDX_MAX_CONCURRENCY,
+    DDX_CASE_STORE_MAX_ITEMS,
+    DDX_SIMILAR_MODE,
+    DDX_BATCH_CONCURRENCY,
+    DDX_BATCH_CHECKPOINT_DIR,
+)
+from src.observability import CONTENT_TYPE, format_family, register_collector, render_metrics, timed_slot
+from src.observability.instrumentation import COALESCED_REQUESTS, SIMILAR_LOOKUPS
+from src.utils.case_builder import build_case_summary, case_fingerprint
 
 
-class PatientCase(BaseModel):
-    age: int | None = Field(None, example=65)
-    sex: str | None = Field(None, example="male")
-    chief_complaint: str | None = Field(
-        None, example="fever and pleuritic chest pain"
-    )
-    symptoms: str | None = Field(
-        None, example="fever, productive cough, pleuritic chest pain"
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Requests never wait on trace export; only shutdown waits (bounded).
+    # src.llm is only loaded once a graph has been built.
+    tracing = sys.modules.get("src.llm.tracing")
+    if tracing is not None:
+        await asyncio.to_thread(tracing.flush_tracing, True, 5)
+
+
+app = FastAPI(title="DDx CoT Explainer (POC)", lifespan=_lifespan)
+
+# Graphs are compiled on first use rather than at import, so a cold worker
+# can start serving (/metrics, health checks) without paying for the LLM
+# client and tracing setup. Benchmarks/tests may assign these directly.
+graph = None
+# Triage fast mode (?fast=true): one LLM call instead of four.
+fast_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph(fast: bool = False):
+    """The compiled DDx graph (or the fast-mode graph), built on first call."""
+    global graph, fast_graph
+    current = fast_graph if fast else graph
+    if current is not None:
+        return current
+    # Imported here: langgraph/langchain_core dominate the import cost.
+    from src.orchestration import build_ddx_graph, build_fast_ddx_graph
+
+    with _graph_lock:
+        if fast and fast_graph is None:
+            fast_graph = build_fast_ddx_graph()
+        elif not fast and graph is None:
+            graph = build_ddx_graph()
+        return fast_graph if fast else graph
+
+
+# Checkpointed runs behind /ddx and /ddx/{case_id}/amend (built on first use).
+case_store = None
+
+
+def get_case_store():
+    global case_store
+    if case_store is not None:
+        return case_store
+    from src.orchestration import build_ddx_graph, build_fast_ddx_graph
+    from src.orchestration.cases import CaseStore
+
+    def build(fast, checkpointer):
+        if fast:
+            return build_fast_ddx_graph(checkpointer=checkpointer)
+        return build_ddx_graph(checkpointer=checkpointer)
+
+    with _graph_lock:
+        if case_store is None:
+            case_store = CaseStore(build, max_cases=DDX_CASE_STORE_MAX_ITEMS)
+        return case_store
+
+
+# Caps the number of cases executing at once in this worker; requests past
+# the cap wait here instead of piling more calls onto the LLM provider.
+_ddx_slots = asyncio.Semaphore(DDX_MAX_CONCURRENCY)
+
+# Identical /ddx submissions (EHR retries, double clicks) that arrive while
+# the first is still running share its response instead of re-running the
+# graph. Keyed on the canonical case summary plus the options that change
+# the result.
+_ddx_flights = SingleFlight()
+
+register_collector(
+    "single_flight",
+    lambda: format_family(
+        "ddx_inflight_cases", "gauge", "Distinct /ddx cases currently executing.", [({}, len(_ddx_flights))]
+    ),
+)
+
+
+@app.post("/ddx", response_model=DDXResponse)
+async def ddx_endpoint(
+    case: PatientCase,
+    no_cache: bool = False,
+    fast: bool = False,
+    similar: Optional[str] = Query(None, pattern="^(off|return|seed)$"),
+):
+    """
+    Async endpoint for the DDx graph. LLM calls are awaited, so a single
+    worker can keep up to DDX_MAX_CONCURRENCY cases in flight.
+
+    `?no_cache=true` skips cached per-node LLM results (and refreshes them).
+    `?fast=true` uses the single-call fast-mode graph (same response shape).
+    `?similar=return|seed|off` overrides DDX_SIMILAR_MODE: reuse the output
+    of a near-identical earlier case, or pass its differentials to the
+    prompts as a hint (see `similar_case` in the response).
+
+    The response carries a `case_id` for POST /ddx/{case_id}/amend (not
+    when an earlier result is returned as-is). Concurrent submissions of
+    the same case are run once and get the same response (and case_id).
+    """
+    patient_case = case.model_dump(exclude_none=True)
+    summary = build_case_summary(patient_case)
+    mode = similar or DDX_SIMILAR_MODE
+    key = (case_fingerprint(summary), fast, no_cache, mode)
+    response, coalesced = await _ddx_flights.do(
+        key, lambda: _run_ddx(patient_case, summary, no_cache, fast, mode)
     )
-    vitals: str | None = Field(
-        None, example="RR 28, SpO2 90%, HR 102, BP 130/80"
+    if coalesced:
+        COALESCED_REQUESTS.inc(1, "ddx")
+    return response
+
+
+async def _run_ddx(
+    patient_case: dict, summary: str, no_cache: bool, fast: bool, mode: str
+) -> DDXResponse:
+    state = {"patient_case": patient_case, "cache_bypass": no_cache}
+    index = None
+    similar_info = None
+    if mode != "off":
+        # numpy is only imported once reuse is in use.
+        from src.similarity import get_case_index
+
+        index = get_case_index()
+        # Only outputs of the same graph (fast or full) are reused.
+        match = None if no_cache else index.nearest(summary, fast=fast)
+        SIMILAR_LOOKUPS.inc(1, mode, "miss" if match is None else "hit")
+        if match is not None:
+            similar_info = {
+                "mode": mode,
+                "similarity": round(match.similarity, 4),
+                "case_summary": match.case_summary,
+            }
+            if mode == "return":
+                output = {**match.final_output, "case_summary": summary}
+                return DDXResponse(output=output, similar_case=similar_info)
+            state["similar_case"] = {
+                "similarity": match.similarity,
+                "case_summary": match.case_summary,
+                "diagnoses": match.final_output.get("diagnoses", []),
+            }
+
+    async with timed_slot(_ddx_slots, "ddx"):
+        case_id, result_state = await get_case_store().run(state, fast=fast)
+    if index is not None:
+        index.add(result_state["case_summary"], result_state["final_output"], fast=fast)
+    return DDXResponse(
+        output=result_state["final_output"],
+        case_id=case_id,
+        similar_case=similar_info,
+        llm_routes=result_state.get("llm_routes"),
     )
-    labs: str | None = None
-    history: str | None = Field(
-        None, example="No known chronic lung disease documented."
+
+
+@app.post("/ddx/{case_id}/amend", response_model=DDXResponse)
+async def ddx_amend_endpoint(case_id: str, delta: PatientCase, no_cache: bool = False):
+    """
+    Re-run a case from /ddx with some fields changed.
+
+    Body: only the fields to change (null removes a field). Nodes whose
+    inputs are unchanged reuse their previous output (listed in
+    `reused_nodes`); the rest are re-run. Cases are kept for the last
+    DDX_CASE_STORE_MAX_ITEMS runs in this worker.
+    """
+    from src.orchestration.cases import CaseNotFound
+
+    changes = delta.model_dump(exclude_unset=True)
+    async with timed_slot(_ddx_slots, "ddx_amend"):
+        try:
+            result_state = await get_case_store().amend(case_id, changes, cache_bypass=no_cache)
+        except CaseNotFound:
+            raise HTTPException(status_code=404, detail="unknown or expired case_id")
+    return DDXResponse(
+        output=result_state["final_output"],
+        case_id=case_id,
+        reused_nodes=result_state.get("memo_hits", []),
+        llm_routes=result_state.get("llm_routes"),
     )
-    notes: str | None = Field(
-        None, example="Crackles in right lower lung field on auscultation."
+
+
+# What each node contributes to the stream (nodes return full state copies,
+# so only forward the keys they own).
+_STREAM_NODE_KEYS = {
+    "normalize_input": ("case_summary",),
+    "extract_key_findings": ("key_findings",),
+    "generate_candidates": ("candidate_diagnoses",),
+    "evidence_for_against": ("evidence_matrix",),
+    "evidence_for_diagnosis": ("evidence_matrix",),
+    "suggest_investigations": ("suggested_investigations",),
+    "fast_ddx": ("key_findings", "candidate_diagnoses", "evidence_matrix", "suggested_investigations"),
+    "format_output": ("final_output",),
+}
+# Free-text nodes whose tokens are worth streaming (the others emit JSON).
+_STREAM_TOKEN_NODES = {"extract_key_findings"}
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/ddx/stream")
+async def ddx_stream_endpoint(case: PatientCase, no_cache: bool = False, fast: bool = False):
+    """
+    Server-sent events version of /ddx.
+
+    Events:
+    - `token`: {"node", "content"} for each key_findings token as it arrives
+    - `node`:  {"node", "output"} as soon as a node finishes
+    - `final`: the same payload /ddx returns under "output"
+    - `error`: {"detail"} if the run fails; `done` closes the stream
+
+    With `?fast=true` there are no token events (fast mode emits JSON only).
+    """
+    state = {"patient_case": case.model_dump(exclude_none=True), "cache_bypass": no_cache}
+
+    async def events():
+        async with timed_slot(_ddx_slots, "ddx_stream"):
+            try:
+                async for mode, chunk in get_graph(fast).astream(
+                    state, stream_mode=["messages", "updates"]
+                ):
+                    if mode == "messages":
+                        message, metadata = chunk
+                        node = metadata.get("langgraph_node")
+                        if node in _STREAM_TOKEN_NODES and message.content:
+                            yield _sse("token", {"node": node, "content": message.content})
+                        continue
+
+                    for node, update in chunk.items():
+                        keys = _STREAM_NODE_KEYS.get(node, ())
+                        output = {k: update[k] for k in keys if k in (update or {})}
+                        if node == "format_output":
+                            yield _sse("final", output.get("final_output", {}))
+                        else:
+                            yield _sse("node", {"node": node, "output": output})
+            except Exception as e:
+                yield _sse("error", {"detail": f"{type(e).__name__}: {e}"})
+            yield _sse("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-class DDXResponse(BaseModel):
-    output: Dict[str, Any]
+_CHECKPOINT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,127}")
 
 
-@app.post("/ddx", response_model=DDXResponse)
-def ddx_endpoint(case: PatientCase):
+@app.post("/ddx/batch")
+async def ddx_batch_endpoint(
+    request: Request,
+    concurrency: int = Query(DDX_BATCH_CONCURRENCY, ge=1, le=DDX_MAX_CONCURRENCY),
+    checkpoint: Optional[str] = None,
+    no_cache: bool = False,
+    fast: bool = False,
+):
+    """
+    Bulk/backfill endpoint.
+
+    Body: JSONL, one PatientCase per line (an optional "id" is echoed
+    back). Response: NDJSON streamed as each case completes, each line
+    tagged with the input `index`. Pass `?checkpoint=<job-name>` to record
+    progress server-side; resubmitting the same input with the same name
+    skips cases that already completed (cases that ended in "error" are
+    run again). `?fast=true` runs every case in fast mode. Each case takes
+    a DDX_MAX_CONCURRENCY slot while it runs, shared with /ddx.
+    """
+    ckpt = None
+    if checkpoint is not None:
+        if not _CHECKPOINT_NAME.fullmatch(checkpoint):
+            raise HTTPException(status_code=400, detail="invalid checkpoint name")
+        ckpt = await asyncio.to_thread(BatchCheckpoint, os.path.join(DDX_BATCH_CHECKPOINT_DIR, checkpoint))
+
+    # Spool the body to disk first: the streaming response listens for
+    # client disconnects on the same ASGI receive channel, so the body
+    # cannot be read while results are being streamed. Disk keeps memory
+    # flat for large inputs; file I/O runs in worker threads.
+    spool = await asyncio.to_thread(tempfile.TemporaryFile, mode="w+b")
+    async for chunk in request.stream():
+        await asyncio.to_thread(spool.write, chunk)
+    await asyncio.to_thread(spool.seek, 0)
+
+    async def lines():
+        while raw := await asyncio.to_thread(spool.readline):
+            yield raw.decode("utf-8")
+
+    async def ndjson():
+        try:
+            async for record in run_batch(
+                lines(),
+                get_graph(fast),
+                concurrency=concurrency,
+                checkpoint=ckpt,
+                cache_bypass=no_cache,
+                # Each case holds a DDX_MAX_CONCURRENCY slot like a /ddx request.
+                slot=lambda: timed_slot(_ddx_slots, "ddx_batch"),
+            ):
+                yield json.dumps(record) + "\n"
+        finally:
+            spool.close()
+            if ckpt is not None:
+                ckpt.close()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit/miss counters and sizes for the per-node LLM result cache."""
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.get("/parse/stats")
+def parse_stats_endpoint():
+    """Per-node structured-output outcomes: ok / repaired / failed / retries."""
+    from src.orchestration.parsing import parse_stats
+
+    return parse_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
     """
-    Simple synchronous endpoint for the DDx graph.
+    Prometheus scrape endpoint: node and LLM latency, token usage, queue
+    wait, cache lookups and parse retries for this worker process.
     """
-    state = {"patient_case": case.dict(exclude_none=True)}
-    result_state = graph.invoke(state)
-    return DDXResponse(output=result_state["final_output"])
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
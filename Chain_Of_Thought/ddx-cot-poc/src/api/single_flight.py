@@ -0,0 +1,42 @@
+# src/api/single_flight.py
+
+"""
+Single-flight execution for concurrent identical requests.
+
+The first caller for a key starts the work as a task; callers arriving
+with the same key while it is running await that task instead of starting
+their own, and all of them get its result (or exception). The key is
+forgotten as soon as the task finishes, so this only merges requests that
+overlap in time; it is not a cache.
+
+The task is shielded from its callers: a caller that disconnects (and is
+cancelled) does not cancel the work the other callers are waiting on.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run (or join) `work()` for `key`; returns (result, joined_existing)."""
+        task = self._inflight.get(key)
+        joined = task is not None
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task), joined
+
+    def _finished(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the outcome as retrieved even if every caller went away.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1 @@
+from .runner import BatchCheckpoint, run_batch, aiter_sync
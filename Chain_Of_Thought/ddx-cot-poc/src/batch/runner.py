@@ -0,0 +1,159 @@
+# src/batch/runner.py
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncContextManager, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Optional, Set
+
+from pydantic import ValidationError
+
+from src.api.schemas import PatientCase
+from src.ratelimit import llm_priority
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCheckpoint:
+    """
+    Append-only record of which input lines have completed.
+
+    The file holds one completed line index per line. In memory we only
+    keep a high watermark (one past the highest completed index) plus the
+    indices below it that are not done yet: cases still in flight, and
+    cases that failed and will be retried on the next run. Memory is
+    bounded by those gaps, not by input size, even while one early index
+    stays pending for the whole run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._high = 0
+        self._missing: Set[int] = set()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if line.isdigit():
+                        self._mark(int(line))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def is_done(self, index: int) -> bool:
+        return index < self._high and index not in self._missing
+
+    def mark_done(self, index: int) -> None:
+        self._fh.write(f"{index}\n")
+        self._fh.flush()
+        self._mark(index)
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def _mark(self, index: int) -> None:
+        if index < self._high:
+            self._missing.discard(index)
+            return
+        self._missing.update(range(self._high, index))
+        self._high = index + 1
+
+
+async def aiter_sync(lines: Iterable[str]) -> AsyncIterator[str]:
+    """Adapt a sync line iterator (e.g. an open file) for run_batch()."""
+    for line in lines:
+        yield line
+
+
+# Records with these statuses are final; "error" cases are retried on resume.
+_CHECKPOINTED = ("ok", "invalid")
+
+
+async def _run_one(
+    graph, index: int, line: str, cache_bypass: bool, slot: Optional[Callable[[], AsyncContextManager]]
+) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"index": index}
+    try:
+        raw = json.loads(line)
+        if isinstance(raw, dict) and "id" in raw:
+            record["id"] = raw["id"]
+        case = PatientCase.model_validate(raw)
+        state = {"patient_case": case.model_dump(exclude_none=True), "cache_bypass": cache_bypass}
+        # Backfill yields to interactive /ddx traffic for LLM capacity.
+        with llm_priority("batch"):
+            if slot is None:
+                result_state = await graph.ainvoke(state)
+            else:
+                async with slot():
+                    result_state = await graph.ainvoke(state)
+        record["status"] = "ok"
+        record["output"] = result_state["final_output"]
+    except (json.JSONDecodeError, ValidationError) as e:
+        record["status"] = "invalid"
+        record["error"] = str(e)
+    except Exception as e:  # keep the batch going; report per case
+        logger.exception("DDx batch case %s failed", index)
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+async def run_batch(
+    lines: AsyncIterable[str],
+    graph,
+    concurrency: int = 16,
+    checkpoint: Optional[BatchCheckpoint] = None,
+    cache_bypass: bool = False,
+    slot: Optional[Callable[[], AsyncContextManager]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the DDx graph over JSONL PatientCase records.
+
+    - Input is read lazily; at most `concurrency` cases are in flight, so
+      memory stays flat regardless of input size.
+    - Results are yielded as each case completes (not in input order).
+      Every record carries `index` (0-based input line number) and the
+      input's `id` if it had one, so callers can restore order.
+    - With a checkpoint, lines already recorded as done are skipped, and a
+      line is marked done only after its result has been consumed, so a
+      crash can repeat a result but never lose one. Only "ok" and
+      "invalid" records are marked; "error" cases (e.g. retries exhausted
+      on 429s) run again on resume.
+    - `slot`, if given, is entered around each case's graph run (the API
+      uses it to share its concurrency cap with interactive traffic).
+    """
+    source = lines.__aiter__()
+    pending: Set[asyncio.Task] = set()
+    next_index = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    line = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                index = next_index
+                next_index += 1
+                if not line.strip():
+                    continue
+                if checkpoint is not None and checkpoint.is_done(index):
+                    continue
+                pending.add(asyncio.ensure_future(_run_one(graph, index, line, cache_bypass, slot)))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                record = task.result()
+                yield record
+                if checkpoint is not None and record["status"] in _CHECKPOINTED:
+                    checkpoint.mark_done(record["index"])
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,8 @@
+from .result_cache import ResultCache, make_key, prompt_hash
+from .node_cache import (
+    get_result_cache,
+    set_result_cache,
+    node_fingerprint,
+    invoke_cached,
+    ainvoke_cached,
+)
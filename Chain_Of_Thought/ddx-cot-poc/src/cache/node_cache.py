@@ -0,0 +1,110 @@
+# src/cache/node_cache.py
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from src.config.settings import (
+    DDX_CACHE_ENABLED,
+    DDX_CACHE_MAX_ITEMS,
+    DDX_CACHE_TTL_SECONDS,
+    DDX_CACHE_SQLITE_PATH,
+    DDX_CACHE_SQLITE_MAX_ITEMS,
+)
+from src.cache.result_cache import ResultCache, make_key
+from src.ratelimit import invoke_scheduled, ainvoke_scheduled
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import Runnable
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide cache built from settings, or None if DDX_CACHE_ENABLED is off."""
+    global _result_cache
+    if not DDX_CACHE_ENABLED:
+        return None
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            max_items=DDX_CACHE_MAX_ITEMS,
+            ttl_seconds=DDX_CACHE_TTL_SECONDS,
+            sqlite_path=DDX_CACHE_SQLITE_PATH,
+            sqlite_max_items=DDX_CACHE_SQLITE_MAX_ITEMS,
+        )
+    return _result_cache
+
+
+def set_result_cache(cache: Optional[ResultCache]) -> None:
+    """Swap the process-wide cache (tests / benchmarks)."""
+    global _result_cache
+    _result_cache = cache
+
+
+def _model_name(chain: "Runnable") -> str:
+    llm = getattr(chain, "last", chain)
+    llm = getattr(llm, "bound", llm)  # unwrap .bind(...) (e.g. JSON mode)
+    return getattr(llm, "model_name", None) or getattr(llm, "_llm_type", type(llm).__name__)
+
+
+def node_fingerprint(node: str, chain: "Runnable", template_hash: str, inputs: Dict[str, Any]) -> str:
+    """Content address of one node call: the result-cache key for its inputs."""
+    return make_key(node, template_hash, _model_name(chain), inputs)
+
+
+def invoke_cached(
+    node: str,
+    chain: "Runnable",
+    template_hash: str,
+    inputs: Dict[str, Any],
+    bypass: bool = False,
+    accept: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    Return the completion text for `chain.invoke(inputs)`, served from the
+    result cache when possible. With bypass=True the cached entry is
+    ignored and overwritten with the fresh result.
+
+    If `accept` is given, only completions it approves are served from or
+    written to the cache (e.g. so unparseable JSON is never cached).
+
+    Uncached calls go through the LLM rate-limit scheduler when one is
+    configured (see src.ratelimit).
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return invoke_scheduled(chain, inputs).content
+
+    key = node_fingerprint(node, chain, template_hash, inputs)
+    if not bypass:
+        cached = cache.get(key, node=node)
+        if cached is not None and (accept is None or accept(cached)):
+            return cached
+
+    content = invoke_scheduled(chain, inputs).content
+    if accept is None or accept(content):
+        cache.set(key, content)
+    return content
+
+
+async def ainvoke_cached(
+    node: str,
+    chain: "Runnable",
+    template_hash: str,
+    inputs: Dict[str, Any],
+    bypass: bool = False,
+    accept: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """Async variant of invoke_cached(); the SQLite tier is read and written off the event loop."""
+    cache = get_result_cache()
+    if cache is None:
+        return (await ainvoke_scheduled(chain, inputs)).content
+
+    key = node_fingerprint(node, chain, template_hash, inputs)
+    if not bypass:
+        cached = await cache.aget(key, node=node)
+        if cached is not None and (accept is None or accept(cached)):
+            return cached
+
+    content = (await ainvoke_scheduled(chain, inputs)).content
+    if accept is None or accept(content):
+        await cache.aset(key, content)
+    return content
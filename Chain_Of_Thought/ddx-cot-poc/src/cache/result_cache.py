@@ -0,0 +1,241 @@
+# src/cache/result_cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:  # langchain_core is slow to import and only needed for typing here
+    from langchain_core.prompts import ChatPromptTemplate
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_hash(prompt: "ChatPromptTemplate") -> str:
+    """Stable hash of a prompt template's messages (role + template text)."""
+    parts = []
+    for message in prompt.messages:
+        template = getattr(getattr(message, "prompt", None), "template", None)
+        parts.append(f"{type(message).__name__}:{template if template is not None else message}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def make_key(node: str, template_hash: str, model: str, inputs: Dict[str, Any]) -> str:
+    """
+    Content address for one node's LLM call.
+
+    The inputs always include the canonical case_summary (plus any
+    upstream node outputs the prompt uses), so a node's entry stays valid
+    as long as its own prompt, model and inputs are unchanged, regardless
+    of what happens to prompts further down the graph.
+    """
+    payload = json.dumps(
+        {"node": node, "prompt": template_hash, "model": model, "inputs": inputs},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for raw LLM completions.
+
+    - Tier 1: in-process LRU (OrderedDict), bounded by `max_items`.
+    - Tier 2: SQLite file shared across restarts/workers, bounded by
+      `sqlite_max_items` (oldest rows pruned). Disabled if `sqlite_path`
+      is empty.
+
+    Entries older than `ttl_seconds` are treated as misses in both tiers.
+
+    `get`/`set` are for sync callers. Async graph nodes use `aget`/`aset`:
+    the memory tier is served on the event loop, and SQLite reads and
+    writes run in a worker thread (`asyncio.to_thread`) so disk I/O never
+    blocks the loop. The two tiers have separate locks, so a memory hit
+    never waits behind a SQLite query.
+    """
+
+    _PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        max_items: int = 1024,
+        ttl_seconds: float = 86400,
+        sqlite_path: Optional[str] = None,
+        sqlite_max_items: int = 100_000,
+    ):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path or None
+        self.sqlite_max_items = sqlite_max_items
+
+        self._lock = threading.Lock()  # memory tier and counters
+        self._db_lock = threading.Lock()  # the SQLite connection
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._node_counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._writes_since_prune = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if self.sqlite_path:
+            directory = os.path.dirname(self.sqlite_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # A cache: losing the last writes on power loss is fine, so
+            # commits skip the per-transaction fsync.
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_results ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_results_created ON llm_results(created_at)"
+            )
+            self._db.commit()
+
+    # ---- public API ----
+
+    def get(self, key: str, node: str = "") -> Optional[str]:
+        now = time.time()
+        value = self._get_memory(key, node, now)
+        if value is not None or self._db is None:
+            return value
+        return self._promote(key, node, self._sqlite_get(key, now))
+
+    async def aget(self, key: str, node: str = "") -> Optional[str]:
+        """get() with the SQLite lookup off the event loop."""
+        now = time.time()
+        value = self._get_memory(key, node, now)
+        if value is not None or self._db is None:
+            return value
+        return self._promote(key, node, await asyncio.to_thread(self._sqlite_get, key, now))
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = self._set_memory(key, value)
+        if self._db is not None:
+            self._sqlite_set(key, value, expires_at)
+
+    async def aset(self, key: str, value: str) -> None:
+        """set() with the SQLite write off the event loop."""
+        expires_at = self._set_memory(key, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._sqlite_set, key, value, expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM llm_results")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        sqlite_items = None
+        if self._db is not None:
+            with self._db_lock:
+                sqlite_items = self._db.execute("SELECT COUNT(*) FROM llm_results").fetchone()[0]
+        with self._lock:
+            hits = self._counters["hits_memory"] + self._counters["hits_sqlite"]
+            lookups = hits + self._counters["misses"]
+            return {
+                "hits_memory": self._counters["hits_memory"],
+                "hits_sqlite": self._counters["hits_sqlite"],
+                "misses": self._counters["misses"],
+                "writes": self._counters["writes"],
+                "evictions": self._counters["evictions"],
+                "hit_ratio": (hits / lookups) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "memory_max_items": self.max_items,
+                "sqlite_items": sqlite_items,
+                "sqlite_max_items": self.sqlite_max_items if self._db is not None else None,
+                "ttl_seconds": self.ttl_seconds,
+                "by_node": {node: dict(c) for node, c in self._node_counters.items()},
+            }
+
+    # ---- memory tier ----
+
+    def _get_memory(self, key: str, node: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count("hits_memory", node)
+                    return value
+                del self._memory[key]
+            if self._db is None:
+                self._count("misses", node)
+            return None
+
+    def _promote(self, key: str, node: str, row: Optional[Tuple[str, float]]) -> Optional[str]:
+        """Record a SQLite lookup's outcome; a hit is copied into the memory tier."""
+        with self._lock:
+            if row is None:
+                self._count("misses", node)
+                return None
+            self._remember(key, row[1], row[0])
+            self._count("hits_sqlite", node)
+            return row[0]
+
+    def _set_memory(self, key: str, value: str) -> float:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._counters["writes"] += 1
+        return expires_at
+
+    # ---- SQLite tier (may run in a worker thread) ----
+
+    def _sqlite_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM llm_results WHERE key = ?", (key,)
+            ).fetchone()
+        return row if row is not None and row[1] > now else None
+
+    def _sqlite_set(self, key: str, value: str, expires_at: float) -> None:
+        now = time.time()
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_results (key, value, created_at, expires_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, expires_at),
+            )
+            self._db.commit()
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= self._PRUNE_EVERY:
+                self._prune_sqlite(now)
+
+    # ---- internals (caller holds self._lock, or self._db_lock for _prune_sqlite) ----
+
+    def _count(self, name: str, node: str) -> None:
+        self._counters[name] += 1
+        if node:
+            self._node_counters[node][name] += 1
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _prune_sqlite(self, now: float) -> None:
+        self._writes_since_prune = 0
+        self._db.execute("DELETE FROM llm_results WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM llm_results WHERE key IN ("
+            " SELECT key FROM llm_results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.sqlite_max_items,),
+        )
+        self._db.commit()
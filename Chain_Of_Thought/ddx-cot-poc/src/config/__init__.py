@@ -3,4 +3,39 @@ from .settings import (
     LANGFUSE_PUBLIC_KEY,
     LANGFUSE_SECRET_KEY,
     LANGFUSE_BASE_URL,
+    OPENAI_MODEL,
+    OPENAI_BASE_URL,
+    OPENAI_TEMPERATURE,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    DDX_ROUTING_ENABLED,
+    DDX_FAST_MODEL,
+    DDX_LLM_ROUTES,
+    DDX_LLM_RPM,
+    DDX_LLM_TPM,
+    DDX_LLM_BURST_SECONDS,
+    DDX_LLM_EST_COMPLETION_TOKENS,
+    DDX_LLM_MAX_RETRIES,
+    DDX_LLM_RETRY_BACKOFF_SECONDS,
+    DDX_LLM_BACKEND,
+    DDX_REPLAY_PATH,
+    DDX_REPLAY_LATENCY_MS,
+    DDX_REPLAY_JITTER_MS,
+    DDX_REPLAY_SEED,
+    DDX_MAX_CONCURRENCY,
+    DDX_CASE_STORE_MAX_ITEMS,
+    DDX_SIMILAR_MODE,
+    DDX_SIMILAR_THRESHOLD,
+    DDX_SIMILAR_MAX_ITEMS,
+    DDX_EVIDENCE_MODE,
+    DDX_PARSE_MAX_RETRIES,
+    DDX_BATCH_CONCURRENCY,
+    DDX_BATCH_CHECKPOINT_DIR,
+    DDX_METRICS_ENABLED,
+    DDX_CACHE_ENABLED,
+    DDX_CACHE_MAX_ITEMS,
+    DDX_CACHE_TTL_SECONDS,
+    DDX_CACHE_SQLITE_PATH,
+    DDX_CACHE_SQLITE_MAX_ITEMS,
 )
+from .routing import LLMRoute, NODE_ROUTES, get_route
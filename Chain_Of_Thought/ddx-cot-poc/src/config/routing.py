@@ -0,0 +1,53 @@
+import json
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from src.config.settings import DDX_FAST_MODEL, DDX_LLM_ROUTES, OPENAI_MODEL
+
+
+@dataclass(frozen=True)
+class LLMRoute:
+    """
+    Which model serves a graph node, and its limits.
+
+    - max_tokens: completion cap sent to the provider
+    - timeout: per-request client timeout, in seconds
+    - latency_budget_s: if the primary model has not answered within this
+      many seconds (or fails), the node is re-run on `fallback_model`
+    """
+
+    model: str
+    max_tokens: Optional[int] = None
+    timeout: Optional[float] = None
+    latency_budget_s: Optional[float] = None
+    fallback_model: Optional[str] = None
+
+
+# Free-text findings and the investigation list do well on the small model
+# with tight caps; the differential and its evidence keep the stronger one,
+# falling back to the small model when they run over budget.
+NODE_ROUTES: Dict[str, LLMRoute] = {
+    "extract_key_findings": LLMRoute(DDX_FAST_MODEL, max_tokens=400, timeout=30),
+    "generate_candidates": LLMRoute(
+        OPENAI_MODEL, max_tokens=700, timeout=60, latency_budget_s=12, fallback_model=DDX_FAST_MODEL
+    ),
+    "evidence_for_against": LLMRoute(
+        OPENAI_MODEL, max_tokens=1200, timeout=60, latency_budget_s=20, fallback_model=DDX_FAST_MODEL
+    ),
+    "evidence_for_diagnosis": LLMRoute(
+        OPENAI_MODEL, max_tokens=400, timeout=60, latency_budget_s=10, fallback_model=DDX_FAST_MODEL
+    ),
+    "suggest_investigations": LLMRoute(DDX_FAST_MODEL, max_tokens=500, timeout=30),
+    "fast_ddx": LLMRoute(
+        OPENAI_MODEL, max_tokens=1800, timeout=60, latency_budget_s=20, fallback_model=DDX_FAST_MODEL
+    ),
+}
+
+if DDX_LLM_ROUTES:
+    for _node, _fields in json.loads(DDX_LLM_ROUTES).items():
+        NODE_ROUTES[_node] = replace(NODE_ROUTES.get(_node, LLMRoute(OPENAI_MODEL)), **_fields)
+
+
+def get_route(node: str) -> LLMRoute:
+    """Route for `node` (OPENAI_MODEL without limits if it has none)."""
+    return NODE_ROUTES.get(node, LLMRoute(OPENAI_MODEL))
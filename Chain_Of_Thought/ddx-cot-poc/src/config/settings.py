@@ -8,5 +8,84 @@ LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 LANGFUSE_BASE_URL = os.getenv("LANGFUSE_BASE_URL", "https://cloud.langfuse.com")
 
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY is not set in environment.")
+# LLM defaults + shared HTTP connection pool (one pool per process)
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. a local stub server
+OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "400"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "100"))
+
+# Per-node model routing (table in src/config/routing.py). DDX_FAST_MODEL
+# serves the lighter nodes and is the fallback when a node's primary model
+# exceeds its latency budget. DDX_LLM_ROUTES overrides the table with a
+# JSON object, e.g. '{"generate_candidates": {"model": "gpt-4.1", "max_tokens": 900}}'.
+# Off by default: every node uses OPENAI_MODEL without limits. Turning it on
+# moves key findings and investigations to DDX_FAST_MODEL, a quality change
+# the operator has to opt into.
+DDX_ROUTING_ENABLED = os.getenv("DDX_ROUTING_ENABLED", "false").lower() in ("1", "true", "yes")
+DDX_FAST_MODEL = os.getenv("DDX_FAST_MODEL", "gpt-4.1-nano")
+DDX_LLM_ROUTES = os.getenv("DDX_LLM_ROUTES", "")
+
+# Outbound LLM rate limits shared by every call in this process
+# (src/ratelimit). 0 disables a budget; both 0 disables the scheduler.
+# Interactive calls (/ddx, /ddx/stream, amend) are dispatched ahead of
+# batch calls (/ddx/batch, CLI batch). Token cost is estimated before the
+# call (prompt chars / 4 + max_tokens or DDX_LLM_EST_COMPLETION_TOKENS) and
+# corrected from the reported usage afterwards. With the scheduler on, 429s
+# and transient errors are retried here (up to DDX_LLM_MAX_RETRIES, a 429
+# pausing all dispatch) instead of inside the OpenAI SDK.
+DDX_LLM_RPM = float(os.getenv("DDX_LLM_RPM", "0"))
+DDX_LLM_TPM = float(os.getenv("DDX_LLM_TPM", "0"))
+DDX_LLM_BURST_SECONDS = float(os.getenv("DDX_LLM_BURST_SECONDS", "10"))
+DDX_LLM_EST_COMPLETION_TOKENS = int(os.getenv("DDX_LLM_EST_COMPLETION_TOKENS", "600"))
+DDX_LLM_MAX_RETRIES = int(os.getenv("DDX_LLM_MAX_RETRIES", "2"))
+DDX_LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("DDX_LLM_RETRY_BACKOFF_SECONDS", "1"))
+
+# LLM backend: "openai" (live API), "replay" (serve recorded responses from
+# DDX_REPLAY_PATH, no network/key needed) or "record" (live API, appending
+# every response to DDX_REPLAY_PATH)
+DDX_LLM_BACKEND = os.getenv("DDX_LLM_BACKEND", "openai")
+DDX_REPLAY_PATH = os.getenv("DDX_REPLAY_PATH", "tests/fixtures/ddx_replay.jsonl")
+DDX_REPLAY_LATENCY_MS = float(os.getenv("DDX_REPLAY_LATENCY_MS", "0"))
+DDX_REPLAY_JITTER_MS = float(os.getenv("DDX_REPLAY_JITTER_MS", "0"))
+DDX_REPLAY_SEED = os.getenv("DDX_REPLAY_SEED")
+
+# API: max DDx cases executing concurrently per worker process
+DDX_MAX_CONCURRENCY = int(os.getenv("DDX_MAX_CONCURRENCY", "200"))
+
+# Cases kept for POST /ddx/{case_id}/amend (least recently used evicted)
+DDX_CASE_STORE_MAX_ITEMS = int(os.getenv("DDX_CASE_STORE_MAX_ITEMS", "1000"))
+
+# Near-duplicate reuse on /ddx (src/similarity): "off", "return" (answer
+# with the nearest earlier result) or "seed" (run the case with the earlier
+# differentials as a hint). Applies when cosine similarity of the case
+# summaries >= DDX_SIMILAR_THRESHOLD; the last DDX_SIMILAR_MAX_ITEMS results
+# per worker are indexed.
+DDX_SIMILAR_MODE = os.getenv("DDX_SIMILAR_MODE", "off")
+DDX_SIMILAR_THRESHOLD = float(os.getenv("DDX_SIMILAR_THRESHOLD", "0.9"))
+DDX_SIMILAR_MAX_ITEMS = int(os.getenv("DDX_SIMILAR_MAX_ITEMS", "100000"))
+
+# Graph shape: "single" (one evidence call for all candidates) or
+# "per_diagnosis" (one parallel evidence call per candidate)
+DDX_EVIDENCE_MODE = os.getenv("DDX_EVIDENCE_MODE", "single")
+
+# Structured output: extra attempts for a JSON node whose output cannot be
+# parsed/repaired (only that node is retried)
+DDX_PARSE_MAX_RETRIES = int(os.getenv("DDX_PARSE_MAX_RETRIES", "1"))
+
+# Batch / backfill mode (/ddx/batch and `python -m src.main batch`)
+DDX_BATCH_CONCURRENCY = int(os.getenv("DDX_BATCH_CONCURRENCY", "16"))
+DDX_BATCH_CHECKPOINT_DIR = os.getenv("DDX_BATCH_CHECKPOINT_DIR", ".cache/batch_checkpoints")
+
+# In-process metrics (node/LLM latency, tokens, queue time) served at /metrics
+DDX_METRICS_ENABLED = os.getenv("DDX_METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Per-node LLM result cache (in-memory LRU + SQLite)
+DDX_CACHE_ENABLED = os.getenv("DDX_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+DDX_CACHE_MAX_ITEMS = int(os.getenv("DDX_CACHE_MAX_ITEMS", "1024"))
+DDX_CACHE_TTL_SECONDS = float(os.getenv("DDX_CACHE_TTL_SECONDS", "86400"))
+DDX_CACHE_SQLITE_PATH = os.getenv("DDX_CACHE_SQLITE_PATH", ".cache/ddx_cache.sqlite3")
+DDX_CACHE_SQLITE_MAX_ITEMS = int(os.getenv("DDX_CACHE_SQLITE_MAX_ITEMS", "100000"))
+
+# OPENAI_API_KEY is checked when the first OpenAI-backed model is built
+# (src.llm.get_llm), not here, so importing the service never fails.
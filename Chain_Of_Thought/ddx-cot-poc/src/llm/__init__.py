@@ -1 +1,3 @@
-from .llm_client import get_traced_llm
+from .llm_client import get_traced_llm, get_llm, get_http_clients, clear_llm_registry, json_mode
+from .replay import ReplayChatModel, ReplayRecorder, ReplayMissError, messages_key
+from .tracing import get_callbacks, get_langfuse_handler, flush_tracing
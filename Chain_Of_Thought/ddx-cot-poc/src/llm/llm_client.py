@@ -1,80 +1,189 @@
 # src/llm/llm_client.py
 
 import logging
-from typing import List, Optional
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
 
-from src.config.settings import OPENAI_API_KEY
+from src.config.settings import (
+    OPENAI_API_KEY,
+    OPENAI_MODEL,
+    OPENAI_BASE_URL,
+    OPENAI_TEMPERATURE,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    DDX_LLM_BACKEND,
+    DDX_REPLAY_PATH,
+    DDX_REPLAY_LATENCY_MS,
+    DDX_REPLAY_JITTER_MS,
+    DDX_REPLAY_SEED,
+)
+from src.llm import tracing
+from src.llm.replay import ReplayChatModel, ReplayRecorder
+from src.llm.tracing import get_callbacks
+from src.ratelimit import get_llm_scheduler
 
 logger = logging.getLogger(__name__)
 
 
-# Try to set up Langfuse integration (optional) — be explicit about failures so
-# users can see why tracing is disabled.
-langfuse_client = None
-langfuse_handler = None
-CALLBACKS: List = []
-try:
-    from langfuse import get_client
-    # The langfuse.langchain integration requires the "langchain" package to be
-    # installed. If it's missing, the import below will raise and we will report
-    # the reason rather than silently swallowing the error.
-    from langfuse.langchain import CallbackHandler
-
-    # Initialize Langfuse client (not strictly required for CallbackHandler in
-    # some setups, but useful if you want to use the client elsewhere)
-    try:
-        langfuse_client = get_client()
-    except Exception as e:
-        logger.warning("langfuse.get_client() failed, tracing may not be active: %s", e)
-        langfuse_client = None
-
-    # This handler is what LangChain / LangGraph will use for tracing
-    try:
-        # Prefer attaching the client if available — some versions of
-        # langfuse.langchain.CallbackHandler may not accept a `client` arg,
-        # so try both ways and fall back gracefully.
-        if langfuse_client:
-            try:
-                langfuse_handler: Optional[CallbackHandler] = CallbackHandler(client=langfuse_client)
-            except TypeError:
-                # older/newer versions may not accept `client`; use no-arg constructor
-                logger.debug("CallbackHandler(client=...) not supported, falling back to no-arg constructor")
-                langfuse_handler = CallbackHandler()
-        else:
-            langfuse_handler = CallbackHandler()
-        CALLBACKS = [langfuse_handler]
-        logger.info("Langfuse tracing enabled via CallbackHandler=%s", type(langfuse_handler))
-    except Exception as e:
-        logger.exception("Failed to create Langfuse CallbackHandler, will run without tracing: %s", e)
-        langfuse_handler = None
-        CALLBACKS = []
-except ModuleNotFoundError as err:
-    # Known failure: missing 'langchain' package required by langfuse.langchain
-    logger.warning(
-        "Langfuse langchain integration not available: %s — please install 'langchain' to enable tracing",
-        err,
+def __getattr__(name: str):
+    # Tracing objects are created lazily (see src.llm.tracing); keep the
+    # old module attributes working for callers that import them.
+    if name in ("langfuse_client", "langfuse_handler", "CALLBACKS"):
+        get_callbacks()
+        return getattr(tracing, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Process-wide client registry. Building a ChatOpenAI (and its underlying
+# OpenAI SDK client) is not free, so we build one per distinct configuration
+# and share it across nodes and requests. All instances share a single
+# connection pool, so keep-alive connections are reused between calls.
+_registry_lock = threading.Lock()
+_llm_registry: Dict[Tuple[Any, ...], BaseChatModel] = {}
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_recorder: Optional[ReplayRecorder] = None
+
+LLM_BACKENDS = ("openai", "replay", "record")
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
     )
-except Exception as err:  # pragma: no cover - defensive logging
-    logger.warning("Unexpected error while initializing Langfuse integration: %s", err)
 
 
-def get_traced_llm() -> ChatOpenAI:
+def get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
     """
-    Return a ChatOpenAI model.
+    Return the shared (sync, async) httpx clients used by every ChatOpenAI
+    built through this module. Created lazily on first use.
+    """
+    with _registry_lock:
+        return _shared_http_clients()
 
-    - If Langfuse is available, the model will use Langfuse's CallbackHandler
-      for tracing (via CALLBACKS).
-    - If not, it will just run without callbacks.
+
+def _shared_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    # Caller holds _registry_lock.
+    global _http_client, _http_async_client
+    if _http_client is None:
+        _http_client = httpx.Client(limits=_pool_limits())
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(limits=_pool_limits())
+    return _http_client, _http_async_client
+
+
+def get_llm(
+    model: str = OPENAI_MODEL,
+    temperature: float = OPENAI_TEMPERATURE,
+    backend: str = DDX_LLM_BACKEND,
+    **kwargs: Any,
+) -> BaseChatModel:
+    """
+    Return a shared chat model for the given configuration.
+
+    The first call for a (backend, model, temperature, kwargs) combination
+    builds the client; subsequent calls return the same instance. Extra
+    kwargs are passed straight to ChatOpenAI (e.g. max_tokens, timeout).
+
+    backend (default DDX_LLM_BACKEND):
+    - "openai": ChatOpenAI against OPENAI_BASE_URL
+    - "replay": ReplayChatModel serving DDX_REPLAY_PATH, with
+      DDX_REPLAY_LATENCY_MS / DDX_REPLAY_JITTER_MS (no network or key)
+    - "record": ChatOpenAI that also appends every response to DDX_REPLAY_PATH
     """
-    if not OPENAI_API_KEY:
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"backend must be one of {LLM_BACKENDS}, got {backend!r}")
+    if backend != "replay" and not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY is not set in environment/.env")
 
-    llm = ChatOpenAI(
-        model="gpt-4.1-mini",
-        temperature=0.2,
+    key = (backend, model, temperature, tuple(sorted(kwargs.items())))
+    llm = _llm_registry.get(key)
+    if llm is not None:
+        return llm
+
+    with _registry_lock:
+        llm = _llm_registry.get(key)
+        if llm is None:
+            llm = _build_llm(backend, model, temperature, **kwargs)
+            _llm_registry[key] = llm
+    return llm
+
+
+def _build_llm(backend: str, model: str, temperature: float, **kwargs: Any) -> BaseChatModel:
+    # Caller holds _registry_lock.
+    global _recorder
+    if backend == "replay":
+        return ReplayChatModel(
+            path=DDX_REPLAY_PATH,
+            latency_ms=DDX_REPLAY_LATENCY_MS,
+            jitter_ms=DDX_REPLAY_JITTER_MS,
+            seed=int(DDX_REPLAY_SEED) if DDX_REPLAY_SEED else None,
+            model_name=f"replay:{model}",
+            callbacks=get_callbacks(),
+        )
+
+    # Imported here: langchain_openai + openai dominate import time and are
+    # not needed by the replay backend.
+    from langchain_openai import ChatOpenAI
+
+    callbacks = list(get_callbacks())
+    if backend == "record":
+        if _recorder is None:
+            _recorder = ReplayRecorder(DDX_REPLAY_PATH)
+        callbacks.append(_recorder)
+
+    # The scheduler retries 429s/transient errors itself (with a pause shared
+    # by all calls); SDK retries would bypass it.
+    if get_llm_scheduler() is not None:
+        kwargs.setdefault("max_retries", 0)
+
+    http_client, http_async_client = _shared_http_clients()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
         api_key=OPENAI_API_KEY,
-        callbacks=CALLBACKS,
+        base_url=OPENAI_BASE_URL,
+        callbacks=callbacks,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        **kwargs,
     )
+
+
+def json_mode(llm: BaseChatModel) -> Runnable:
+    """
+    Ask the provider for a JSON object response (OpenAI JSON mode) when the
+    model supports it; other chat models are returned unchanged.
+    """
+    # Only a loaded langchain_openai can have produced a ChatOpenAI.
+    if "langchain_openai" not in sys.modules:
+        return llm
+    from langchain_openai import ChatOpenAI
+
+    if isinstance(llm, ChatOpenAI):
+        return llm.bind(response_format={"type": "json_object"})
     return llm
+
+
+def clear_llm_registry() -> None:
+    """Drop all cached clients (mainly for tests / config reloads)."""
+    with _registry_lock:
+        _llm_registry.clear()
+
+
+def get_traced_llm() -> BaseChatModel:
+    """
+    Return the shared default chat model (ChatOpenAI unless
+    DDX_LLM_BACKEND selects the replay backend).
+
+    - If Langfuse is available, the model will use Langfuse's CallbackHandler
+      for tracing (set up on first use, see src.llm.tracing).
+    - If not, it will just run without callbacks.
+    """
+    return get_llm()
@@ -0,0 +1,199 @@
+# src/llm/replay.py
+
+"""
+Recorded-response LLM backend.
+
+`ReplayRecorder` is a callback that appends every chat completion to a
+JSONL file; `ReplayChatModel` serves those completions back with a
+configurable latency and jitter and no network access. Each line is:
+
+    {"node": "<langgraph node>", "key": "<sha256 of the prompt>", "content": "..."}
+
+A prompt is answered by its exact recording if there is one, otherwise by
+the latest recording for the same graph node, so replays keep working for
+cases that were never recorded.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult, LLMResult
+from pydantic import PrivateAttr
+
+
+class ReplayMissError(LookupError):
+    """No recording matches the prompt or its graph node."""
+
+
+def messages_key(messages: Sequence[BaseMessage]) -> str:
+    """Stable hash of a rendered prompt (message roles + contents)."""
+    payload = [(m.type, m.content) for m in messages]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _node_of(run_manager: Any) -> str:
+    return (getattr(run_manager, "metadata", None) or {}).get("langgraph_node", "")
+
+
+def _chunks(text: str) -> List[str]:
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + words[-1:]
+
+
+class ReplayRecorder(BaseCallbackHandler):
+    """Appends each (node, prompt key, completion) to a JSONL recordings file."""
+
+    run_inline = True
+    ignore_chain = True
+    ignore_agent = True
+    ignore_retriever = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: Dict[UUID, tuple] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node", "")
+        self._pending[run_id] = (node, messages_key(messages[0]))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        pending = self._pending.pop(run_id, None)
+        if pending is None or not response.generations or not response.generations[0]:
+            return
+        node, key = pending
+        line = json.dumps({"node": node, "key": key, "content": response.generations[0][0].text})
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._pending.pop(run_id, None)
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Chat model that answers from a recordings file.
+
+    Each call sleeps latency_ms +/- a uniform jitter_ms (never below zero);
+    pass `seed` for a reproducible jitter sequence. Streaming spreads the
+    same delay over word-sized chunks.
+    """
+
+    path: str
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: Optional[int] = None
+    model_name: str = "replay"
+
+    _by_key: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _by_node: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._by_key[entry["key"]] = entry["content"]
+                if entry.get("node"):
+                    self._by_node[entry["node"]] = entry["content"]
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _delay(self) -> float:
+        jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _lookup(self, messages: List[BaseMessage], node: str) -> str:
+        content = self._by_key.get(messages_key(messages))
+        if content is None:
+            content = self._by_node.get(node)
+        if content is None:
+            raise ReplayMissError(f"no recording for this prompt or node {node!r} in {self.path}")
+        return content
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content = self._lookup(messages, _node_of(run_manager))
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content = self._lookup(messages, _node_of(run_manager))
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        content = self._lookup(messages, _node_of(run_manager))
+        pieces = _chunks(content)
+        step = self._delay() / len(pieces)
+        for piece in pieces:
+            if step:
+                time.sleep(step)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        content = self._lookup(messages, _node_of(run_manager))
+        pieces = _chunks(content)
+        step = self._delay() / len(pieces)
+        for piece in pieces:
+            if step:
+                await asyncio.sleep(step)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
@@ -0,0 +1,127 @@
+# src/llm/tracing.py
+
+"""
+Lazy Langfuse tracing setup.
+
+Nothing from langfuse is imported until the first call to
+get_callbacks() (normally when the first chat model is built), so
+importing the service stays fast. Spans are exported by Langfuse's own
+background batch processor; flush_tracing() pushes the queue out on a
+background thread, so callers never block on the network unless they
+ask to wait (e.g. at shutdown).
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_init_lock = threading.Lock()
+_initialised = False
+langfuse_client: Any = None
+langfuse_handler: Any = None
+CALLBACKS: List = []
+
+_flush_executor: Optional[ThreadPoolExecutor] = None
+_pending_flush: Optional[Future] = None
+
+
+def _init() -> None:
+    # Caller holds _init_lock. Be explicit about failures so users can see
+    # why tracing is disabled.
+    global langfuse_client, langfuse_handler, CALLBACKS
+    try:
+        from langfuse import get_client
+        # The langfuse.langchain integration requires the "langchain" package to be
+        # installed. If it's missing, the import below will raise and we will report
+        # the reason rather than silently swallowing the error.
+        from langfuse.langchain import CallbackHandler
+    except ModuleNotFoundError as err:
+        # Known failure: missing 'langchain' package required by langfuse.langchain
+        logger.warning(
+            "Langfuse langchain integration not available: %s — please install 'langchain' to enable tracing",
+            err,
+        )
+        return
+    except Exception as err:  # pragma: no cover - defensive logging
+        logger.warning("Unexpected error while initializing Langfuse integration: %s", err)
+        return
+
+    # Initialize Langfuse client (not strictly required for CallbackHandler in
+    # some setups, but useful if you want to use the client elsewhere)
+    try:
+        langfuse_client = get_client()
+    except Exception as e:
+        logger.warning("langfuse.get_client() failed, tracing may not be active: %s", e)
+        langfuse_client = None
+
+    # This handler is what LangChain / LangGraph will use for tracing
+    try:
+        # Prefer attaching the client if available — some versions of
+        # langfuse.langchain.CallbackHandler may not accept a `client` arg,
+        # so try both ways and fall back gracefully.
+        if langfuse_client:
+            try:
+                langfuse_handler = CallbackHandler(client=langfuse_client)
+            except TypeError:
+                # older/newer versions may not accept `client`; use no-arg constructor
+                logger.debug("CallbackHandler(client=...) not supported, falling back to no-arg constructor")
+                langfuse_handler = CallbackHandler()
+        else:
+            langfuse_handler = CallbackHandler()
+        CALLBACKS = [langfuse_handler]
+        logger.info("Langfuse tracing enabled via CallbackHandler=%s", type(langfuse_handler))
+    except Exception as e:
+        logger.exception("Failed to create Langfuse CallbackHandler, will run without tracing: %s", e)
+        langfuse_handler = None
+        CALLBACKS = []
+
+
+def get_callbacks() -> List:
+    """LangChain callbacks for tracing ([] if Langfuse is unavailable); set up on first call."""
+    global _initialised
+    if not _initialised:
+        with _init_lock:
+            if not _initialised:
+                _init()
+                _initialised = True
+    return CALLBACKS
+
+
+def get_langfuse_handler():
+    """The Langfuse CallbackHandler, or None if tracing is unavailable."""
+    get_callbacks()
+    return langfuse_handler
+
+
+def flush_tracing(wait: bool = False, timeout: Optional[float] = None) -> Optional[Future]:
+    """
+    Flush buffered Langfuse spans on a background thread.
+
+    Concurrent calls share one pending flush. Returns its Future (None if
+    tracing was never set up); with wait=True, blocks up to `timeout`.
+    """
+    global _flush_executor, _pending_flush
+    if not _initialised or langfuse_client is None:
+        return None
+    with _init_lock:
+        if _pending_flush is None or _pending_flush.done():
+            if _flush_executor is None:
+                _flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="langfuse-flush")
+            _pending_flush = _flush_executor.submit(_flush)
+        future = _pending_flush
+    if wait:
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning("Langfuse flush did not complete: %s", e)
+    return future
+
+
+def _flush() -> None:
+    try:
+        langfuse_client.flush()
+    except Exception as e:
+        logger.warning("Langfuse flush failed: %s", e)
@@ -1,11 +1,15 @@
+import argparse
+import asyncio
+import json
+import sys
 from pprint import pprint
 
-from src.orchestration import build_ddx_graph
-from src.llm.llm_client import langfuse_handler
+from src.orchestration import build_ddx_graph, build_fast_ddx_graph
+from src.llm import flush_tracing, get_langfuse_handler
 
 
-def main():
-    graph = build_ddx_graph()
+def run_example(fast: bool = False):
+    graph = build_fast_ddx_graph() if fast else build_ddx_graph()
 
     patient_case = {
         "age": 65,
@@ -20,6 +24,7 @@ def main():
     initial_state = {"patient_case": patient_case}
 
     # If langfuse_handler is None, just pass empty callbacks
+    langfuse_handler = get_langfuse_handler()
     callbacks = [langfuse_handler] if langfuse_handler is not None else []
 
     result_state = graph.invoke(
@@ -33,5 +38,69 @@ def main():
     pprint(result_state["final_output"])
 
 
+async def run_batch_cli(args: argparse.Namespace) -> None:
+    """
+    Backfill: stream JSONL cases from --input, write NDJSON results to
+    --output (or stdout) as they complete. With --checkpoint, completed
+    lines are recorded and skipped on the next run, and --output is
+    appended to instead of truncated.
+    """
+    from src.batch import BatchCheckpoint, aiter_sync, run_batch
+
+    graph = build_fast_ddx_graph() if args.fast else build_ddx_graph()
+    checkpoint = BatchCheckpoint(args.checkpoint) if args.checkpoint else None
+    out = sys.stdout
+    if args.output:
+        out = open(args.output, "a" if checkpoint else "w", encoding="utf-8")
+
+    counts = {"ok": 0, "invalid": 0, "error": 0}
+    try:
+        with open(args.input, "r", encoding="utf-8") as fh:
+            async for record in run_batch(
+                aiter_sync(fh),
+                graph,
+                concurrency=args.concurrency,
+                checkpoint=checkpoint,
+                cache_bypass=args.no_cache,
+            ):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                counts[record["status"]] += 1
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"batch done: {counts}", file=sys.stderr)
+
+
+def main(argv=None):
+    from src.config.settings import DDX_BATCH_CONCURRENCY
+
+    parser = argparse.ArgumentParser(description="CoT-assisted DDx explainer (POC)")
+    sub = parser.add_subparsers(dest="command")
+    example = sub.add_parser("example", help="run the built-in example case (default)")
+    example.add_argument("--fast", action="store_true", help="single-call fast mode")
+
+    batch = sub.add_parser("batch", help="run a JSONL file of PatientCase records")
+    batch.add_argument("--input", required=True, help="JSONL file, one PatientCase per line")
+    batch.add_argument("--output", help="NDJSON output file (default: stdout)")
+    batch.add_argument("--checkpoint", help="checkpoint file for resume after a crash")
+    batch.add_argument("--concurrency", type=int, default=DDX_BATCH_CONCURRENCY)
+    batch.add_argument("--no-cache", action="store_true", help="bypass the LLM result cache")
+    batch.add_argument("--fast", action="store_true", help="single-call fast mode")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "batch":
+            asyncio.run(run_batch_cli(args))
+        else:
+            run_example(fast=getattr(args, "fast", False))
+    finally:
+        # Don't lose buffered traces when the process exits.
+        flush_tracing(wait=True, timeout=10)
+
+
 if __name__ == "__main__":
     main()
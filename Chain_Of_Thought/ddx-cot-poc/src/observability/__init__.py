@@ -0,0 +1,12 @@
+from .metrics import (
+    CONTENT_TYPE,
+    Counter,
+    Histogram,
+    counter,
+    format_family,
+    histogram,
+    register_collector,
+    render_metrics,
+    reset_metrics,
+)
+from .instrumentation import instrument_node, timed_slot
@@ -0,0 +1,175 @@
+# src/observability/instrumentation.py
+
+"""
+DDx metrics: graph node timings, LLM call latency/tokens, queue time for
+the per-worker concurrency cap and the LLM rate-limit scheduler, plus
+scrape-time collectors for the result cache, structured-output retries and
+scheduler queue depth.
+
+The LLM callback that feeds the ddx_llm_* metrics lives in
+src.observability.llm_callback (it needs langchain_core, which this module
+avoids so the API can import it cheaply).
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Callable, List
+
+from src.observability.metrics import (
+    TOKEN_BUCKETS,
+    counter,
+    format_family,
+    histogram,
+    register_collector,
+)
+
+NODE_SECONDS = histogram(
+    "ddx_node_duration_seconds", "Wall time per graph node execution.", ("node",)
+)
+NODE_ERRORS = counter(
+    "ddx_node_errors_total", "Graph node executions that raised.", ("node",)
+)
+LLM_SECONDS = histogram(
+    "ddx_llm_call_duration_seconds", "Latency of each LLM call (cache hits excluded).", ("node", "model")
+)
+LLM_ERRORS = counter(
+    "ddx_llm_call_errors_total", "LLM calls that raised.", ("node", "model")
+)
+LLM_PROMPT_TOKENS = histogram(
+    "ddx_llm_prompt_tokens", "Prompt tokens per LLM call.", ("node", "model"), TOKEN_BUCKETS
+)
+LLM_COMPLETION_TOKENS = histogram(
+    "ddx_llm_completion_tokens", "Completion tokens per LLM call.", ("node", "model"), TOKEN_BUCKETS
+)
+LLM_QUEUE_SECONDS = histogram(
+    "ddx_llm_queue_wait_seconds", "Time an LLM call waited for the rate-limit scheduler.", ("priority",)
+)
+LLM_RATE_LIMITED = counter(
+    "ddx_llm_rate_limited_total", "LLM calls answered with HTTP 429 (retried after a shared pause).", ("priority",)
+)
+LLM_ROUTES = counter(
+    "ddx_llm_route_total",
+    "LLM node runs by the route that served them (primary, or fallback after the latency budget).",
+    ("node", "route", "model"),
+)
+MEMO_HITS = counter(
+    "ddx_node_memo_hits_total", "Node outputs reused from the previous run of an amended case.", ("node",)
+)
+SIMILAR_LOOKUPS = counter(
+    "ddx_similar_case_lookups_total",
+    "Near-duplicate lookups on /ddx by DDX_SIMILAR_MODE and outcome (hit/miss).",
+    ("mode", "result"),
+)
+COALESCED_REQUESTS = counter(
+    "ddx_coalesced_requests_total",
+    "Requests that shared the result of an identical in-flight request instead of running the graph.",
+    ("endpoint",),
+)
+QUEUE_SECONDS = histogram(
+    "ddx_queue_wait_seconds", "Time a request waited for a DDX_MAX_CONCURRENCY slot.", ("endpoint",)
+)
+REQUEST_SECONDS = histogram(
+    "ddx_request_duration_seconds", "Graph run time per request, excluding queue wait.", ("endpoint",)
+)
+
+
+def instrument_node(name: str, func: Callable) -> Callable:
+    """Wrap a sync or async node function so its wall time is recorded."""
+    if asyncio.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def timed_async(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except BaseException:
+                NODE_ERRORS.inc(1, name)
+                raise
+            finally:
+                NODE_SECONDS.observe(time.perf_counter() - start, name)
+
+        return timed_async
+
+    @wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            NODE_ERRORS.inc(1, name)
+            raise
+        finally:
+            NODE_SECONDS.observe(time.perf_counter() - start, name)
+
+    return timed
+
+
+@asynccontextmanager
+async def timed_slot(slots: asyncio.Semaphore, endpoint: str):
+    """Acquire `slots`, recording the wait and then the time the slot is held."""
+    start = time.perf_counter()
+    async with slots:
+        acquired = time.perf_counter()
+        QUEUE_SECONDS.observe(acquired - start, endpoint)
+        try:
+            yield
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - acquired, endpoint)
+
+
+def _cache_lines() -> List[str]:
+    from src.cache import get_result_cache
+
+    cache = get_result_cache()
+    if cache is None:
+        return []
+    by_node = cache.stats()["by_node"]
+    samples = [
+        ({"node": node, "result": result}, counts.get(result, 0))
+        for node, counts in sorted(by_node.items())
+        for result in ("hits_memory", "hits_sqlite", "misses")
+    ]
+    return format_family(
+        "ddx_cache_lookups_total", "counter", "Per-node LLM result cache lookups by outcome.", samples
+    )
+
+
+def _parse_lines() -> List[str]:
+    # Not imported until a graph is built; before that nothing was parsed.
+    parsing = sys.modules.get("src.orchestration.parsing")
+    if parsing is None:
+        return []
+    stats = sorted(parsing.parse_stats().items())
+    outcomes = [
+        ({"node": node, "status": status}, counts[status])
+        for node, counts in stats
+        for status in ("ok", "repaired", "failed")
+    ]
+    retries = [({"node": node}, counts["retries"]) for node, counts in stats]
+    return format_family(
+        "ddx_parse_results_total", "counter", "Structured-output parse outcomes per node.", outcomes
+    ) + format_family(
+        "ddx_parse_retries_total", "counter", "LLM calls repeated because output could not be parsed.", retries
+    )
+
+
+def _scheduler_lines() -> List[str]:
+    scheduler_module = sys.modules.get("src.ratelimit.scheduler")
+    scheduler = scheduler_module._llm_scheduler if scheduler_module is not None else None
+    if scheduler is None:
+        return []
+    depth = [({"priority": priority}, n) for priority, n in scheduler.queue_depth().items()]
+    available = [({"budget": budget}, level) for budget, level in scheduler.available().items()]
+    return format_family(
+        "ddx_llm_queue_depth", "gauge", "LLM calls waiting for the rate-limit scheduler.", depth
+    ) + format_family(
+        "ddx_llm_rate_limit_available", "gauge", "Requests/tokens the scheduler could dispatch now.", available
+    )
+
+
+register_collector("cache", _cache_lines)
+register_collector("parse", _parse_lines)
+register_collector("scheduler", _scheduler_lines)
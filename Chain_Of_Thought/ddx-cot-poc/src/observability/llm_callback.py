@@ -0,0 +1,83 @@
+# src/observability/llm_callback.py
+
+"""LangChain callback feeding the ddx_llm_* metrics."""
+
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.observability.instrumentation import (
+    LLM_COMPLETION_TOKENS,
+    LLM_ERRORS,
+    LLM_PROMPT_TOKENS,
+    LLM_SECONDS,
+)
+
+
+def _usage(response: LLMResult) -> Optional[Dict[str, int]]:
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {"prompt": usage.get("input_tokens", 0), "completion": usage.get("output_tokens", 0)}
+    token_usage = (response.llm_output or {}).get("token_usage")
+    if token_usage:
+        return {
+            "prompt": token_usage.get("prompt_tokens", 0),
+            "completion": token_usage.get("completion_tokens", 0),
+        }
+    return None
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Records latency and token usage of every chat-model call. The graph
+    node comes from LangGraph's run metadata (`langgraph_node`).
+    """
+
+    # Called inline on the event loop: recording is cheap, and this avoids
+    # a thread-pool hop per callback for a sync handler in async runs.
+    run_inline = True
+    ignore_chain = True
+    ignore_agent = True
+    ignore_retriever = True
+
+    def __init__(self) -> None:
+        self._running: Dict[UUID, tuple] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        invocation_params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        params = invocation_params or {}
+        model = params.get("model_name") or params.get("model") or params.get("_type") or "unknown"
+        node = (metadata or {}).get("langgraph_node", "")
+        self._running[run_id] = (time.perf_counter(), node, str(model))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._running.pop(run_id, None)
+        if started is None:
+            return
+        start, node, model = started
+        LLM_SECONDS.observe(time.perf_counter() - start, node, model)
+        usage = _usage(response)
+        if usage:
+            LLM_PROMPT_TOKENS.observe(usage["prompt"], node, model)
+            LLM_COMPLETION_TOKENS.observe(usage["completion"], node, model)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._running.pop(run_id, None)
+        if started is not None:
+            LLM_ERRORS.inc(1, started[1], started[2])
+
+
+llm_metrics_handler = MetricsCallbackHandler()
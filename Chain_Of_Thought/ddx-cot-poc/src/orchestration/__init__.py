@@ -1,2 +1,2 @@
-from .graph import build_ddx_graph
+from .graph import build_ddx_graph, build_fast_ddx_graph
 from .state import DDxState
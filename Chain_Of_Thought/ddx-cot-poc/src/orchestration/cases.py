@@ -0,0 +1,96 @@
+# src/orchestration/cases.py
+
+"""
+Checkpointed DDx runs that can be amended.
+
+CaseStore runs the graph with a checkpointer, one thread per case_id,
+keeping only each run's final state (durability="exit") for the most
+recent `max_cases` cases. amend() applies a field delta to the stored
+patient_case and re-runs the case seeded with the previous node_memo, so
+nodes whose inputs are unchanged are reused instead of re-calling the LLM.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+# (fast, checkpointer) -> compiled graph
+GraphFactory = Callable[[bool, BaseCheckpointSaver], Any]
+
+
+class CaseNotFound(KeyError):
+    """Unknown or evicted case_id."""
+
+
+class CaseStore:
+    def __init__(self, build_graph: GraphFactory, max_cases: int = 1000):
+        self.max_cases = max_cases
+        self.checkpointer = InMemorySaver()
+        self._build_graph = build_graph
+        self._graphs: Dict[bool, Any] = {}
+        self._graph_lock = threading.Lock()
+        # case_id -> fast mode, in least-recently-used order
+        self._cases: "OrderedDict[str, bool]" = OrderedDict()
+        # One amendment/run per case at a time (its thread is replaced).
+        self._case_locks: Dict[str, asyncio.Lock] = {}
+
+    def graph(self, fast: bool = False):
+        if fast not in self._graphs:
+            with self._graph_lock:
+                if fast not in self._graphs:
+                    self._graphs[fast] = self._build_graph(fast, self.checkpointer)
+        return self._graphs[fast]
+
+    async def run(self, state: Dict[str, Any], fast: bool = False) -> Tuple[str, Dict[str, Any]]:
+        """Run a new case; returns (case_id, final state)."""
+        case_id = uuid.uuid4().hex
+        result = await self._invoke(case_id, state, fast)
+        self._track(case_id, fast)
+        return case_id, result
+
+    async def amend(
+        self, case_id: str, delta: Dict[str, Any], cache_bypass: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Apply `delta` to the case's patient_case (None removes a field) and
+        re-run it under the same case_id; returns the new final state.
+        """
+        if case_id not in self._cases:
+            raise CaseNotFound(case_id)
+        fast = self._cases[case_id]
+        lock = self._case_locks.setdefault(case_id, asyncio.Lock())
+        async with lock:
+            graph = self.graph(fast)
+            config = {"configurable": {"thread_id": case_id}}
+            previous = (await graph.aget_state(config)).values
+            patient_case = {**previous.get("patient_case", {}), **delta}
+            patient_case = {k: v for k, v in patient_case.items() if v is not None}
+
+            # Start the thread afresh: re-running on top of the old state
+            # would merge new evidence entries into the old ones.
+            await self.checkpointer.adelete_thread(case_id)
+            state = {
+                "patient_case": patient_case,
+                "cache_bypass": cache_bypass,
+                "node_memo": previous.get("node_memo", {}),
+            }
+            result = await self._invoke(case_id, state, fast)
+        self._track(case_id, fast)
+        return result
+
+    async def _invoke(self, case_id: str, state: Dict[str, Any], fast: bool) -> Dict[str, Any]:
+        config = {"configurable": {"thread_id": case_id}}
+        return await self.graph(fast).ainvoke(state, config, durability="exit")
+
+    def _track(self, case_id: str, fast: bool) -> None:
+        self._cases[case_id] = fast
+        self._cases.move_to_end(case_id)
+        while len(self._cases) > self.max_cases:
+            evicted, _ = self._cases.popitem(last=False)
+            self._case_locks.pop(evicted, None)
+            self.checkpointer.delete_thread(evicted)
@@ -1,47 +1,216 @@
 # src/orchestration/graph.py
 
+from functools import partial
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
 
+from src.config.routing import LLMRoute, get_route
+from src.config.settings import DDX_EVIDENCE_MODE, DDX_METRICS_ENABLED, DDX_ROUTING_ENABLED
+from src.llm import get_llm
+from src.orchestration.memo import memoise_node
+from src.orchestration.routing import route_node
+from src.observability import instrument_node
+from src.observability.llm_callback import llm_metrics_handler
 from src.orchestration.state import DDxState
 from src.orchestration.nodes import (
     normalize_input,
     extract_key_findings,
     generate_candidates,
     evidence_for_against,
+    evidence_for_diagnosis,
     suggest_investigations,
+    fast_ddx,
     format_output,
 )
 
+# How evidence_matrix is produced:
+# - "single": one evidence_for_against call covering every candidate
+# - "per_diagnosis": one evidence_for_diagnosis call per candidate, in parallel
+EVIDENCE_MODES = ("single", "per_diagnosis")
+
+
+def _plain_node(name: str, func, metrics: bool):
+    return instrument_node(name, func) if metrics else func
+
+
+def _route_llm(route: LLMRoute, model: str) -> BaseChatModel:
+    limits = {"max_tokens": route.max_tokens, "timeout": route.timeout}
+    return get_llm(model, **{k: v for k, v in limits.items() if v is not None})
 
-def build_ddx_graph():
+
+def _chains(name: str, module, llm: Optional[BaseChatModel], routing: bool):
+    """
+    (primary chain, fallback chain or None, route or None) for an LLM node.
+
+    Each node module exposes a module-level PROMPT (parsed once at import;
+    templates are immutable, so one instance is shared by every request),
+    PROMPT_HASH, OUTPUT_KEYS (the state keys it writes) and
+    build_chain(llm) -> PROMPT | llm. Chains are built here once per graph
+    and bound to the node, so requests never re-parse or re-compile them.
+    """
+    if llm is not None or not routing:
+        return module.build_chain(llm), None, None
+    route = get_route(name)
+    fallback = None
+    if route.fallback_model and route.latency_budget_s:
+        fallback = module.build_chain(_route_llm(route, route.fallback_model))
+    return module.build_chain(_route_llm(route, route.model)), fallback, route
+
+
+def _llm_node(name: str, module, chain, metrics: bool, fallback_chain=None, route: Optional[LLMRoute] = None):
+    # Sync + async implementations: graph.invoke uses run(),
+    # graph.ainvoke / graph.astream use arun().
+    func = partial(module.run, chain=chain)
+    afunc = partial(module.arun, chain=chain)
+    if route is not None:
+        fallback, afallback = None, None
+        if fallback_chain is not None:
+            fallback = partial(module.run, chain=fallback_chain)
+            afallback = partial(module.arun, chain=fallback_chain)
+        func = route_node(name, route, func, fallback)
+        afunc = route_node(name, route, afunc, afallback)
+    # The memo sits outside the route: a memo hit skips both models.
+    func = memoise_node(name, module, chain, func)
+    afunc = memoise_node(name, module, chain, afunc)
+    if not metrics:
+        return RunnableLambda(func, afunc=afunc, name=name)
+    # The callback is inherited by the chain's LLM call inside the node.
+    return RunnableLambda(
+        instrument_node(name, func),
+        afunc=instrument_node(name, afunc),
+        name=name,
+    ).with_config(callbacks=[llm_metrics_handler])
+
+
+def build_ddx_graph(
+    llm: Optional[BaseChatModel] = None,
+    fan_out: bool = True,
+    evidence_mode: str = DDX_EVIDENCE_MODE,
+    metrics: bool = DDX_METRICS_ENABLED,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    routing: bool = DDX_ROUTING_ENABLED,
+):
     """
     Build and compile the LangGraph workflow for the CoT-assisted
     differential diagnosis explainer.
 
-    For this POC we do NOT use a checkpointer, to avoid having to
-    supply thread_id / checkpoint_ns / checkpoint_id in config.
+    The prompt | llm chain for each LLM node is compiled once here and
+    bound to the node, so requests reuse the same chains and the shared
+    client from src.llm. Pass `llm` to run the graph against another chat
+    model (e.g. a stub in tests/benchmarks); this also turns routing off.
+
+    With routing=True (DDX_ROUTING_ENABLED) and no `llm`, each LLM node
+    gets the model, max_tokens and timeout of its route in
+    src.config.routing, and nodes with a latency budget are re-run on the
+    route's fallback model when the primary is slower than the budget or
+    fails. The route that served each node is recorded in `llm_routes`.
+
+    The evidence step and suggest_investigations only need
+    case_summary + candidate_diagnoses, so by default they run in parallel
+    after generate_candidates and join at format_output. fan_out=False
+    keeps the original linear pipeline (used for benchmarking).
+
+    evidence_mode="per_diagnosis" replaces evidence_for_against with one
+    evidence_for_diagnosis task per candidate (LangGraph Send); their
+    entries are merged into evidence_matrix by its reducer.
+
+    With metrics=True (DDX_METRICS_ENABLED) every node's wall time and
+    every LLM call's latency and token usage are recorded in
+    src.observability (served at /metrics).
+
+    Every LLM node records its output under a fingerprint of its inputs
+    (node_memo), so an amended case re-run with the previous node_memo
+    skips nodes whose inputs did not change (src.orchestration.memo).
+
+    By default there is no checkpointer, so callers do not have to supply
+    a thread_id. Pass one (e.g. InMemorySaver) to keep each run's final
+    state per thread_id; src.orchestration.cases uses this for amendments.
     """
+    if evidence_mode not in EVIDENCE_MODES:
+        raise ValueError(f"evidence_mode must be one of {EVIDENCE_MODES}, got {evidence_mode!r}")
+    per_diagnosis = evidence_mode == "per_diagnosis"
+    evidence_name = "evidence_for_diagnosis" if per_diagnosis else "evidence_for_against"
+    evidence_module = evidence_for_diagnosis if per_diagnosis else evidence_for_against
+
+    # Nodes that call the LLM, in pipeline order.
+    llm_nodes = {
+        "extract_key_findings": extract_key_findings,
+        "generate_candidates": generate_candidates,
+        evidence_name: evidence_module,
+        "suggest_investigations": suggest_investigations,
+    }
+
     workflow = StateGraph(DDxState)
 
     # Register nodes
-    workflow.add_node("normalize_input", normalize_input.run)
-    workflow.add_node("extract_key_findings", extract_key_findings.run)
-    workflow.add_node("generate_candidates", generate_candidates.run)
-    workflow.add_node("evidence_for_against", evidence_for_against.run)
-    workflow.add_node("suggest_investigations", suggest_investigations.run)
-    workflow.add_node("format_output", format_output.run)
+    workflow.add_node("normalize_input", _plain_node("normalize_input", normalize_input.run, metrics))
+    for name, module in llm_nodes.items():
+        chain, fallback_chain, route = _chains(name, module, llm, routing)
+        workflow.add_node(name, _llm_node(name, module, chain, metrics, fallback_chain, route))
+    workflow.add_node("format_output", _plain_node("format_output", format_output.run, metrics))
 
     # Entry point
     workflow.set_entry_point("normalize_input")
 
-    # Edges (linear pipeline)
+    # Edges
     workflow.add_edge("normalize_input", "extract_key_findings")
     workflow.add_edge("extract_key_findings", "generate_candidates")
-    workflow.add_edge("generate_candidates", "evidence_for_against")
-    workflow.add_edge("evidence_for_against", "suggest_investigations")
-    workflow.add_edge("suggest_investigations", "format_output")
+
+    if per_diagnosis and fan_out:
+        workflow.add_conditional_edges(
+            "generate_candidates",
+            lambda state: evidence_for_diagnosis.make_sends(state) + ["suggest_investigations"],
+            [evidence_name, "suggest_investigations"],
+        )
+    elif per_diagnosis:
+        workflow.add_conditional_edges(
+            "generate_candidates", evidence_for_diagnosis.make_sends, [evidence_name]
+        )
+    else:
+        workflow.add_edge("generate_candidates", evidence_name)
+        if fan_out:
+            workflow.add_edge("generate_candidates", "suggest_investigations")
+
+    if fan_out:
+        # {evidence, suggest_investigations} -> format_output (waits for both)
+        workflow.add_edge([evidence_name, "suggest_investigations"], "format_output")
+    else:
+        workflow.add_edge(evidence_name, "suggest_investigations")
+        workflow.add_edge("suggest_investigations", "format_output")
     workflow.add_edge("format_output", END)
 
-    # No checkpointer for now
-    graph = workflow.compile()
+    graph = workflow.compile(checkpointer=checkpointer)
     return graph
+
+
+def build_fast_ddx_graph(
+    llm: Optional[BaseChatModel] = None,
+    metrics: bool = DDX_METRICS_ENABLED,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    routing: bool = DDX_ROUTING_ENABLED,
+):
+    """
+    Triage "fast mode": normalize_input -> fast_ddx -> format_output.
+
+    fast_ddx makes one structured LLM call that fills the same state keys
+    as the four LLM nodes of build_ddx_graph(), so the system prompt and
+    case summary are sent once instead of four times and format_output
+    (and the response shape) is unchanged. `checkpointer` and `routing` as
+    for build_ddx_graph().
+    """
+    workflow = StateGraph(DDxState)
+    workflow.add_node("normalize_input", _plain_node("normalize_input", normalize_input.run, metrics))
+    chain, fallback_chain, route = _chains("fast_ddx", fast_ddx, llm, routing)
+    workflow.add_node("fast_ddx", _llm_node("fast_ddx", fast_ddx, chain, metrics, fallback_chain, route))
+    workflow.add_node("format_output", _plain_node("format_output", format_output.run, metrics))
+
+    workflow.set_entry_point("normalize_input")
+    workflow.add_edge("normalize_input", "fast_ddx")
+    workflow.add_edge("fast_ddx", "format_output")
+    workflow.add_edge("format_output", END)
+
+    return workflow.compile(checkpointer=checkpointer)
@@ -0,0 +1,73 @@
+# src/orchestration/memo.py
+
+"""
+Per-case node memoisation for incremental re-runs.
+
+Every LLM node records `node_memo[fingerprint] = <its OUTPUT_KEYS>`.
+When an amended case is re-run seeded with the previous run's node_memo,
+a node whose fingerprint is unchanged returns the stored output without
+calling the LLM (or the result cache) and is listed in `memo_hits`.
+
+The fingerprint covers the node, prompt template, model and the state
+fields the node's output depends on: `_memo_inputs(state)` if the node
+module defines it, else its prompt inputs (see src.cache.node_fingerprint).
+Only extract_key_findings (and fast_ddx) key on the case summary itself.
+Downstream nodes key on what they reason from, the key findings and
+candidate diagnoses, even though their prompts also show the summary for
+context. So an amendment re-runs extract_key_findings, and the rest of the
+graph re-runs only as far as the findings, then the candidates, change.
+"""
+
+import asyncio
+from functools import wraps
+from typing import Any, Callable, Dict
+
+from langchain_core.runnables import Runnable
+
+from src.cache import node_fingerprint
+from src.observability.instrumentation import MEMO_HITS
+
+
+def _fingerprint(name: str, module, chain: Runnable, state: Dict[str, Any]) -> str:
+    inputs = getattr(module, "_memo_inputs", module._prompt_inputs)(state)
+    return node_fingerprint(name, chain, module.PROMPT_HASH, inputs)
+
+
+def _hit(name: str, fingerprint: str, state: Dict[str, Any]):
+    if state.get("cache_bypass"):
+        return None
+    stored = (state.get("node_memo") or {}).get(fingerprint)
+    if stored is None:
+        return None
+    MEMO_HITS.inc(1, name)
+    return {**stored, "memo_hits": [name]}
+
+
+def _remember(module, fingerprint: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    owned = {key: update[key] for key in module.OUTPUT_KEYS if key in update}
+    return {**update, "node_memo": {fingerprint: owned}}
+
+
+def memoise_node(name: str, module, chain: Runnable, func: Callable) -> Callable:
+    """Wrap a sync or async LLM node function with the per-case memo."""
+    if asyncio.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def memoised_async(state):
+            fingerprint = _fingerprint(name, module, chain, state)
+            hit = _hit(name, fingerprint, state)
+            if hit is not None:
+                return hit
+            return _remember(module, fingerprint, await func(state))
+
+        return memoised_async
+
+    @wraps(func)
+    def memoised(state):
+        fingerprint = _fingerprint(name, module, chain, state)
+        hit = _hit(name, fingerprint, state)
+        if hit is not None:
+            return hit
+        return _remember(module, fingerprint, func(state))
+
+    return memoised
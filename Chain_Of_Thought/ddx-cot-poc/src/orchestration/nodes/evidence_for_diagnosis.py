@@ -0,0 +1,118 @@
+# src/orchestration/nodes/evidence_for_diagnosis.py
+
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from langgraph.types import Send
+
+from src.orchestration.state import DDxState
+from src.orchestration.prompts import BASE_SYSTEM_PROMPT, EVIDENCE_FOR_ONE_DIAGNOSIS_USER
+from src.orchestration.schemas import EvidenceEntry
+from src.orchestration.structured import invoke_structured, ainvoke_structured
+from src.llm import get_traced_llm, json_mode
+from src.cache import prompt_hash
+
+NODE_NAME = "evidence_for_diagnosis"
+
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", BASE_SYSTEM_PROMPT),
+        ("user", EVIDENCE_FOR_ONE_DIAGNOSIS_USER),
+    ]
+)
+PROMPT_HASH = prompt_hash(PROMPT)
+
+OUTPUT_KEYS = ("evidence_matrix",)
+
+
+def build_chain(llm: Optional[BaseChatModel] = None) -> Runnable:
+    return PROMPT | json_mode(llm or get_traced_llm())
+
+
+def make_sends(state: DDxState) -> List[Send]:
+    """
+    One Send per candidate diagnosis. Each Send runs this node with its
+    own small payload; LangGraph executes them concurrently in one step.
+
+    With no candidates we still send one empty task, so joins waiting on
+    this node are satisfied.
+    """
+    base = {
+        "case_summary": state["case_summary"],
+        "key_findings": state.get("key_findings", ""),
+        "cache_bypass": state.get("cache_bypass", False),
+        "node_memo": state.get("node_memo") or {},
+    }
+    cands = state.get("candidate_diagnoses") or []
+    if not cands:
+        return [Send(NODE_NAME, {**base, "diagnosis": None})]
+    return [Send(NODE_NAME, {**base, "diagnosis": cand}) for cand in cands]
+
+
+def _prompt_inputs(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "case_summary": payload["case_summary"],
+        "diagnosis": json.dumps(payload["diagnosis"]),
+    }
+
+
+def _memo_inputs(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "key_findings": payload.get("key_findings", ""),
+        "diagnosis": json.dumps(payload["diagnosis"]),
+    }
+
+
+def _apply(payload: Dict[str, Any], evidence: List[Dict[str, Any]]) -> DDxState:
+    """
+    Exactly one entry for this task's candidate. evidence_matrix has a
+    merge reducer keyed by name, so the entry carries the candidate's name
+    (not whatever the model called it); if nothing usable came back the
+    candidate still gets an empty entry.
+    """
+    name = str(payload["diagnosis"].get("name", ""))
+    entry = dict(evidence[0]) if evidence else EvidenceEntry(name=name).model_dump()
+    entry["name"] = name
+    return {"evidence_matrix": [entry]}  # type: ignore[return-value]
+
+
+def run(payload: Dict[str, Any], chain: Optional[Runnable] = None) -> DDxState:
+    """
+    Node: evidence_for_diagnosis (per-diagnosis evidence mode)
+
+    Same output as evidence_for_against, but for a single candidate, so the
+    completions for all candidates are generated in parallel.
+    """
+    if payload.get("diagnosis") is None:
+        return {"evidence_matrix": []}  # type: ignore[return-value]
+    chain = chain or build_chain()
+    items = invoke_structured(
+        NODE_NAME,
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(payload),
+        "evidence",
+        EvidenceEntry,
+        bypass=payload.get("cache_bypass", False),
+    )
+    return _apply(payload, items)
+
+
+async def arun(payload: Dict[str, Any], chain: Optional[Runnable] = None) -> DDxState:
+    """Async variant of run(); used by graph.ainvoke / graph.astream."""
+    if payload.get("diagnosis") is None:
+        return {"evidence_matrix": []}  # type: ignore[return-value]
+    chain = chain or build_chain()
+    items = await ainvoke_structured(
+        NODE_NAME,
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(payload),
+        "evidence",
+        EvidenceEntry,
+        bypass=payload.get("cache_bypass", False),
+    )
+    return _apply(payload, items)
@@ -1,13 +1,42 @@
 # src/orchestration/nodes/extract_key_findings.py
 
+from typing import Any, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
 from src.orchestration.state import DDxState
 from src.orchestration.prompts import BASE_SYSTEM_PROMPT, EXTRACT_KEY_FINDINGS_USER
 from src.llm import get_traced_llm
+from src.cache import invoke_cached, ainvoke_cached, prompt_hash
+
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", BASE_SYSTEM_PROMPT),
+        ("user", EXTRACT_KEY_FINDINGS_USER),
+    ]
+)
+PROMPT_HASH = prompt_hash(PROMPT)
+
+OUTPUT_KEYS = ("key_findings",)
+
+
+def build_chain(llm: Optional[BaseChatModel] = None) -> Runnable:
+    return PROMPT | (llm or get_traced_llm())
+
+
+def _prompt_inputs(state: DDxState) -> Dict[str, Any]:
+    return {"case_summary": state["case_summary"]}
+
 
+def _apply(state: DDxState, content: str) -> DDxState:
+    new_state = dict(state)
+    new_state["key_findings"] = content
+    return new_state  # type: ignore[return-value]
 
-def run(state: DDxState) -> DDxState:
+
+def run(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
     """
     Node: extract_key_findings
 
@@ -15,20 +44,25 @@ def run(state: DDxState) -> DDxState:
     - Extract key positive/negative findings
     - Briefly comment on acuity/severity
     """
-    llm = get_traced_llm()
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", BASE_SYSTEM_PROMPT),
-            ("user", EXTRACT_KEY_FINDINGS_USER),
-        ]
+    chain = chain or build_chain()
+    content = invoke_cached(
+        "extract_key_findings",
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        bypass=state.get("cache_bypass", False),
     )
+    return _apply(state, content)
 
-    chain = prompt | llm
 
-    case_summary = state["case_summary"]
-    result = chain.invoke({"case_summary": case_summary})
-
-    new_state = dict(state)
-    new_state["key_findings"] = result.content
-    return new_state  # type: ignore[return-value]
+async def arun(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
+    """Async variant of run(); used by graph.ainvoke / graph.astream."""
+    chain = chain or build_chain()
+    content = await ainvoke_cached(
+        "extract_key_findings",
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        bypass=state.get("cache_bypass", False),
+    )
+    return _apply(state, content)
@@ -0,0 +1,100 @@
+# src/orchestration/nodes/fast_ddx.py
+
+from typing import Any, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+from src.orchestration.state import DDxState
+from src.orchestration.prompts import BASE_SYSTEM_PROMPT, FAST_DDX_USER, similar_case_hint
+from src.orchestration.parsing import parse_sections
+from src.orchestration.schemas import Diagnosis, EvidenceEntry, Investigation
+from src.orchestration.structured import invoke_parsed, ainvoke_parsed
+from src.llm import get_traced_llm, json_mode
+from src.cache import prompt_hash
+
+NODE_NAME = "fast_ddx"
+
+# {prior_hint} defaults to "" (see similar_case_hint).
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", BASE_SYSTEM_PROMPT),
+        ("user", FAST_DDX_USER),
+    ]
+).partial(prior_hint="")
+PROMPT_HASH = prompt_hash(PROMPT)
+
+OUTPUT_KEYS = (
+    "key_findings",
+    "candidate_diagnoses",
+    "evidence_matrix",
+    "suggested_investigations",
+)
+
+# Completion section -> expected shape (str, or a schema for list entries)
+SECTIONS = {
+    "key_findings": str,
+    "diagnoses": Diagnosis,
+    "evidence": EvidenceEntry,
+    "investigations": Investigation,
+}
+
+
+def _parse(text: str):
+    return parse_sections(text, SECTIONS, required=("diagnoses",), node=NODE_NAME)
+
+
+def build_chain(llm: Optional[BaseChatModel] = None) -> Runnable:
+    return PROMPT | json_mode(llm or get_traced_llm())
+
+
+def _prompt_inputs(state: DDxState) -> Dict[str, Any]:
+    inputs = {"case_summary": state["case_summary"]}
+    # Only present when seeded, so unseeded cache keys are unchanged.
+    if state.get("similar_case"):
+        inputs["prior_hint"] = similar_case_hint(state["similar_case"])
+    return inputs
+
+
+def _apply(state: DDxState, sections: Dict[str, Any]) -> DDxState:
+    new_state: Dict[str, Any] = dict(state)
+    new_state["key_findings"] = sections.get("key_findings", "")
+    new_state["candidate_diagnoses"] = sections.get("diagnoses", [])
+    new_state["evidence_matrix"] = sections.get("evidence", [])
+    new_state["suggested_investigations"] = sections.get("investigations", [])
+    return new_state  # type: ignore[return-value]
+
+
+def run(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
+    """
+    Node: fast_ddx
+
+    Triage fast mode: a single LLM call that fills key_findings,
+    candidate_diagnoses, evidence_matrix and suggested_investigations, in
+    place of the four-call pipeline, so format_output is unchanged.
+    """
+    chain = chain or build_chain()
+    result = invoke_parsed(
+        NODE_NAME,
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        _parse,
+        bypass=state.get("cache_bypass", False),
+    )
+    return _apply(state, result.sections)
+
+
+async def arun(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
+    """Async variant of run(); used by graph.ainvoke / graph.astream."""
+    chain = chain or build_chain()
+    result = await ainvoke_parsed(
+        NODE_NAME,
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        _parse,
+        bypass=state.get("cache_bypass", False),
+    )
+    return _apply(state, result.sections)
@@ -1,13 +1,29 @@
 # src/orchestration/nodes/generate_candidates.py
 
-import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
 from src.orchestration.state import DDxState
-from src.orchestration.prompts import BASE_SYSTEM_PROMPT, GENERATE_CANDIDATES_USER
-from src.llm import get_traced_llm
+from src.orchestration.prompts import BASE_SYSTEM_PROMPT, GENERATE_CANDIDATES_USER, similar_case_hint
+from src.orchestration.parsing import parse_items
+from src.orchestration.schemas import Diagnosis
+from src.orchestration.structured import invoke_structured, ainvoke_structured
+from src.llm import get_traced_llm, json_mode
+from src.cache import prompt_hash
+
+# {prior_hint} defaults to "" (see similar_case_hint).
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", BASE_SYSTEM_PROMPT),
+        ("user", GENERATE_CANDIDATES_USER),
+    ]
+).partial(prior_hint="")
+PROMPT_HASH = prompt_hash(PROMPT)
+
+OUTPUT_KEYS = ("candidate_diagnoses",)
 
 
 def _safe_parse_diagnoses(text: str) -> List[Dict[str, Any]]:
@@ -22,19 +38,41 @@ def _safe_parse_diagnoses(text: str) -> List[Dict[str, Any]]:
         }
       ]
     }
+
+    Fenced, wrapped or truncated JSON is repaired where possible and
+    invalid entries are dropped; see src.orchestration.parsing.
     """
-    try:
-        data = json.loads(text)
-        if isinstance(data, dict) and "diagnoses" in data:
-            value = data["diagnoses"]
-            if isinstance(value, list):
-                return value
-    except json.JSONDecodeError:
-        pass
-    return []
-
-
-def run(state: DDxState) -> DDxState:
+    return parse_items(text, "diagnoses", Diagnosis).items
+
+
+def build_chain(llm: Optional[BaseChatModel] = None) -> Runnable:
+    return PROMPT | json_mode(llm or get_traced_llm())
+
+
+def _prompt_inputs(state: DDxState) -> Dict[str, Any]:
+    inputs = {
+        "case_summary": state["case_summary"],
+        "key_findings": state["key_findings"],
+    }
+    # Only present when seeded, so unseeded cache keys are unchanged.
+    if state.get("similar_case"):
+        inputs["prior_hint"] = similar_case_hint(state["similar_case"])
+    return inputs
+
+
+def _memo_inputs(state: DDxState) -> Dict[str, Any]:
+    inputs = _prompt_inputs(state)
+    del inputs["case_summary"]
+    return inputs
+
+
+def _apply(state: DDxState, diagnoses: List[Dict[str, Any]]) -> DDxState:
+    new_state: Dict[str, Any] = dict(state)
+    new_state["candidate_diagnoses"] = diagnoses
+    return new_state  # type: ignore[return-value]
+
+
+def run(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
     """
     Node: generate_candidates
 
@@ -43,29 +81,29 @@ def run(state: DDxState) -> DDxState:
     - rationale
     - likelihood (High/Moderate/Low)
     """
-    llm = get_traced_llm()
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", BASE_SYSTEM_PROMPT),
-            ("user", GENERATE_CANDIDATES_USER),
-        ]
+    chain = chain or build_chain()
+    items = invoke_structured(
+        "generate_candidates",
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        "diagnoses",
+        Diagnosis,
+        bypass=state.get("cache_bypass", False),
     )
+    return _apply(state, items)
 
-    chain = prompt | llm
-
-    case_summary = state["case_summary"]
-    key_findings = state["key_findings"]
 
-    result = chain.invoke(
-        {
-            "case_summary": case_summary,
-            "key_findings": key_findings,
-        }
+async def arun(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
+    """Async variant of run(); used by graph.ainvoke / graph.astream."""
+    chain = chain or build_chain()
+    items = await ainvoke_structured(
+        "generate_candidates",
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        "diagnoses",
+        Diagnosis,
+        bypass=state.get("cache_bypass", False),
     )
-
-    diagnoses = _safe_parse_diagnoses(result.content)
-
-    new_state: Dict[str, Any] = dict(state)
-    new_state["candidate_diagnoses"] = diagnoses
-    return new_state  # type: ignore[return-value]
+    return _apply(state, items)
@@ -1,13 +1,29 @@
 # src/orchestration/nodes/suggest_investigations.py
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
 from src.orchestration.state import DDxState
 from src.orchestration.prompts import BASE_SYSTEM_PROMPT, SUGGEST_INVESTIGATIONS_USER
-from src.llm import get_traced_llm
+from src.orchestration.parsing import parse_items
+from src.orchestration.schemas import Investigation
+from src.orchestration.structured import invoke_structured, ainvoke_structured
+from src.llm import get_traced_llm, json_mode
+from src.cache import prompt_hash
+
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", BASE_SYSTEM_PROMPT),
+        ("user", SUGGEST_INVESTIGATIONS_USER),
+    ]
+)
+PROMPT_HASH = prompt_hash(PROMPT)
+
+OUTPUT_KEYS = ("suggested_investigations",)
 
 
 def _safe_parse_investigations(text: str) -> List[Dict[str, Any]]:
@@ -21,48 +37,67 @@ def _safe_parse_investigations(text: str) -> List[Dict[str, Any]]:
         }
       ]
     }
+
+    Fenced, wrapped or truncated JSON is repaired where possible and
+    invalid entries are dropped; see src.orchestration.parsing.
     """
-    try:
-        data = json.loads(text)
-        if isinstance(data, dict) and "investigations" in data:
-            value = data["investigations"]
-            if isinstance(value, list):
-                return value
-    except json.JSONDecodeError:
-        pass
-    return []
-
-
-def run(state: DDxState) -> DDxState:
+    return parse_items(text, "investigations", Investigation).items
+
+
+def build_chain(llm: Optional[BaseChatModel] = None) -> Runnable:
+    return PROMPT | json_mode(llm or get_traced_llm())
+
+
+def _prompt_inputs(state: DDxState) -> Dict[str, Any]:
+    return {
+        "case_summary": state["case_summary"],
+        "candidate_diagnoses": json.dumps(state["candidate_diagnoses"]),
+    }
+
+
+def _memo_inputs(state: DDxState) -> Dict[str, Any]:
+    return {
+        "key_findings": state.get("key_findings", ""),
+        "candidate_diagnoses": json.dumps(state["candidate_diagnoses"]),
+    }
+
+
+def _apply(state: DDxState, investigations: List[Dict[str, Any]]) -> DDxState:
+    # Runs in parallel with evidence_for_against: return only the key this
+    # node owns, so the two branches never write the same channel.
+    return {"suggested_investigations": investigations}  # type: ignore[return-value]
+
+
+def run(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
     """
     Node: suggest_investigations
 
     Uses the LLM to suggest 3–5 next-best investigations that help
     discriminate between the top candidate diagnoses.
     """
-    llm = get_traced_llm()
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", BASE_SYSTEM_PROMPT),
-            ("user", SUGGEST_INVESTIGATIONS_USER),
-        ]
+    chain = chain or build_chain()
+    items = invoke_structured(
+        "suggest_investigations",
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        "investigations",
+        Investigation,
+        bypass=state.get("cache_bypass", False),
     )
+    return _apply(state, items)
 
-    chain = prompt | llm
 
-    case_summary = state["case_summary"]
-    cands = state["candidate_diagnoses"]
-
-    result = chain.invoke(
-        {
-            "case_summary": case_summary,
-            "candidate_diagnoses": json.dumps(cands),
-        }
+async def arun(state: DDxState, chain: Optional[Runnable] = None) -> DDxState:
+    """Async variant of run(); used by graph.ainvoke / graph.astream."""
+    chain = chain or build_chain()
+    items = await ainvoke_structured(
+        "suggest_investigations",
+        chain,
+        PROMPT_HASH,
+        _prompt_inputs(state),
+        "investigations",
+        Investigation,
+        bypass=state.get("cache_bypass", False),
     )
-
-    investigations = _safe_parse_investigations(result.content)
-
-    new_state: Dict[str, Any] = dict(state)
-    new_state["suggested_investigations"] = investigations
-    return new_state  # type: ignore[return-value]
+    return _apply(state, items)
@@ -0,0 +1,228 @@
+# src/orchestration/parsing.py
+
+"""
+Tolerant JSON parsing for the DDx JSON nodes.
+
+The fast path is a plain json.loads. Only if that fails do we try, in
+order: decoding the first JSON object embedded in the text (code fences,
+leading/trailing prose), then closing a truncated object at its last
+complete value. Entries are validated individually against a Pydantic
+schema and invalid ones are dropped.
+"""
+
+import json
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel, ValidationError
+
+OK = "ok"
+REPAIRED = "repaired"
+FAILED = "failed"
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_decoder = json.JSONDecoder()
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+
+@dataclass
+class ParseResult:
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = FAILED
+
+    @property
+    def ok(self) -> bool:
+        return self.status != FAILED
+
+
+@dataclass
+class SectionsResult:
+    sections: Dict[str, Any] = field(default_factory=dict)
+    status: str = FAILED
+
+    @property
+    def ok(self) -> bool:
+        return self.status != FAILED
+
+
+def _close_truncated(text: str) -> Optional[str]:
+    """
+    Cut a truncated JSON object back to its last complete value and close
+    any open brackets, e.g. '{"a": [{"x": 1}, {"x"' -> '{"a": [{"x": 1}]}'.
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    safe: Optional[tuple] = None
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+            if ch == "[":
+                safe = (i + 1, list(stack))  # empty list is a valid cut
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                return text[: i + 1]
+            safe = (i + 1, list(stack))
+        elif ch == ",":
+            safe = (i, list(stack))
+
+    if safe is None:
+        return None
+    cut, open_brackets = safe
+    closers = "".join("}" if b == "{" else "]" for b in reversed(open_brackets))
+    return text[:cut] + closers
+
+
+def _load(text: str):
+    """Return (data, status) or (None, FAILED)."""
+    try:
+        return json.loads(text), OK
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    body = _FENCE.sub("", text or "")
+    start = body.find("{")
+    if start < 0:
+        return None, FAILED
+    body = body[start:]
+    try:
+        data, _ = _decoder.raw_decode(body)
+        return data, REPAIRED
+    except json.JSONDecodeError:
+        pass
+
+    closed = _close_truncated(body)
+    if closed is not None:
+        try:
+            return json.loads(closed), REPAIRED
+        except json.JSONDecodeError:
+            pass
+    return None, FAILED
+
+
+def parse_items(
+    text: str,
+    key: str,
+    schema: Type[BaseModel],
+    node: str = "",
+) -> ParseResult:
+    """
+    Parse `{"<key>": [...]}` from an LLM completion, repairing fenced,
+    wrapped or truncated JSON where possible, and validate each entry.
+
+    status is "ok" (clean parse, every entry valid), "repaired" (needed a
+    repair step or dropped invalid entries) or "failed" (nothing usable).
+    """
+    data, status = _load(text)
+    result = ParseResult()
+
+    if isinstance(data, dict) and isinstance(data.get(key), list):
+        raw_items = data[key]
+        result.items, dropped = _validate_items(raw_items, schema)
+        if dropped:
+            status = REPAIRED
+        if not result.items and (raw_items or status == REPAIRED):
+            # nothing usable survived validation / repair
+            status = FAILED
+        result.status = status
+
+    record(node, result.status)
+    return result
+
+
+def parse_sections(
+    text: str,
+    sections: Dict[str, Union[Type[BaseModel], type]],
+    required: Sequence[str] = (),
+    node: str = "",
+) -> SectionsResult:
+    """
+    Parse one object holding several sections, e.g.
+    `{"key_findings": "...", "diagnoses": [...], ...}`.
+
+    A section mapped to `str` must be a string; one mapped to a schema must
+    be a list whose entries are validated individually. Missing sections
+    or dropped entries make the result "repaired"; it is "failed" if a
+    `required` section has nothing usable.
+    """
+    data, status = _load(text)
+    result = SectionsResult()
+
+    if isinstance(data, dict):
+        for key, schema in sections.items():
+            raw = data.get(key)
+            if schema is str:
+                value = raw if isinstance(raw, str) else ""
+                missing = not value
+            else:
+                raw_items = raw if isinstance(raw, list) else []
+                value, dropped = _validate_items(raw_items, schema)
+                missing = not isinstance(raw, list) or dropped > 0
+            result.sections[key] = value
+            if missing:
+                status = REPAIRED
+        if all(result.sections[key] for key in required):
+            result.status = status
+
+    record(node, result.status)
+    return result
+
+
+def _validate_items(raw_items: List[Any], schema: Type[BaseModel]):
+    """Return (valid entries as dicts, number dropped)."""
+    items: List[Dict[str, Any]] = []
+    dropped = 0
+    for raw in raw_items:
+        try:
+            items.append(schema.model_validate(raw).model_dump())
+        except ValidationError:
+            dropped += 1
+    return items, dropped
+
+
+def record(node: str, status: str) -> None:
+    if not node:
+        return
+    with _stats_lock:
+        _stats[node][status] += 1
+
+
+def record_retry(node: str) -> None:
+    with _stats_lock:
+        _stats[node]["retries"] += 1
+
+
+def parse_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-node parse outcomes plus failure/repair rates."""
+    with _stats_lock:
+        out: Dict[str, Dict[str, Any]] = {}
+        for node, counts in _stats.items():
+            total = counts[OK] + counts[REPAIRED] + counts[FAILED]
+            out[node] = {
+                OK: counts[OK],
+                REPAIRED: counts[REPAIRED],
+                FAILED: counts[FAILED],
+                "retries": counts["retries"],
+                "failure_rate": counts[FAILED] / total if total else 0.0,
+                "repair_rate": counts[REPAIRED] / total if total else 0.0,
+            }
+        return out
@@ -29,7 +29,7 @@ Patient case:
 
 Key findings:
 {key_findings}
-
+{prior_hint}
 Task:
 1. Propose 3–5 possible differential diagnoses.
 2. For each, provide:
@@ -86,6 +86,38 @@ Do not include any additional text outside the JSON.
 Reminder: This is NOT a final diagnosis. Check with the responsible clinician.
 """
 
+EVIDENCE_FOR_ONE_DIAGNOSIS_USER = """
+Patient case:
+{case_summary}
+
+Candidate diagnosis:
+{diagnosis}
+
+Task:
+For this one diagnosis only, create:
+- name
+- features_supporting: list of strings
+- features_against_or_missing: list of strings
+- potential_red_flags: list of strings
+
+Return a single JSON object with this structure (exactly one entry):
+
+{{
+  "evidence": [
+    {{
+      "name": "Diagnosis name",
+      "features_supporting": [],
+      "features_against_or_missing": [],
+      "potential_red_flags": []
+    }}
+  ]
+}}
+
+Do not include any additional text outside the JSON.
+
+Reminder: This is NOT a final diagnosis. Check with the responsible clinician.
+"""
+
 SUGGEST_INVESTIGATIONS_USER = """
 Patient case:
 {case_summary}
@@ -116,3 +148,62 @@ Do not include any additional text outside the JSON.
 
 Reminder: This is NOT a final diagnosis. Check with the responsible clinician.
 """
+
+FAST_DDX_USER = """
+Patient case:
+{case_summary}
+{prior_hint}
+Task (triage fast mode, all in one answer):
+1. key_findings: briefly list key positive findings, key negative or missing
+   findings, and overall acuity/severity.
+2. diagnoses: propose 3–5 possible differential diagnoses, each with
+   name, rationale (1–2 sentences) and likelihood ("High", "Moderate" or "Low").
+3. evidence: for each diagnosis, features_supporting,
+   features_against_or_missing and potential_red_flags (lists of strings).
+4. investigations: up to 5 next-best investigations that would help
+   distinguish between these diagnoses, each with name and why_it_helps.
+   Do NOT suggest treatments or drug doses.
+
+Return a single JSON object with this structure:
+
+{{
+  "key_findings": "Positive: ... Negative: ... Acuity: ...",
+  "diagnoses": [
+    {{"name": "Diagnosis name", "rationale": "Short rationale", "likelihood": "High"}}
+  ],
+  "evidence": [
+    {{
+      "name": "Diagnosis name",
+      "features_supporting": [],
+      "features_against_or_missing": [],
+      "potential_red_flags": []
+    }}
+  ],
+  "investigations": [
+    {{"name": "Test name", "why_it_helps": "Short explanation"}}
+  ]
+}}
+
+Do not include any additional text outside the JSON.
+
+Reminder: This is NOT a final diagnosis. Check with the responsible clinician.
+"""
+
+# Filled into {prior_hint} above when /ddx runs with DDX_SIMILAR_MODE=seed
+# and a near-duplicate earlier case was found; empty otherwise, which leaves
+# the rendered prompt unchanged.
+SIMILAR_CASE_HINT = """
+A near-identical earlier case (similarity {similarity:.2f}) was assessed with these
+differentials: {diagnoses}.
+Use them as a starting point only; re-check each against this patient's findings.
+"""
+
+
+def similar_case_hint(similar_case) -> str:
+    """Render SIMILAR_CASE_HINT for state["similar_case"] ("" if there is none)."""
+    if not similar_case:
+        return ""
+    diagnoses = "; ".join(
+        f"{d.get('name')} ({d.get('likelihood', 'unrated')})" for d in similar_case.get("diagnoses", [])
+    )
+    return SIMILAR_CASE_HINT.format(similarity=similar_case["similarity"], diagnoses=diagnoses or "none")
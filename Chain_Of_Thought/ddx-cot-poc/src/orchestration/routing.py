@@ -0,0 +1,78 @@
+# src/orchestration/routing.py
+
+"""
+Latency-budget fallback for LLM nodes.
+
+Each LLM node runs on the primary model of its route (src.config.routing).
+If that has not finished within the route's latency_budget_s, or fails,
+the node is run again on the route's fallback_model and the primary call
+is abandoned. The route that produced the output is written to
+`llm_routes[node]` and counted in ddx_llm_route_total.
+
+Async runs cancel the primary call at the budget. Sync runs cannot cancel
+a blocking call, so the primary runs on a worker thread and its result is
+discarded if it arrives after the budget.
+"""
+
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from src.config.routing import LLMRoute
+from src.observability.instrumentation import LLM_ROUTES
+
+logger = logging.getLogger(__name__)
+
+_primary_pool = ThreadPoolExecutor(thread_name_prefix="ddx-route")
+
+
+def _served(name: str, kind: str, model: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    LLM_ROUTES.inc(1, name, kind, model)
+    return {**update, "llm_routes": {name: f"{kind}:{model}"}}
+
+
+def route_node(
+    name: str,
+    route: LLMRoute,
+    primary: Callable,
+    fallback: Optional[Callable] = None,
+) -> Callable:
+    """
+    Wrap a sync or async node function (bound to the primary chain) so it
+    falls back to `fallback` (the same node bound to the fallback chain).
+    """
+    budget = route.latency_budget_s if fallback is not None else None
+
+    if asyncio.iscoroutinefunction(primary):
+
+        @wraps(primary)
+        async def routed_async(state):
+            if fallback is None:
+                return _served(name, "primary", route.model, await primary(state))
+            try:
+                update = await asyncio.wait_for(primary(state), timeout=budget)
+            except Exception as e:
+                logger.warning("%s: %s on %s, falling back to %s", name, type(e).__name__, route.model, route.fallback_model)
+                return _served(name, "fallback", route.fallback_model, await fallback(state))
+            return _served(name, "primary", route.model, update)
+
+        return routed_async
+
+    @wraps(primary)
+    def routed(state):
+        if fallback is None:
+            return _served(name, "primary", route.model, primary(state))
+        future = _primary_pool.submit(contextvars.copy_context().run, primary, state)
+        try:
+            update = future.result(timeout=budget)
+        except Exception as e:
+            # FutureTimeout leaves the primary running; its result is dropped.
+            kind = "timeout" if isinstance(e, FutureTimeout) else type(e).__name__
+            logger.warning("%s: %s on %s, falling back to %s", name, kind, route.model, route.fallback_model)
+            return _served(name, "fallback", route.fallback_model, fallback(state))
+        return _served(name, "primary", route.model, update)
+
+    return routed
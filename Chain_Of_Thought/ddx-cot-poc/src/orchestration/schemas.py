@@ -0,0 +1,30 @@
+# src/orchestration/schemas.py
+
+"""
+Pydantic schemas for the JSON-producing DDx nodes.
+
+Each node's completion is a single object with one list key; entries are
+validated one by one so a single malformed entry does not discard the rest.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class Diagnosis(BaseModel):
+    name: str
+    rationale: str = ""
+    likelihood: str = ""
+
+
+class EvidenceEntry(BaseModel):
+    name: str
+    features_supporting: List[str] = Field(default_factory=list)
+    features_against_or_missing: List[str] = Field(default_factory=list)
+    potential_red_flags: List[str] = Field(default_factory=list)
+
+
+class Investigation(BaseModel):
+    name: str
+    why_it_helps: str = ""
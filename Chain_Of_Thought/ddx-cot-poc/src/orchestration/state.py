@@ -1,17 +1,84 @@
-from typing import Dict, Any, List
-from typing_extensions import TypedDict
+from typing import Dict, Any, List, Optional
+from typing_extensions import Annotated, TypedDict
+
+
+def take_latest(left: Optional[Any], right: Optional[Any]) -> Optional[Any]:
+    """
+    Reducer for keys written by nodes that run in the same superstep.
+
+    Without a reducer LangGraph rejects two writes to one key in a step;
+    with it, the latest non-None write wins.
+    """
+    return left if right is None else right
+
+
+def merge_evidence(
+    left: Optional[List[Dict[str, Any]]], right: Optional[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Reducer for evidence_matrix.
+
+    In per-diagnosis mode several tasks each contribute one entry in the
+    same step; entries are merged by diagnosis name (a later entry for the
+    same name replaces the earlier one) and otherwise kept in write order.
+    """
+    if right is None:
+        return list(left or [])
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for entry in list(left or []) + list(right):
+        key = entry.get("name") if isinstance(entry, dict) else None
+        merged[key if key is not None else id(entry)] = entry
+    return list(merged.values())
+
+
+def merge_memo(
+    left: Optional[Dict[str, Dict[str, Any]]], right: Optional[Dict[str, Dict[str, Any]]]
+) -> Dict[str, Dict[str, Any]]:
+    """Reducer for node_memo: union of fingerprint -> node output entries."""
+    if not right:
+        return dict(left or {})
+    return {**(left or {}), **right}
+
+
+def merge_routes(left: Optional[Dict[str, str]], right: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Reducer for llm_routes: node -> route, later writes win."""
+    return {**(left or {}), **(right or {})}
+
+
+def append_unique(left: Optional[List[str]], right: Optional[List[str]]) -> List[str]:
+    """Reducer for memo_hits: append, skipping names already present."""
+    merged = list(left or [])
+    for item in right or []:
+        if item not in merged:
+            merged.append(item)
+    return merged
 
 
 class DDxState(TypedDict, total=False):
     # Input
     patient_case: Dict[str, Any]
     case_summary: str
+    cache_bypass: bool  # skip cached LLM results for this run (and refresh them)
+    # Near-duplicate earlier case used as a prompt hint (DDX_SIMILAR_MODE=seed):
+    # {"case_summary", "similarity", "diagnoses"}
+    similar_case: Dict[str, Any]
 
     # Intermediate
     key_findings: str
     candidate_diagnoses: List[Dict[str, Any]]
-    evidence_matrix: List[Dict[str, Any]]
-    suggested_investigations: List[Dict[str, Any]]
+    # evidence_for_against and suggest_investigations run in parallel;
+    # evidence may also be written by one task per diagnosis
+    evidence_matrix: Annotated[List[Dict[str, Any]], merge_evidence]
+    suggested_investigations: Annotated[List[Dict[str, Any]], take_latest]
+
+    # Per-case memo (see src.orchestration.memo): node input fingerprint ->
+    # that node's output, and the nodes whose output was reused this run
+    node_memo: Annotated[Dict[str, Dict[str, Any]], merge_memo]
+    memo_hits: Annotated[List[str], append_unique]
+
+    # Which route served each LLM node: "primary:<model>" or
+    # "fallback:<model>" (see src.orchestration.routing)
+    llm_routes: Annotated[Dict[str, str], merge_routes]
 
     # Final
     final_output: Dict[str, Any]
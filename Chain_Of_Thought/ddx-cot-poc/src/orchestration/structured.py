@@ -0,0 +1,120 @@
+# src/orchestration/structured.py
+
+"""
+Cached LLM call + tolerant parse + targeted retry for the JSON nodes.
+
+Only the node whose output cannot be parsed or repaired is retried, up to
+DDX_PARSE_MAX_RETRIES extra attempts; retries bypass the result cache, and
+unparseable completions are never cached.
+"""
+
+from functools import partial
+from typing import Any, Callable, Dict, List, Type
+
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from src.cache import invoke_cached, ainvoke_cached
+from src.config.settings import DDX_PARSE_MAX_RETRIES
+from src.orchestration.parsing import parse_items, record_retry
+
+# text -> ParseResult / SectionsResult (anything with an `.ok` property)
+ParseFn = Callable[[str], Any]
+
+
+class _Parser:
+    """Remembers the parse of each completion the cache layer checks."""
+
+    def __init__(self, parse: ParseFn):
+        self.parse = parse
+        self.results: Dict[str, Any] = {}
+
+    def accept(self, content: str) -> bool:
+        result = self.parse(content)
+        self.results[content] = result
+        return result.ok
+
+    def result_for(self, content: str):
+        if content not in self.results:
+            self.accept(content)
+        return self.results[content]
+
+
+def invoke_parsed(
+    node: str,
+    chain: Runnable,
+    template_hash: str,
+    inputs: Dict[str, Any],
+    parse: ParseFn,
+    bypass: bool = False,
+):
+    """
+    Return parse(completion), retrying the call while the result is not
+    ok; the last result is returned once retries are exhausted.
+    """
+    parser = _Parser(parse)
+    result = None
+    for attempt in range(DDX_PARSE_MAX_RETRIES + 1):
+        if attempt:
+            record_retry(node)
+        content = invoke_cached(
+            node, chain, template_hash, inputs,
+            bypass=bypass or attempt > 0, accept=parser.accept,
+        )
+        result = parser.result_for(content)
+        if result.ok:
+            break
+    return result
+
+
+async def ainvoke_parsed(
+    node: str,
+    chain: Runnable,
+    template_hash: str,
+    inputs: Dict[str, Any],
+    parse: ParseFn,
+    bypass: bool = False,
+):
+    """Async variant of invoke_parsed()."""
+    parser = _Parser(parse)
+    result = None
+    for attempt in range(DDX_PARSE_MAX_RETRIES + 1):
+        if attempt:
+            record_retry(node)
+        content = await ainvoke_cached(
+            node, chain, template_hash, inputs,
+            bypass=bypass or attempt > 0, accept=parser.accept,
+        )
+        result = parser.result_for(content)
+        if result.ok:
+            break
+    return result
+
+
+def invoke_structured(
+    node: str,
+    chain: Runnable,
+    template_hash: str,
+    inputs: Dict[str, Any],
+    key: str,
+    schema: Type[BaseModel],
+    bypass: bool = False,
+) -> List[Dict[str, Any]]:
+    """Return the validated entries under `key`, or [] once retries are exhausted."""
+    parse = partial(parse_items, key=key, schema=schema, node=node)
+    return invoke_parsed(node, chain, template_hash, inputs, parse, bypass=bypass).items
+
+
+async def ainvoke_structured(
+    node: str,
+    chain: Runnable,
+    template_hash: str,
+    inputs: Dict[str, Any],
+    key: str,
+    schema: Type[BaseModel],
+    bypass: bool = False,
+) -> List[Dict[str, Any]]:
+    """Async variant of invoke_structured()."""
+    parse = partial(parse_items, key=key, schema=schema, node=node)
+    result = await ainvoke_parsed(node, chain, template_hash, inputs, parse, bypass=bypass)
+    return result.items
@@ -0,0 +1,11 @@
+from .scheduler import (
+    PRIORITIES,
+    LLMScheduler,
+    llm_priority,
+    current_priority,
+    get_llm_scheduler,
+    set_llm_scheduler,
+    estimate_tokens,
+    invoke_scheduled,
+    ainvoke_scheduled,
+)
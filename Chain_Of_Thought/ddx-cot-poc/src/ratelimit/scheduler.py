@@ -0,0 +1,357 @@
+# src/ratelimit/scheduler.py
+
+"""
+Process-wide scheduler for outbound LLM calls.
+
+Every call takes one request from a requests-per-minute bucket and its
+estimated tokens from a tokens-per-minute bucket before it is sent; the
+token estimate is corrected from the reported usage afterwards. Calls that
+cannot go yet wait in one queue ordered by priority class (interactive
+before batch), then arrival. Only the head of the queue may take capacity,
+so a burst of batch work cannot starve an interactive request that
+arrives later.
+
+A 429 from the provider pauses dispatch for everyone (honouring
+Retry-After) instead of each call retrying on its own schedule.
+
+The priority of a call comes from the `llm_priority()` context it runs in
+(a contextvar, so it follows the request into graph nodes and their
+tasks); the default is interactive.
+
+This module avoids langchain imports so the API can import it cheaply.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import (
+    DDX_LLM_RPM,
+    DDX_LLM_TPM,
+    DDX_LLM_BURST_SECONDS,
+    DDX_LLM_EST_COMPLETION_TOKENS,
+    DDX_LLM_MAX_RETRIES,
+    DDX_LLM_RETRY_BACKOFF_SECONDS,
+)
+from src.observability.instrumentation import LLM_QUEUE_SECONDS, LLM_RATE_LIMITED
+
+# Dispatch order: earlier classes go first.
+PRIORITIES = ("interactive", "batch")
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("ddx_llm_priority", default="interactive")
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Run the enclosed LLM calls (and tasks started inside) at `priority`."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {PRIORITIES}, got {priority!r}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Bucket:
+    """Token bucket refilled at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: float, burst_seconds: float, now: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        # A single call larger than the bucket waits for a full bucket.
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        # Negative levels are allowed: usage above the estimate is owed.
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("key", "tokens", "priority", "event", "loop")
+
+    def __init__(self, key: Tuple[int, int], tokens: float, priority: str, loop):
+        self.key = key
+        self.tokens = tokens
+        self.priority = priority
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.key < other.key
+
+    def notify(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        rpm: float = 0,
+        tpm: float = 0,
+        burst_seconds: float = 10.0,
+        clock=time.monotonic,
+    ):
+        self._clock = clock
+        now = clock()
+        self.requests = _Bucket(rpm, burst_seconds, now) if rpm > 0 else None
+        self.tokens = _Bucket(tpm, burst_seconds, now) if tpm > 0 else None
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._lock:
+            depth = {priority: 0 for priority in PRIORITIES}
+            for waiter in self._queue:
+                depth[waiter.priority] += 1
+            return depth
+
+    def available(self) -> Dict[str, float]:
+        """Current bucket levels (requests / tokens that could go now)."""
+        with self._lock:
+            now = self._clock()
+            levels = {}
+            for name, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    levels[name] = bucket.level
+            return levels
+
+    async def acquire(self, tokens: float, priority: Optional[str] = None) -> float:
+        """Wait for capacity for one call of ~`tokens`; returns seconds waited."""
+        waiter = self._enqueue(tokens, priority, asyncio.get_running_loop())
+        start = self._clock()
+        taken = False
+        try:
+            while True:
+                waiter.event.clear()
+                with self._lock:
+                    wait = self._try_take(waiter)
+                if wait == 0:
+                    taken = True
+                    break
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if not taken:
+                self._leave(waiter)
+        waited = self._clock() - start
+        LLM_QUEUE_SECONDS.observe(waited, waiter.priority)
+        return waited
+
+    def acquire_sync(self, tokens: float, priority: Optional[str] = None) -> float:
+        """Blocking variant of acquire() for sync graph runs."""
+        waiter = self._enqueue(tokens, priority, None)
+        start = self._clock()
+        taken = False
+        try:
+            while True:
+                waiter.event.clear()
+                with self._lock:
+                    wait = self._try_take(waiter)
+                if wait == 0:
+                    taken = True
+                    break
+                waiter.event.wait(timeout=wait)
+        finally:
+            if not taken:
+                self._leave(waiter)
+        waited = self._clock() - start
+        LLM_QUEUE_SECONDS.observe(waited, waiter.priority)
+        return waited
+
+    def settle(self, reserved: float, used: float) -> None:
+        """Correct the token bucket once a call's real usage is known."""
+        if self.tokens is None or used == reserved:
+            return
+        with self._lock:
+            self.tokens.adjust(reserved - used)
+            self._notify_head()
+
+    def backoff(self, seconds: float) -> None:
+        """Hold all dispatch for `seconds` (after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _enqueue(self, tokens: float, priority: Optional[str], loop) -> _Waiter:
+        priority = priority or current_priority()
+        key = (PRIORITIES.index(priority), next(self._seq))
+        waiter = _Waiter(key, tokens, priority, loop)
+        with self._lock:
+            heapq.heappush(self._queue, waiter)
+        return waiter
+
+    def _try_take(self, waiter: _Waiter) -> Optional[float]:
+        """
+        Caller holds the lock. Returns 0 once capacity is taken, seconds to
+        wait if `waiter` is at the head, or None (wait to be notified).
+        """
+        if self._queue[0] is not waiter:
+            return None
+        now = self._clock()
+        wait = max(0.0, self._paused_until - now)
+        for bucket, amount in ((self.requests, 1.0), (self.tokens, waiter.tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                wait = max(wait, bucket.wait_for(amount))
+        if wait > 0:
+            return wait
+        for bucket, amount in ((self.requests, 1.0), (self.tokens, waiter.tokens)):
+            if bucket is not None:
+                bucket.adjust(-amount)
+        heapq.heappop(self._queue)
+        self._notify_head()
+        return 0.0
+
+    def _leave(self, waiter: _Waiter) -> None:
+        # Cancelled or failed while queued.
+        with self._lock:
+            was_head = bool(self._queue) and self._queue[0] is waiter
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            if was_head:
+                self._notify_head()
+
+    def _notify_head(self) -> None:
+        if self._queue:
+            self._queue[0].notify()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide scheduler and the call wrappers used by src.cache.node_cache
+# ---------------------------------------------------------------------------
+
+_llm_scheduler: Optional[LLMScheduler] = None
+_scheduler_built = False
+
+
+def get_llm_scheduler() -> Optional[LLMScheduler]:
+    """Scheduler built from DDX_LLM_RPM / DDX_LLM_TPM, or None if both are 0."""
+    global _llm_scheduler, _scheduler_built
+    if not _scheduler_built:
+        if DDX_LLM_RPM > 0 or DDX_LLM_TPM > 0:
+            _llm_scheduler = LLMScheduler(DDX_LLM_RPM, DDX_LLM_TPM, DDX_LLM_BURST_SECONDS)
+        _scheduler_built = True
+    return _llm_scheduler
+
+
+def set_llm_scheduler(scheduler: Optional[LLMScheduler]) -> None:
+    """Swap the process-wide scheduler (tests / benchmarks)."""
+    global _llm_scheduler, _scheduler_built
+    _llm_scheduler = scheduler
+    _scheduler_built = True
+
+
+def estimate_tokens(chain: Any, inputs: Dict[str, Any]) -> int:
+    """Rough token cost of `chain.invoke(inputs)`: prompt chars / 4 + completion budget."""
+    prompt = getattr(chain, "first", None)
+    try:
+        prompt_chars = len(prompt.format(**inputs))
+    except Exception:  # not a prompt template; count the inputs only
+        prompt_chars = sum(len(str(value)) for value in inputs.values())
+    llm = getattr(chain, "last", chain)
+    max_tokens = getattr(llm, "kwargs", {}).get("max_tokens")  # .bind(max_tokens=...)
+    llm = getattr(llm, "bound", llm)
+    max_tokens = max_tokens or getattr(llm, "max_tokens", None)
+    return prompt_chars // 4 + (max_tokens or DDX_LLM_EST_COMPLETION_TOKENS)
+
+
+def _used_tokens(message: Any, estimate: int) -> int:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("total_tokens") or estimate
+
+
+def _retry_delay(error: BaseException, attempt: int) -> Tuple[Optional[float], bool]:
+    """(seconds before retrying or None if not retryable, was it a 429)."""
+    status = getattr(error, "status_code", None)
+    backoff = DDX_LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+    if status == 429:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("retry-after", backoff)), True
+        except ValueError:
+            return backoff, True
+    transient = type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+    if transient or (isinstance(status, int) and status >= 500):
+        return backoff, False
+    return None, False
+
+
+async def ainvoke_scheduled(chain: Any, inputs: Dict[str, Any]) -> Any:
+    """`await chain.ainvoke(inputs)` through the process-wide scheduler (if any)."""
+    scheduler = get_llm_scheduler()
+    if scheduler is None:
+        return await chain.ainvoke(inputs)
+
+    estimate = estimate_tokens(chain, inputs)
+    priority = current_priority()
+    for attempt in range(DDX_LLM_MAX_RETRIES + 1):
+        await scheduler.acquire(estimate, priority)
+        try:
+            message = await chain.ainvoke(inputs)
+        except Exception as e:
+            scheduler.settle(estimate, 0)  # the request counts, its tokens do not
+            delay, rate_limited = _retry_delay(e, attempt)
+            if delay is None or attempt == DDX_LLM_MAX_RETRIES:
+                raise
+            if rate_limited:
+                LLM_RATE_LIMITED.inc(1, priority)
+                scheduler.backoff(delay)
+            else:
+                await asyncio.sleep(delay)
+            continue
+        scheduler.settle(estimate, _used_tokens(message, estimate))
+        return message
+
+
+def invoke_scheduled(chain: Any, inputs: Dict[str, Any]) -> Any:
+    """Sync variant of ainvoke_scheduled()."""
+    scheduler = get_llm_scheduler()
+    if scheduler is None:
+        return chain.invoke(inputs)
+
+    estimate = estimate_tokens(chain, inputs)
+    priority = current_priority()
+    for attempt in range(DDX_LLM_MAX_RETRIES + 1):
+        scheduler.acquire_sync(estimate, priority)
+        try:
+            message = chain.invoke(inputs)
+        except Exception as e:
+            scheduler.settle(estimate, 0)
+            delay, rate_limited = _retry_delay(e, attempt)
+            if delay is None or attempt == DDX_LLM_MAX_RETRIES:
+                raise
+            if rate_limited:
+                LLM_RATE_LIMITED.inc(1, priority)
+                scheduler.backoff(delay)
+            else:
+                time.sleep(delay)
+            continue
+        scheduler.settle(estimate, _used_tokens(message, estimate))
+        return message
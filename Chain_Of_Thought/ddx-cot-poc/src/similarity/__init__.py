@@ -0,0 +1,7 @@
+from .case_index import (
+    CaseIndex,
+    SimilarCase,
+    vectorize,
+    get_case_index,
+    set_case_index,
+)
@@ -0,0 +1,212 @@
+# src/similarity/case_index.py
+
+"""
+Local near-duplicate index over past case summaries.
+
+Each case_summary is turned into a sparse hashed term vector (word
+unigrams + bigrams, sublinear tf, template words from build_case_summary
+dropped, numbers down-weighted, L2-normalised) in a 2**16-dimensional
+space. Alongside it a signed random projection of that vector is stored as
+a 128-bit signature.
+
+search() ranks every stored case by Hamming distance between signatures
+(an XOR + popcount pass over packed uint64 columns), then re-scores the
+closest `candidates` of them by exact cosine similarity. Everything is
+plain NumPy; no embedding service or model is involved.
+"""
+
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.settings import DDX_SIMILAR_MAX_ITEMS, DDX_SIMILAR_THRESHOLD
+
+DIM = 1 << 16
+SIGNATURE_BITS = 128
+# Stored vectors keep at most this many (highest-weight) features; a case
+# summary usually has 60-90.
+MAX_FEATURES = 128
+_WORDS = SIGNATURE_BITS // 64
+
+# Words every summary shares (see src.utils.case_builder); they only add
+# background similarity between unrelated cases.
+STOP_WORDS = frozenset(
+    "a an and of the with year old chief complaint symptoms vitals labs history additional notes".split()
+)
+
+# Vitals and labs differ slightly between otherwise identical presentations,
+# so features containing a number count for less.
+NUMBER_WEIGHT = 0.5
+
+_TOKEN = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+
+# One fixed random hyperplane per signature bit (seeded, so signatures are
+# stable across processes); row i is the projection of hashed feature i.
+_PLANES = np.random.default_rng(0x5EED).choice(
+    np.array([-1, 1], dtype=np.int8), size=(DIM, SIGNATURE_BITS)
+)
+
+
+def vectorize(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Sparse unit vector for `text`: (feature indices, weights)."""
+    tokens = [t for t in _TOKEN.findall(text.lower()) if t not in STOP_WORDS]
+    numeric = [t[0].isdigit() for t in tokens]
+    features = Counter(zip(tokens, numeric))
+    features.update(
+        (f"{a} {b}", x or y) for a, b, x, y in zip(tokens, tokens[1:], numeric, numeric[1:])
+    )
+
+    weights: Dict[int, float] = {}
+    for (feature, has_number), count in features.items():
+        index = zlib.crc32(feature.encode()) & (DIM - 1)
+        weight = 1.0 + math.log(count) if count > 1 else 1.0
+        if has_number:
+            weight *= NUMBER_WEIGHT
+        weights[index] = weights.get(index, 0.0) + weight
+
+    indices = np.fromiter(weights.keys(), dtype=np.uint16, count=len(weights))
+    values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+    norm = float(np.linalg.norm(values))
+    if norm:
+        values /= norm
+    return indices, values
+
+
+def signature(indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """128-bit signed-random-projection signature, as uint64 words."""
+    projected = values @ _PLANES[indices]
+    return np.packbits(projected > 0).view(np.uint64)
+
+
+@dataclass
+class SimilarCase:
+    case_summary: str
+    final_output: Dict[str, Any]
+    similarity: float
+
+
+class CaseIndex:
+    """
+    Fixed-capacity index of case_summary -> final_output. Once `max_items`
+    cases are stored, each add() replaces the oldest one.
+
+    Each entry records whether it came from the fast (single-call) graph;
+    a search only returns entries from the same mode.
+    """
+
+    def __init__(self, max_items: int = 100_000, threshold: float = 0.9, candidates: int = 32):
+        self.max_items = max_items
+        self.threshold = threshold
+        self.candidates = candidates
+        # One contiguous column per signature word: XOR/popcount over a
+        # column is several times faster than over an (n, words) array.
+        self._signatures = np.zeros((_WORDS, max_items), dtype=np.uint64)
+        # Sparse vectors padded to MAX_FEATURES (weight 0), so the candidates
+        # are re-scored with one gather instead of a Python loop.
+        self._indices = np.zeros((max_items, MAX_FEATURES), dtype=np.uint16)
+        self._values = np.zeros((max_items, MAX_FEATURES), dtype=np.float16)
+        self._summaries: List[Optional[str]] = [None] * max_items
+        self._outputs: List[Optional[Dict[str, Any]]] = [None] * max_items
+        self._fast = np.zeros(max_items, dtype=bool)
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, case_summary: str, final_output: Dict[str, Any], fast: bool = False) -> None:
+        indices, values = vectorize(case_summary)
+        sig = signature(indices, values)
+        if len(indices) > MAX_FEATURES:
+            keep = np.argsort(values)[-MAX_FEATURES:]
+            indices, values = indices[keep], values[keep]
+        with self._lock:
+            slot = self._next
+            self._signatures[:, slot] = sig
+            self._indices[slot] = 0
+            self._indices[slot, : len(indices)] = indices
+            self._values[slot] = 0
+            self._values[slot, : len(values)] = values
+            self._summaries[slot] = case_summary
+            self._outputs[slot] = final_output
+            self._fast[slot] = fast
+            self._next = (slot + 1) % self.max_items
+            self._size = min(self._size + 1, self.max_items)
+
+    def search(self, case_summary: str, k: int = 1, fast: bool = False) -> List[SimilarCase]:
+        """The `k` most similar stored cases of the given mode, best first (no threshold)."""
+        indices, values = vectorize(case_summary)
+        size = self._size
+        if size == 0 or not len(indices):
+            return []
+
+        sig = signature(indices, values)
+        distances = np.bitwise_count(self._signatures[0, :size] ^ sig[0])
+        for word in range(1, _WORDS):
+            distances += np.bitwise_count(self._signatures[word, :size] ^ sig[word])
+        # Entries from the other mode rank after every entry from this one.
+        distances[self._fast[:size] != fast] = SIGNATURE_BITS + 1
+        slots = self._closest(distances, min(self.candidates, size))
+        slots = slots[self._fast[slots] == fast]
+        if not len(slots):
+            return []
+
+        query = np.zeros(DIM, dtype=np.float32)
+        query[indices] = values
+        similarities = (query[self._indices[slots]] * self._values[slots]).sum(axis=1)
+        order = np.argsort(-similarities)[:k]
+        return [
+            SimilarCase(self._summaries[slot], self._outputs[slot], float(similarity))
+            for slot, similarity in zip(slots[order].tolist(), similarities[order].tolist())
+        ]
+
+    @staticmethod
+    def _closest(distances: np.ndarray, want: int) -> np.ndarray:
+        """Slots of the `want` smallest distances (ties broken arbitrarily)."""
+        # Estimate the radius holding `want` cases from a histogram of a
+        # strided sample (argpartition or a full bincount over 100k uint8
+        # distances costs more than the XOR/popcount pass itself).
+        stride = max(1, want // 8)
+        within = np.cumsum(np.bincount(distances[::stride], minlength=SIGNATURE_BITS + 1)) * stride
+        radius = int(np.searchsorted(within, want))
+        slots = np.flatnonzero(distances <= radius)
+        while len(slots) < want:
+            radius += 1
+            slots = np.flatnonzero(distances <= radius)
+        if len(slots) > want:
+            slots = slots[np.argpartition(distances[slots], want - 1)[:want]]
+        return slots
+
+    def nearest(
+        self, case_summary: str, threshold: Optional[float] = None, fast: bool = False
+    ) -> Optional[SimilarCase]:
+        """The most similar stored case of the given mode if its cosine similarity >= threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        found = self.search(case_summary, k=1, fast=fast)
+        if found and found[0].similarity >= threshold:
+            return found[0]
+        return None
+
+
+_case_index: Optional[CaseIndex] = None
+
+
+def get_case_index() -> CaseIndex:
+    """Process-wide index built from settings (DDX_SIMILAR_*)."""
+    global _case_index
+    if _case_index is None:
+        _case_index = CaseIndex(max_items=DDX_SIMILAR_MAX_ITEMS, threshold=DDX_SIMILAR_THRESHOLD)
+    return _case_index
+
+
+def set_case_index(index: Optional[CaseIndex]) -> None:
+    """Swap the process-wide index (tests / benchmarks)."""
+    global _case_index
+    _case_index = index
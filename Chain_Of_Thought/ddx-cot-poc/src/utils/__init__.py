@@ -1 +1 @@
-from .case_builder import build_case_summary
+from .case_builder import build_case_summary, canonical_case, case_fingerprint
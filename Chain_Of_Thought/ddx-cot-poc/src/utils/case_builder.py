@@ -1,10 +1,174 @@
-from typing import Dict, Any
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Canonical form of a case, so that inputs differing only in layout give the
+# same summary (and therefore the same prompts, result-cache keys and
+# provider prompt prefixes):
+# - free text: whitespace collapsed, trailing full stops dropped, words
+#   lower-cased except acronyms/units (two or more capitals, or a digit:
+#   COPD, SpO2, HbA1c)
+# - sex: "male" / "female" for the usual spellings
+# - symptoms: split on , ; or newlines, de-duplicated and sorted
+# - vitals: each recognised reading in a fixed format (temperature in °C).
+#   If the text is nothing but readings they are put in the order T, HR, BP,
+#   RR, SpO2; otherwise every reading stays where it was and the rest of the
+#   text (ranges, scores such as GCS or pain, qualifiers) is kept as written
+
+_SEX = {"m": "male", "male": "male", "man": "male", "f": "female", "female": "female", "woman": "female"}
+
+# One pass over the vitals text: an optional label, a value (or sbp/dbp) and
+# an optional unit. The label, or failing that the unit, says which vital it
+# is; bare numbers are left in the text. A fraction is only a blood pressure
+# with a BP label or an mmHg unit ("GCS 14/15" and "pain 8/10" are not).
+_VITAL = re.compile(
+    r"(?:\b(?P<label>temperature|temp|t|heart\s+rate|hr|pulse|p|blood\s+pressure|bp"
+    r"|resp(?:iratory)?\.?\s*rate|resp|rr|spo2|sao2|o2\s*sats?|sats?|oxygen\s+saturation|saturation)"
+    r"\s*[:=]?\s*)?"
+    r"\b(?P<value>\d{1,3}(?:\.\d+)?)(?:\s*/\s*(?P<dbp>\d{2,3}))?"
+    r"(?:\s*(?P<unit>(?:°|deg(?:rees)?)\s*[cf]\b|[cf]\b|%|bpm\b|mm\s*hg\b|breaths/min|/\s*min\b))?",
+    re.I,
+)
+_LABELS = {
+    "temperature": "T", "temp": "T", "t": "T",
+    "heart rate": "HR", "hr": "HR", "pulse": "HR", "p": "HR",
+    "blood pressure": "BP", "bp": "BP",
+    "resp rate": "RR", "respiratory rate": "RR", "resp. rate": "RR", "respiratory. rate": "RR",
+    "resprate": "RR", "resp": "RR", "rr": "RR",
+    "spo2": "SpO2", "sao2": "SpO2", "o2 sat": "SpO2", "o2 sats": "SpO2", "o2sat": "SpO2", "o2sats": "SpO2",
+    "sat": "SpO2", "sats": "SpO2", "oxygen saturation": "SpO2", "saturation": "SpO2",
+}
+_UNITS = {"%": "SpO2", "bpm": "HR", "mmhg": "BP", "breaths/min": "RR"}
+_ORDER = ("T", "HR", "BP", "RR", "SpO2")
+# A number next to a dash or "to" is one end of a range ("HR 80-100",
+# "SpO2 88-92%"), not a reading.
+_RANGE_AFTER = re.compile(r"\s*(?:-|–|to\b)\s*\d", re.I)
+_RANGE_BEFORE = re.compile(r"\d\s*(?:-|–|\bto)\s*$", re.I)
+_LIST_SPLIT = re.compile(r"\s*[,;\n]\s*")
+_SEPARATORS = " ,;.\n\t"
+
+
+def _word(word: str) -> str:
+    lowered = word.lower()
+    if lowered == word or sum(map(str.isupper, word)) > 1 or any(map(str.isdigit, word)):
+        return word
+    return lowered
+
+
+def normalise_text(text: str) -> str:
+    """Collapse whitespace, drop trailing full stops and fold casing (see above)."""
+    words = text.split()
+    if text.lower() != text:
+        words = [_word(w) for w in words]
+    return " ".join(words).rstrip(". ")
+
+
+def _vital(match: "re.Match[str]") -> Optional[Tuple[str, str]]:
+    label, value, dbp, unit = match.groups()
+    unit = unit.lower().replace(" ", "") if unit else ""
+    if label:
+        label = label.lower()
+        name = _LABELS.get(label) or _LABELS.get(" ".join(label.split()))
+    elif dbp:
+        name = "BP" if unit == "mmhg" else None
+    elif unit[-1:] in ("c", "f") and unit[:1] in ("°", "d"):
+        name = "T"
+    else:
+        name = _UNITS.get(unit)
+    if name is None or (name == "BP") != bool(dbp):
+        return None
+    if name == "T":
+        degrees = float(value)
+        if unit.endswith("f") or (not unit.endswith("c") and degrees > 45):
+            degrees = (degrees - 32) * 5 / 9
+        if not 25 <= degrees <= 45:
+            return None
+        return name, f"T {degrees:.1f}°C"
+    if "." in value:
+        return None
+    if name == "BP":
+        return name, f"BP {int(value)}/{int(dbp)}"
+    return name, f"{name} {int(value)}{'%' if name == 'SpO2' else ''}"
+
+
+def _readings(vitals: str) -> List[Tuple[int, int, str, str]]:
+    # (start, end, vital, canonical text) of each reading used, in text order.
+    readings: List[Tuple[int, int, str, str]] = []
+    seen = set()
+    last = 0
+    for match in _VITAL.finditer(vitals):
+        value = match.start("value")
+        if _RANGE_AFTER.match(vitals, match.end()) or _RANGE_BEFORE.search(vitals, max(0, value - 8), value):
+            continue
+        # An unlabelled number belongs to whatever word precedes it in the
+        # same list item ("FiO2 40%", "(lying) 100/60 mmHg").
+        if not match.group("label") and _LIST_SPLIT.split(vitals[last:match.start()])[-1].strip(" .\t"):
+            continue
+        parsed = _vital(match)
+        # The first reading of each vital is used; repeats stay in the text.
+        if parsed is None or parsed[0] in seen:
+            continue
+        seen.add(parsed[0])
+        readings.append((match.start(), match.end(), *parsed))
+        last = match.end()
+    return readings
+
+
+def _fold(text: str) -> str:
+    # normalise_text's casing rule, keeping the text's own whitespace.
+    return re.sub(r"\S+", lambda word: _word(word.group()), text) if text.lower() != text else text
+
+
+def canonical_vitals(vitals: str) -> str:
+    """Recognised vitals in fixed units; in fixed order too if nothing else is in the text."""
+    readings = _readings(vitals)
+    if not readings:
+        return normalise_text(vitals)
+    bounds = [0] + [i for start, end, _, _ in readings for i in (start, end)] + [len(vitals)]
+    gaps = [vitals[bounds[i]:bounds[i + 1]] for i in range(0, len(bounds), 2)]
+    if not any(gap.strip(_SEPARATORS) for gap in gaps):
+        found = {name: text for _, _, name, text in readings}
+        return ", ".join(found[name] for name in _ORDER if name in found)
+    pieces = [_fold(gaps[0])]
+    for (_, _, _, text), gap in zip(readings, gaps[1:]):
+        pieces += [text, _fold(gap)]
+    return " ".join("".join(pieces).split()).rstrip(". ")
+
+
+def canonical_list(text: str) -> str:
+    """Split a free-text list on , ; or newlines; de-duplicate and sort it."""
+    # Normalising the whole text once is the same as normalising each item.
+    text = normalise_text(text.replace(";", ",").replace(",", " , ").replace("\n", " , "))
+    items = {item.strip(" .") for item in text.split(",")}
+    items.discard("")
+    return ", ".join(sorted(items))
+
+
+def canonical_case(patient_case: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of `patient_case` with every field in canonical form."""
+    case: Dict[str, Any] = {}
+    for field, value in patient_case.items():
+        if isinstance(value, str):
+            if field == "vitals":
+                value = canonical_vitals(value)
+            elif field == "symptoms":
+                value = canonical_list(value)
+            elif field == "sex":
+                value = normalise_text(value)
+                value = _SEX.get(value, value)
+            elif field == "age" and value.strip().isdigit():
+                value = int(value)
+            else:
+                value = normalise_text(value)
+        case[field] = value
+    return case
 
 
 def build_case_summary(patient_case: Dict[str, Any]) -> str:
     """
     Turn structured case dict into a canonical case summary string.
     """
+    patient_case = canonical_case(patient_case)
     parts = []
 
     age = patient_case.get("age")
@@ -35,3 +199,8 @@ def build_case_summary(patient_case: Dict[str, Any]) -> str:
         parts.append(f"Additional notes: {patient_case['notes']}.")
 
     return " ".join(parts)
+
+
+def case_fingerprint(case_summary: str) -> str:
+    """Stable content hash of a (canonical) case summary."""
+    return hashlib.sha256(case_summary.encode("utf-8")).hexdigest()
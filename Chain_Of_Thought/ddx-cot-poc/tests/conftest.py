@@ -0,0 +1,8 @@
+import os
+
+# Run the suite offline against recorded LLM responses unless the caller
+# explicitly selects another backend (e.g. DDX_LLM_BACKEND=openai for a
+# live smoke test). Must run before src.config.settings is imported.
+os.environ.setdefault("DDX_LLM_BACKEND", "replay")
+os.environ.setdefault("DDX_REPLAY_PATH", os.path.join(os.path.dirname(__file__), "fixtures", "ddx_replay.jsonl"))
+os.environ.setdefault("DDX_CACHE_SQLITE_PATH", "")
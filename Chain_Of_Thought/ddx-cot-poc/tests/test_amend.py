@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from benchmarks.stub_llm import StubChatModel
+from src.cache import ResultCache, set_result_cache
+from src.orchestration import build_ddx_graph
+from src.orchestration.cases import CaseNotFound, CaseStore
+
+LLM_NODES = ["extract_key_findings", "generate_candidates", "evidence_for_against", "suggest_investigations"]
+CASE = {"age": 65, "sex": "male", "chief_complaint": "fever", "vitals": "RR 28, SpO2 90%"}
+
+
+class FindingsStub(StubChatModel):
+    """
+    Stub whose key findings mention a raised CRP when the case has one, and
+    which records the node behind every LLM call.
+    """
+
+    calls: list = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append((getattr(run_manager, "metadata", None) or {}).get("langgraph_node"))
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        prompt = str(messages[-1].content)
+        if "Key findings:" not in prompt and "{" not in prompt and "CRP 180" in prompt:
+            result.generations[0].message.content += "\n4. Raised CRP."
+        return result
+
+
+def _store(llm=None):
+    set_result_cache(ResultCache())  # empty, memory-only: reuse must come from the memo
+    llm = llm or StubChatModel()
+    return CaseStore(lambda fast, checkpointer: build_ddx_graph(llm=llm, checkpointer=checkpointer))
+
+
+def test_amend_reuses_nodes_whose_inputs_are_unchanged():
+    store = _store()
+
+    async def go():
+        case_id, first = await store.run({"patient_case": CASE})
+        same = await store.amend(case_id, {"vitals": "RR 28, SpO2 90%"})
+        return first, same
+
+    first, same = asyncio.run(go())
+
+    assert first.get("memo_hits", []) == []
+    assert sorted(same["memo_hits"]) == sorted(LLM_NODES)
+    assert same["final_output"] == first["final_output"]
+
+
+def test_amend_reruns_only_nodes_whose_inputs_changed():
+    llm = FindingsStub(calls=[])
+    store = _store(llm)
+
+    async def go():
+        case_id, _ = await store.run({"patient_case": CASE})
+        llm.calls.clear()
+        history = await store.amend(case_id, {"history": "appendicectomy 1990"})
+        history_calls = sorted(llm.calls)
+        llm.calls.clear()
+        labs = await store.amend(case_id, {"labs": "CRP 180"})
+        return history, history_calls, labs, sorted(llm.calls)
+
+    history, history_calls, labs, labs_calls = asyncio.run(go())
+
+    # The summary changed but the findings did not: only the findings node
+    # calls the LLM; everything downstream is reused.
+    assert "appendicectomy" in history["final_output"]["case_summary"]
+    assert history_calls == ["extract_key_findings"]
+    assert sorted(history["memo_hits"]) == sorted(LLM_NODES[1:])
+
+    # A new lab changes the findings, which every downstream node keys on.
+    assert "Raised CRP" in labs["final_output"]["key_findings"]
+    assert labs_calls == sorted(LLM_NODES)
+    assert labs.get("memo_hits", []) == []
+
+
+def test_amend_unknown_case_and_eviction():
+    store = _store()
+    store.max_cases = 1
+
+    async def go():
+        old_id, _ = await store.run({"patient_case": CASE})
+        await store.run({"patient_case": CASE})
+        await store.amend(old_id, {"age": 70})
+
+    with pytest.raises(CaseNotFound):
+        asyncio.run(go())
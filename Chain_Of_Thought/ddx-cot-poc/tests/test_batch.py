@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+from src.batch import BatchCheckpoint, aiter_sync, run_batch
+
+
+class EchoGraph:
+    """Stands in for the compiled graph: echoes the patient age back."""
+
+    async def ainvoke(self, state):
+        await asyncio.sleep(0)
+        return {"final_output": {"age": state["patient_case"].get("age")}}
+
+
+def _collect(lines, checkpoint=None, concurrency=2):
+    async def go():
+        return [
+            r
+            async for r in run_batch(
+                aiter_sync(lines), EchoGraph(), concurrency=concurrency, checkpoint=checkpoint
+            )
+        ]
+
+    return asyncio.run(go())
+
+
+def test_run_batch_tags_every_line_with_its_index():
+    lines = [
+        json.dumps({"id": "a", "age": 60}),
+        "",
+        "not json",
+        json.dumps({"age": 70}),
+    ]
+    records = sorted(_collect(lines), key=lambda r: r["index"])
+
+    assert [(r["index"], r["status"]) for r in records] == [(0, "ok"), (2, "invalid"), (3, "ok")]
+    assert records[0]["id"] == "a"
+    assert records[2]["output"] == {"age": 70}
+
+
+def test_checkpoint_resume_skips_completed_lines(tmp_path):
+    path = str(tmp_path / "job.ckpt")
+    lines = [json.dumps({"age": n}) for n in range(5)]
+
+    ckpt = BatchCheckpoint(path)
+    first = _collect(lines[:3], checkpoint=ckpt)
+    ckpt.close()
+    assert len(first) == 3
+
+    resumed = BatchCheckpoint(path)
+    assert resumed.is_done(2) and not resumed.is_done(3)
+    second = _collect(lines, checkpoint=resumed)
+    resumed.close()
+    assert sorted(r["index"] for r in second) == [3, 4]
+
+
+class FlakyGraph(EchoGraph):
+    """Fails every case whose age is in `failing`."""
+
+    def __init__(self, failing):
+        self.failing = set(failing)
+
+    async def ainvoke(self, state):
+        if state["patient_case"].get("age") in self.failing:
+            raise RuntimeError("rate limited")
+        return await super().ainvoke(state)
+
+
+def test_errored_cases_are_retried_on_resume(tmp_path):
+    path = str(tmp_path / "job.ckpt")
+    lines = [json.dumps({"age": n}) for n in range(4)] + ["not json"]
+
+    async def go(graph, ckpt):
+        return [r async for r in run_batch(aiter_sync(lines), graph, concurrency=2, checkpoint=ckpt)]
+
+    ckpt = BatchCheckpoint(path)
+    first = asyncio.run(go(FlakyGraph(failing={1}), ckpt))
+    ckpt.close()
+    assert {r["index"]: r["status"] for r in first} == {0: "ok", 1: "error", 2: "ok", 3: "ok", 4: "invalid"}
+
+    resumed = BatchCheckpoint(path)
+    second = asyncio.run(go(FlakyGraph(failing=set()), resumed))
+    resumed.close()
+    assert [(r["index"], r["status"]) for r in second] == [(1, "ok")]
+
+
+def test_checkpoint_memory_is_bounded_by_pending_indices(tmp_path):
+    ckpt = BatchCheckpoint(str(tmp_path / "job.ckpt"))
+    for index in range(1, 10_000):  # index 0 never completes
+        ckpt.mark_done(index)
+    assert not ckpt.is_done(0) and ckpt.is_done(9_999) and not ckpt.is_done(10_000)
+    assert ckpt._missing == {0}
+    ckpt.close()
+
+    reloaded = BatchCheckpoint(ckpt.path)
+    assert reloaded._missing == {0}
+    reloaded.close()
+
+
+def test_batch_endpoint_takes_a_ddx_slot_per_case(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from src.api import server
+
+    held = []
+
+    class SlotGraph(EchoGraph):
+        async def ainvoke(self, state):
+            held.append(server._ddx_slots._value)
+            return await super().ainvoke(state)
+
+    monkeypatch.setattr(server, "graph", SlotGraph())
+    monkeypatch.setattr(server, "_ddx_slots", asyncio.Semaphore(3))
+    body = "\n".join(json.dumps({"age": n}) for n in range(5))
+
+    with TestClient(server.app) as client:
+        resp = client.post("/ddx/batch?concurrency=1", content=body)
+
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(r["output"]["age"] for r in records) == list(range(5))
+    assert held == [2] * 5  # one of the 3 slots held while each case runs
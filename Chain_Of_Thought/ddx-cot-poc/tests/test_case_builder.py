@@ -0,0 +1,64 @@
+import pytest
+
+from src.utils import build_case_summary, canonical_case, case_fingerprint
+from src.utils.case_builder import canonical_vitals
+
+
+def test_vitals_are_put_in_fixed_order_and_units():
+    assert canonical_vitals("RR 28, SpO2 90%") == canonical_vitals("SpO2 90% RR 28") == "RR 28, SpO2 90%"
+    assert canonical_vitals("Temp 101.3F, pulse 110 bpm; 130/80 mmHg sats 94 %") == (
+        "T 38.5°C, HR 110, BP 130/80, SpO2 94%"
+    )
+    assert canonical_vitals("afebrile,  looks unwell.") == "afebrile, looks unwell"
+
+
+def test_vitals_mixed_with_other_text_stay_in_place():
+    assert canonical_vitals("Temp 101.3F; pulse 110 bpm; 130/80 mmHg; sats 94 % on RA") == (
+        "T 38.5°C; HR 110; BP 130/80; SpO2 94% on RA"
+    )
+
+
+@pytest.mark.parametrize("vitals, expected", [
+    # Fractions without a BP label or mmHg are scores, not blood pressures.
+    ("pain 8/10", "pain 8/10"),
+    ("GCS 15/15", "GCS 15/15"),
+    ("GCS 14/15, BP 120/80", "GCS 14/15, BP 120/80"),
+    ("120/80", "120/80"),
+    ("120/80 mmHg", "BP 120/80"),
+    # Ranges are kept whole.
+    ("HR 80-100", "HR 80-100"),
+    ("SpO2 88-92%", "SpO2 88-92%"),
+    ("HR 90 to 110", "HR 90 to 110"),
+    # Paired readings keep their labels.
+    ("BP 130/80 (lying) 100/60 (standing)", "BP 130/80 (lying) 100/60 (standing)"),
+    ("BP 130/80, BP 100/60", "BP 130/80, BP 100/60"),
+    # A number after an unrecognised word belongs to that word.
+    ("FiO2 40%, HR 90", "FiO2 40%, HR 90"),
+])
+def test_unparsed_vitals_text_is_kept_as_written(vitals, expected):
+    assert canonical_vitals(vitals) == expected
+
+
+def test_layout_variants_share_one_summary_and_fingerprint():
+    a = {
+        "age": 65,
+        "sex": "male",
+        "chief_complaint": "fever and pleuritic chest pain",
+        "symptoms": "fever, productive cough",
+        "vitals": "RR 28, SpO2 90%, HR 102, BP 130/80",
+        "history": "COPD on home oxygen.",
+    }
+    b = {
+        "age": 65,
+        "sex": "M",
+        "chief_complaint": "Fever and  pleuritic chest pain.",
+        "symptoms": "Productive cough;fever\nfever",
+        "vitals": "HR: 102 BP 130 / 80 resp rate 28 SpO2: 90",
+        "history": "COPD  on home oxygen",
+    }
+    summary = build_case_summary(a)
+    assert build_case_summary(b) == summary
+    assert case_fingerprint(build_case_summary(b)) == case_fingerprint(summary)
+    assert "Symptoms: fever, productive cough." in summary
+    assert "Vitals: HR 102, BP 130/80, RR 28, SpO2 90%." in summary
+    assert canonical_case(b)["history"] == "COPD on home oxygen"
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+from src.cache import ResultCache, set_result_cache
+from src.llm import ReplayChatModel
+from src.orchestration import build_ddx_graph
+
+CASE = {"age": 65, "sex": "male", "chief_complaint": "fever and pleuritic chest pain"}
+
+
+def _graph(tmp_path, diagnoses, evidence_content):
+    """Per-diagnosis graph on a replay file answering every call by node."""
+    set_result_cache(ResultCache())
+    recordings = {
+        "extract_key_findings": "1. Positive: fever.",
+        "generate_candidates": json.dumps({"diagnoses": diagnoses}),
+        "evidence_for_diagnosis": evidence_content,
+        "suggest_investigations": json.dumps({"investigations": [{"name": "Chest X-ray"}]}),
+    }
+    path = tmp_path / "replay.jsonl"
+    path.write_text("".join(
+        json.dumps({"node": node, "key": node, "content": content}) + "\n"
+        for node, content in recordings.items()
+    ))
+    return build_ddx_graph(llm=ReplayChatModel(path=str(path)), evidence_mode="per_diagnosis")
+
+
+def _evidence(graph):
+    output = asyncio.run(graph.ainvoke({"patient_case": CASE}))["final_output"]
+    return output["diagnoses"], output["evidence"]
+
+
+# The recording names a different diagnosis than the one asked about, as a
+# model might: entries must still be keyed to their own candidate.
+ENTRY = json.dumps({"evidence": [{"name": "Something else", "features_supporting": ["fever"]}]})
+
+
+@pytest.mark.parametrize("names", [
+    ["Pneumonia", "Pulmonary embolism", "Pericarditis"],
+    ["Pneumonia", "Pneumonia", "Pulmonary embolism"],
+])
+def test_every_candidate_gets_exactly_one_evidence_entry(tmp_path, names):
+    diagnoses = [{"name": n, "rationale": "", "likelihood": "Low"} for n in names]
+    candidates, evidence = _evidence(_graph(tmp_path, diagnoses, ENTRY))
+
+    assert [d["name"] for d in candidates] == names
+    assert sorted(e["name"] for e in evidence) == sorted(set(names))
+    assert all(e["features_supporting"] == ["fever"] for e in evidence)
+
+
+def test_unusable_evidence_still_yields_an_empty_entry(tmp_path):
+    diagnoses = [{"name": "Pneumonia", "rationale": "", "likelihood": "High"}]
+    _, evidence = _evidence(_graph(tmp_path, diagnoses, "not json"))
+
+    assert evidence == [{
+        "name": "Pneumonia",
+        "features_supporting": [],
+        "features_against_or_missing": [],
+        "potential_red_flags": [],
+    }]
+
+
+def test_no_candidates_joins_with_empty_evidence(tmp_path):
+    candidates, evidence = _evidence(_graph(tmp_path, [], ENTRY))
+
+    assert candidates == [] and evidence == []
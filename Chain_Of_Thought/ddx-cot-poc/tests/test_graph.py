@@ -1,4 +1,4 @@
-from src.orchestration import build_ddx_graph
+from src.orchestration import build_ddx_graph, build_fast_ddx_graph
 
 
 def test_graph_runs_smoke():
@@ -15,3 +15,20 @@ def test_graph_runs_smoke():
     result = graph.invoke(state)
     assert "final_output" in result
     assert "disclaimer" in result["final_output"]
+
+
+def test_fast_graph_fills_the_same_output():
+    graph = build_fast_ddx_graph()
+    state = {
+        "patient_case": {
+            "age": 65,
+            "sex": "male",
+            "chief_complaint": "fever and pleuritic chest pain",
+        }
+    }
+
+    output = graph.invoke(state)["final_output"]
+    assert set(output) == {
+        "disclaimer", "case_summary", "key_findings", "diagnoses", "evidence", "investigations",
+    }
+    assert output["key_findings"] and output["diagnoses"] and output["evidence"]
@@ -0,0 +1,41 @@
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import cost of src.api.server on top of FastAPI itself, in ms. The
+# graph, LLM clients and tracing are built on first use, so this only
+# covers the API module and its light dependencies.
+IMPORT_BUDGET_MS = float(os.getenv("DDX_IMPORT_BUDGET_MS", "400"))
+
+# Slow imports that must stay out of the import path.
+DEFERRED_MODULES = ("langfuse", "langchain_openai", "openai", "langgraph", "langchain_core")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)  # importing must not need credentials
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _cumulative_us(importtime_log: str, module: str) -> int:
+    match = re.search(rf"^import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$", importtime_log, re.M)
+    assert match, f"{module} not in -X importtime output"
+    return int(match.group(1))
+
+
+def test_server_import_defers_heavy_modules():
+    code = f"import sys, src.api.server; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    assert _python("-c", code).stdout.strip() == "[]"
+
+
+def test_server_import_time_budget():
+    samples = []
+    for _ in range(3):  # best of 3; the first run may also compile .pyc files
+        log = _python("-X", "importtime", "-c", "import fastapi, src.api.server").stderr
+        samples.append(_cumulative_us(log, "src.api.server") / 1000)
+    assert min(samples) < IMPORT_BUDGET_MS, f"src.api.server import took {min(samples):.0f} ms"
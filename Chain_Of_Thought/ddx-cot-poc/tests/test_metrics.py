@@ -0,0 +1,36 @@
+import asyncio
+
+from benchmarks.stub_llm import StubChatModel
+from src.cache import ResultCache, set_result_cache
+from src.observability import Histogram, render_metrics, reset_metrics
+from src.observability.instrumentation import LLM_PROMPT_TOKENS, LLM_SECONDS, NODE_SECONDS
+from src.orchestration import build_ddx_graph
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("demo_seconds", "Demo.", ("node",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        h.observe(value, "a")
+
+    lines = h.render()
+
+    assert 'demo_seconds_bucket{node="a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{node="a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{node="a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{node="a"} 3' in lines
+    assert 'demo_seconds_sum{node="a"} 5.55' in lines
+
+
+def test_graph_run_records_node_and_llm_metrics():
+    reset_metrics()
+    set_result_cache(ResultCache())  # empty, memory-only: every node calls the LLM
+    graph = build_ddx_graph(llm=StubChatModel(), metrics=True)
+
+    asyncio.run(graph.ainvoke({"patient_case": {"age": 40, "chief_complaint": "cough"}}))
+
+    assert NODE_SECONDS.snapshot("normalize_input")[0] == 1
+    assert NODE_SECONDS.snapshot("format_output")[0] == 1
+    assert LLM_SECONDS.snapshot("generate_candidates", "ddx-stub")[0] == 1
+    count, tokens = LLM_PROMPT_TOKENS.snapshot("extract_key_findings", "ddx-stub")
+    assert count == 1 and tokens > 0
+    assert "ddx_llm_completion_tokens_bucket" in render_metrics()
@@ -0,0 +1,56 @@
+from src.orchestration.parsing import FAILED, OK, REPAIRED, parse_items, parse_sections
+from src.orchestration.schemas import Diagnosis, EvidenceEntry
+
+
+def test_clean_json_is_ok():
+    result = parse_items('{"diagnoses": [{"name": "CAP", "likelihood": "High"}]}', "diagnoses", Diagnosis)
+    assert result.status == OK
+    assert result.items == [{"name": "CAP", "rationale": "", "likelihood": "High"}]
+
+
+def test_fenced_and_wrapped_json_is_repaired():
+    text = 'Sure!\n```json\n{"diagnoses": [{"name": "CAP"}]}\n```\nHope that helps.'
+    result = parse_items(text, "diagnoses", Diagnosis)
+    assert result.status == REPAIRED
+    assert [d["name"] for d in result.items] == ["CAP"]
+
+
+def test_truncated_json_keeps_complete_entries():
+    text = (
+        '{"evidence": [{"name": "CAP", "features_supporting": ["fever"]}, '
+        '{"name": "PE", "features_supporting": ["hypox'
+    )
+    result = parse_items(text, "evidence", EvidenceEntry)
+    assert result.status == REPAIRED
+    assert [e["name"] for e in result.items] == ["CAP", "PE"]
+    assert result.items[1]["features_supporting"] == []
+
+
+def test_invalid_entries_are_dropped():
+    result = parse_items('{"diagnoses": [{"name": "CAP"}, {"rationale": "no name"}]}', "diagnoses", Diagnosis)
+    assert result.status == REPAIRED
+    assert [d["name"] for d in result.items] == ["CAP"]
+
+
+def test_unusable_output_fails():
+    assert parse_items("I cannot help with that.", "diagnoses", Diagnosis).status == FAILED
+    assert parse_items('{"diagnoses": [', "diagnoses", Diagnosis).status == FAILED
+    assert parse_items('{"other": []}', "diagnoses", Diagnosis).status == FAILED
+
+
+def test_sections_need_required_keys_and_flag_missing_ones():
+    sections = {"key_findings": str, "diagnoses": Diagnosis, "evidence": EvidenceEntry}
+
+    full = parse_sections(
+        '{"key_findings": "fever", "diagnoses": [{"name": "CAP"}], "evidence": [{"name": "CAP"}]}',
+        sections, required=("diagnoses",),
+    )
+    assert full.status == OK
+    assert full.sections["key_findings"] == "fever"
+
+    partial = parse_sections('{"diagnoses": [{"name": "CAP"}, {}]}', sections, required=("diagnoses",))
+    assert partial.status == REPAIRED
+    assert [d["name"] for d in partial.sections["diagnoses"]] == ["CAP"]
+    assert partial.sections["key_findings"] == "" and partial.sections["evidence"] == []
+
+    assert parse_sections('{"key_findings": "fever"}', sections, required=("diagnoses",)).status == FAILED
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import httpx
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.observability.instrumentation import LLM_RATE_LIMITED
+from src.ratelimit import LLMScheduler, ainvoke_scheduled, llm_priority, set_llm_scheduler
+
+
+def test_interactive_calls_go_ahead_of_queued_batch_calls():
+    # One request in the bucket, refilled every 0.1 s.
+    scheduler = LLMScheduler(rpm=600, burst_seconds=0.1)
+    order = []
+
+    async def call(name, priority):
+        await scheduler.acquire(1, priority)
+        order.append(name)
+
+    async def go():
+        await call("first", "batch")
+        batch = [asyncio.ensure_future(call(f"batch-{i}", "batch")) for i in range(2)]
+        await asyncio.sleep(0.01)
+        assert scheduler.queue_depth() == {"interactive": 0, "batch": 2}
+        interactive = asyncio.ensure_future(call("interactive", "interactive"))
+        await asyncio.gather(*batch, interactive)
+
+    asyncio.run(go())
+
+    assert order == ["first", "interactive", "batch-0", "batch-1"]
+
+
+def test_token_budget_is_corrected_from_reported_usage():
+    scheduler = LLMScheduler(tpm=6000, burst_seconds=1)  # 100 tokens, +100/s
+
+    async def go():
+        await scheduler.acquire(100)
+        scheduler.settle(100, 40)  # the call used fewer tokens than estimated
+        start = time.perf_counter()
+        await scheduler.acquire(60)
+        return time.perf_counter() - start
+
+    assert asyncio.run(go()) < 0.05
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "mock",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def test_429s_pause_dispatch_and_are_retried():
+    from langchain_openai import ChatOpenAI
+
+    sent = []
+
+    def provider(request: httpx.Request) -> httpx.Response:
+        sent.append(time.perf_counter())
+        if len(sent) <= 2:
+            return httpx.Response(429, headers={"retry-after": "0.2"}, json={"error": {"message": "slow down"}})
+        return httpx.Response(200, json=_completion("ok"))
+
+    llm = ChatOpenAI(
+        model="mock",
+        api_key="sk-mock",
+        base_url="http://mock-provider/v1",
+        max_retries=0,
+        http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(provider)),
+    )
+    chain = ChatPromptTemplate.from_messages([("user", "{q}")]) | llm
+    set_llm_scheduler(LLMScheduler(rpm=6000, tpm=600_000))
+    before = LLM_RATE_LIMITED.value("batch")
+
+    async def go():
+        with llm_priority("batch"):
+            return await asyncio.gather(*(ainvoke_scheduled(chain, {"q": str(i)}) for i in range(3)))
+
+    try:
+        messages = asyncio.run(go())
+    finally:
+        set_llm_scheduler(None)
+
+    assert [m.content for m in messages] == ["ok", "ok", "ok"]
+    assert LLM_RATE_LIMITED.value("batch") - before == 2
+    # three first attempts, then the two retries once the shared pause ended
+    assert len(sent) == 5 and min(sent[3:]) - max(sent[:2]) >= 0.19
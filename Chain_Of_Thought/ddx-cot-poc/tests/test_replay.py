@@ -0,0 +1,41 @@
+import json
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.llm import ReplayChatModel, ReplayMissError, messages_key
+
+
+def _recordings(tmp_path):
+    exact = [HumanMessage(content="recorded prompt")]
+    path = tmp_path / "replay.jsonl"
+    path.write_text(
+        json.dumps({"node": "generate_candidates", "key": messages_key(exact), "content": "exact"}) + "\n"
+        + json.dumps({"node": "generate_candidates", "key": "other", "content": "by node"}) + "\n"
+    )
+    return str(path), exact
+
+
+def test_replay_prefers_exact_prompt_then_falls_back_to_node(tmp_path):
+    path, exact = _recordings(tmp_path)
+    model = ReplayChatModel(path=path)
+    config = {"metadata": {"langgraph_node": "generate_candidates"}}
+
+    assert model.invoke(exact, config=config).content == "exact"
+    assert model.invoke([HumanMessage(content="new case")], config=config).content == "by node"
+    with pytest.raises(ReplayMissError):
+        model.invoke([HumanMessage(content="new case")])
+
+
+def test_replay_latency_and_jitter_stay_in_bounds(tmp_path):
+    path, exact = _recordings(tmp_path)
+    model = ReplayChatModel(path=path, latency_ms=20, jitter_ms=10, seed=1)
+
+    delays = [model._delay() for _ in range(200)]
+    assert all(0.010 <= d <= 0.030 for d in delays)
+    assert len(set(delays)) > 1
+
+    start = time.perf_counter()
+    model.invoke(exact)
+    assert time.perf_counter() - start >= 0.010
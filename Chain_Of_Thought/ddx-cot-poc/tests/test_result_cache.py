@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+from src.cache.result_cache import ResultCache, make_key
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ResultCache(max_items=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # touch a -> b is now least recent
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    cache = ResultCache(ttl_seconds=0.05)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+
+def test_sqlite_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ResultCache(sqlite_path=path).set("k", "v")
+
+    fresh = ResultCache(sqlite_path=path)
+    assert fresh.get("k", node="extract_key_findings") == "v"
+    stats = fresh.stats()
+    assert stats["hits_sqlite"] == 1
+    assert stats["by_node"]["extract_key_findings"]["hits_sqlite"] == 1
+    # promoted into the memory tier
+    assert fresh.get("k") == "v"
+    assert fresh.stats()["hits_memory"] == 1
+
+
+def test_key_depends_on_node_inputs_prompt_and_model():
+    inputs = {"case_summary": "65-year-old male"}
+    base = make_key("extract_key_findings", "p1", "gpt-4.1-mini", inputs)
+
+    assert base == make_key("extract_key_findings", "p1", "gpt-4.1-mini", dict(inputs))
+    assert base != make_key("extract_key_findings", "p2", "gpt-4.1-mini", inputs)
+    assert base != make_key("extract_key_findings", "p1", "gpt-4.1", inputs)
+    assert base != make_key("extract_key_findings", "p1", "gpt-4.1-mini", {"case_summary": "x"})
+
+
+def test_async_sqlite_tier_runs_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(sqlite_path=path)
+    sqlite_threads = []
+    for name in ("_sqlite_get", "_sqlite_set"):
+        original = getattr(cache, name)
+
+        def traced(*args, _original=original):
+            sqlite_threads.append(threading.get_ident())
+            return _original(*args)
+
+        setattr(cache, name, traced)
+
+    async def go():
+        loop_thread = threading.get_ident()
+        await cache.aset("k", "v")
+        memory_hit = await cache.aget("k")
+        fresh = ResultCache(sqlite_path=path)
+        sqlite_hit = await fresh.aget("k", node="generate_candidates")
+        miss = await cache.aget("missing")
+        return loop_thread, memory_hit, sqlite_hit, fresh.stats(), miss
+
+    loop_thread, memory_hit, sqlite_hit, fresh_stats, miss = asyncio.run(go())
+
+    assert memory_hit == "v" and sqlite_hit == "v" and miss is None
+    assert fresh_stats["hits_sqlite"] == 1
+    # one write + the miss's lookup; the memory hit never touched SQLite
+    assert len(sqlite_threads) == 2
+    assert loop_thread not in sqlite_threads
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from src.config.routing import LLMRoute
+from src.observability.instrumentation import LLM_ROUTES
+from src.orchestration import build_ddx_graph
+from src.orchestration.routing import route_node
+
+ROUTE = LLMRoute("big", latency_budget_s=0.05, fallback_model="small")
+
+
+def _slow(state):
+    time.sleep(0.3)
+    return {"answer": "big"}
+
+
+async def _aslow(state):
+    await asyncio.sleep(0.3)
+    return {"answer": "big"}
+
+
+def test_node_falls_back_when_primary_exceeds_its_budget():
+    before = LLM_ROUTES.value("n", "fallback", "small")
+    routed = route_node("n", ROUTE, _slow, lambda state: {"answer": "small"})
+
+    start = time.perf_counter()
+    update = routed({})
+    assert time.perf_counter() - start < 0.2
+    assert update == {"answer": "small", "llm_routes": {"n": "fallback:small"}}
+
+    async def afast(state):
+        return {"answer": "small"}
+
+    update = asyncio.run(route_node("n", ROUTE, _aslow, afast)({}))
+    assert update["llm_routes"] == {"n": "fallback:small"}
+    assert LLM_ROUTES.value("n", "fallback", "small") - before == 2
+
+
+def test_primary_within_budget_is_kept():
+    routed = route_node("n", ROUTE, lambda state: {"answer": "big"}, _slow)
+    assert routed({}) == {"answer": "big", "llm_routes": {"n": "primary:big"}}
+
+
+def test_routed_graph_records_the_route_of_every_llm_node():
+    result = build_ddx_graph(routing=True).invoke(
+        {"patient_case": {"age": 65, "sex": "male", "chief_complaint": "fever and pleuritic chest pain"}}
+    )
+    assert set(result["llm_routes"]) == {
+        "extract_key_findings", "generate_candidates", "evidence_for_against", "suggest_investigations",
+    }
+    assert all(route.startswith("primary:") for route in result["llm_routes"].values())
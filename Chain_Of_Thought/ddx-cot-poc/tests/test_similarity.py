@@ -0,0 +1,113 @@
+import asyncio
+
+from benchmarks.stub_llm import StubChatModel
+from src.api import server
+from src.api.schemas import PatientCase
+from src.cache import ResultCache, set_result_cache
+from src.orchestration import build_ddx_graph, build_fast_ddx_graph
+from src.orchestration.cases import CaseStore
+from src.similarity import CaseIndex, set_case_index
+from src.utils.case_builder import build_case_summary
+
+CASE = {
+    "age": 65,
+    "sex": "male",
+    "chief_complaint": "fever and pleuritic chest pain",
+    "symptoms": "fever, productive cough, pleuritic chest pain",
+    "vitals": "RR 28, SpO2 90%, HR 102, BP 130/80",
+    "history": "No known chronic lung disease documented.",
+}
+NEAR = dict(CASE, vitals="RR 26, SpO2 91%, HR 104, BP 128/80")
+OTHER = {"age": 30, "sex": "female", "chief_complaint": "headache", "symptoms": "photophobia, neck stiffness"}
+
+
+def test_index_finds_near_duplicate_above_threshold():
+    index = CaseIndex(max_items=100, threshold=0.8, candidates=4)
+    index.add(build_case_summary(CASE), {"id": "case"})
+    for i in range(20):
+        index.add(build_case_summary(dict(OTHER, age=20 + i)), {"id": f"other-{i}"})
+
+    match = index.nearest(build_case_summary(NEAR))
+    assert match is not None and match.final_output == {"id": "case"}
+    assert 0.8 <= match.similarity < 1.0
+    assert index.search(build_case_summary(CASE))[0].similarity > 0.999
+    assert index.nearest(build_case_summary({"chief_complaint": "ankle injury"})) is None
+
+
+def test_index_replaces_oldest_when_full():
+    index = CaseIndex(max_items=2, threshold=0.99)
+    index.add(build_case_summary(CASE), {"id": 1})
+    index.add(build_case_summary(OTHER), {"id": 2})
+    index.add(build_case_summary(dict(OTHER, chief_complaint="vomiting")), {"id": 3})
+
+    assert len(index) == 2
+    assert index.nearest(build_case_summary(CASE)) is None
+
+
+def test_ddx_endpoint_returns_or_seeds_from_similar_case():
+    set_result_cache(ResultCache())
+    set_case_index(CaseIndex(max_items=100, threshold=0.8))
+    llm = StubChatModel()
+    server.case_store = CaseStore(lambda fast, checkpointer: build_ddx_graph(llm=llm, checkpointer=checkpointer))
+
+    async def go():
+        first = await server.ddx_endpoint(PatientCase(**CASE), similar="return")
+        returned = await server.ddx_endpoint(PatientCase(**NEAR), similar="return")
+        seeded = await server.ddx_endpoint(PatientCase(**NEAR), similar="seed")
+        return first, returned, seeded
+
+    try:
+        first, returned, seeded = asyncio.run(go())
+    finally:
+        server.case_store = None
+        set_case_index(None)
+
+    assert first.similar_case is None and first.case_id
+    assert returned.case_id is None
+    assert returned.similar_case["mode"] == "return"
+    assert returned.output["diagnoses"] == first.output["diagnoses"]
+    assert returned.output["case_summary"] == build_case_summary(NEAR)
+    assert seeded.case_id and seeded.similar_case["mode"] == "seed"
+
+
+def test_index_only_matches_entries_of_the_same_mode():
+    index = CaseIndex(max_items=100, threshold=0.8, candidates=4)
+    index.add(build_case_summary(CASE), {"id": "fast"}, fast=True)
+    for i in range(20):
+        index.add(build_case_summary(dict(OTHER, age=20 + i)), {"id": f"other-{i}"})
+
+    assert index.nearest(build_case_summary(NEAR)) is None
+    assert index.nearest(build_case_summary(NEAR), fast=True).final_output == {"id": "fast"}
+
+    index.add(build_case_summary(CASE), {"id": "full"})
+    assert index.nearest(build_case_summary(NEAR)).final_output == {"id": "full"}
+    assert index.nearest(build_case_summary(NEAR), fast=True).final_output == {"id": "fast"}
+
+
+def test_ddx_endpoint_reuses_only_same_mode_results():
+    set_result_cache(ResultCache())
+    set_case_index(CaseIndex(max_items=100, threshold=0.8))
+    llm = StubChatModel()
+    server.case_store = CaseStore(
+        lambda fast, checkpointer: (build_fast_ddx_graph if fast else build_ddx_graph)(llm=llm, checkpointer=checkpointer)
+    )
+
+    async def go():
+        fast = await server.ddx_endpoint(PatientCase(**CASE), fast=True, similar="return")
+        full = await server.ddx_endpoint(PatientCase(**NEAR), similar="return")
+        seeded = await server.ddx_endpoint(PatientCase(**NEAR), similar="seed")
+        fast_again = await server.ddx_endpoint(PatientCase(**NEAR), fast=True, similar="return")
+        return fast, full, seeded, fast_again
+
+    try:
+        fast, full, seeded, fast_again = asyncio.run(go())
+    finally:
+        server.case_store = None
+        set_case_index(None)
+
+    # The fast-mode output is neither returned for nor seeded into a full run.
+    assert full.similar_case is None and full.case_id
+    assert seeded.similar_case["case_summary"] == build_case_summary(NEAR)
+    assert fast_again.case_id is None
+    assert fast_again.similar_case["case_summary"] == build_case_summary(CASE)
+    assert fast_again.output["diagnoses"] == fast.output["diagnoses"]
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from benchmarks.stub_llm import StubChatModel
+from src.api import server
+from src.api.schemas import PatientCase
+from src.api.single_flight import SingleFlight
+from src.cache import ResultCache, set_result_cache
+from src.observability.instrumentation import COALESCED_REQUESTS
+from src.orchestration import build_ddx_graph
+from src.orchestration.cases import CaseStore
+
+CASE = {"age": 65, "sex": "male", "chief_complaint": "fever", "vitals": "RR 28, SpO2 90%"}
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def go():
+        results = await asyncio.gather(
+            flights.do("a", lambda: work(1)),
+            flights.do("a", lambda: work(2)),
+            flights.do("b", lambda: work(3)),
+        )
+        assert len(flights) == 0
+        later = await flights.do("a", lambda: work(4))
+        return results, later
+
+    results, later = asyncio.run(go())
+
+    assert results == [(1, False), (1, True), (3, False)]
+    assert later == (4, False)
+    assert calls == [1, 3, 4]
+
+
+def test_errors_reach_every_caller_and_survive_a_cancelled_leader():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def go():
+        leader = asyncio.ensure_future(flights.do("k", fail))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("k", fail))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(ValueError):
+            await follower
+
+    asyncio.run(go())
+
+
+def test_identical_ddx_submissions_are_coalesced():
+    set_result_cache(ResultCache())
+    llm = StubChatModel(latency_s=0.02)
+    server.case_store = CaseStore(lambda fast, checkpointer: build_ddx_graph(llm=llm, checkpointer=checkpointer))
+    before = COALESCED_REQUESTS.value("ddx")
+
+    async def go():
+        same = [server.ddx_endpoint(PatientCase(**CASE), similar="off") for _ in range(3)]
+        other = server.ddx_endpoint(PatientCase(**CASE, labs="CRP 180"), similar="off")
+        return await asyncio.gather(*same, other)
+
+    try:
+        *same, other = asyncio.run(go())
+    finally:
+        server.case_store = None
+
+    assert len({response.case_id for response in same}) == 1
+    assert other.case_id != same[0].case_id
+    assert COALESCED_REQUESTS.value("ddx") - before == 2
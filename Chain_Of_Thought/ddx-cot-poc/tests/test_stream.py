@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.api.schemas import PatientCase
+from src.orchestration import build_ddx_graph
+
+CASE = {
+    "age": 65,
+    "sex": "male",
+    "chief_complaint": "fever and pleuritic chest pain",
+}
+
+
+def _events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _stream(client, **params):
+    with client.stream("POST", "/ddx/stream", json=CASE, params=params) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        return _events(resp.read().decode("utf-8"))
+
+
+def test_stream_event_order_and_final_payload(monkeypatch):
+    monkeypatch.setattr(server, "graph", build_ddx_graph())
+    with TestClient(server.app) as client:
+        events = _stream(client, no_cache="true")  # cache hits would emit no tokens
+
+    kinds = [kind for kind, _ in events]
+    nodes = [data["node"] for kind, data in events if kind == "node"]
+    assert kinds[-2:] == ["final", "done"]
+    assert "error" not in kinds
+    assert nodes[0] == "normalize_input"
+    assert set(nodes) == {
+        "normalize_input", "extract_key_findings", "generate_candidates",
+        "evidence_for_against", "suggest_investigations",
+    }
+
+    # key_findings tokens arrive before that node's update, and add up to it
+    tokens = [i for i, (kind, _) in enumerate(events) if kind == "token"]
+    findings_at = next(
+        i for i, (kind, d) in enumerate(events) if kind == "node" and d["node"] == "extract_key_findings"
+    )
+    assert tokens and max(tokens) < findings_at
+    streamed = "".join(events[i][1]["content"] for i in tokens)
+    assert streamed == events[findings_at][1]["output"]["key_findings"]
+
+    final = events[-2][1]
+    by_node = {d["node"]: d["output"] for kind, d in events if kind == "node"}
+    assert final["key_findings"] == streamed
+    assert final["diagnoses"] == by_node["generate_candidates"]["candidate_diagnoses"]
+    assert final["evidence"] == by_node["evidence_for_against"]["evidence_matrix"]
+    assert final["investigations"] == by_node["suggest_investigations"]["suggested_investigations"]
+    assert "NOT a final diagnosis" in final["disclaimer"]
+
+
+class FailingGraph:
+    """Emits one node update, then fails like a provider error mid-run."""
+
+    async def astream(self, state, stream_mode):
+        yield "updates", {"normalize_input": {"case_summary": "65-year-old male"}}
+        raise RuntimeError("provider unavailable")
+
+
+def test_stream_reports_errors_then_closes(monkeypatch):
+    monkeypatch.setattr(server, "graph", FailingGraph())
+    with TestClient(server.app) as client:
+        events = _stream(client)
+
+    assert [kind for kind, _ in events] == ["node", "error", "done"]
+    assert events[1][1] == {"detail": "RuntimeError: provider unavailable"}
+
+
+def test_stream_disconnect_releases_the_ddx_slot(monkeypatch):
+    monkeypatch.setattr(server, "graph", build_ddx_graph())
+    monkeypatch.setattr(server, "_ddx_slots", asyncio.Semaphore(2))
+
+    async def go():
+        response = await server.ddx_stream_endpoint(PatientCase(**CASE), no_cache=True)
+        body = response.body_iterator
+        first = await body.__anext__()
+        held = server._ddx_slots._value
+        await body.aclose()  # what Starlette does when the client goes away
+        return first, held, server._ddx_slots._value
+
+    first, held, after = asyncio.run(go())
+    assert first.startswith("event: node")
+    assert held == 1 and after == 2
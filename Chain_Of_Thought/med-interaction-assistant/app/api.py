@@ -1,14 +1,28 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List
+from contextlib import asynccontextmanager
+import asyncio
 
-from .graph import graph
+from .config import settings
+from .graph import graph, explanation_cache, client
 from .state import MedInteractionState
 from .observability import langfuse, span_ctx
+from .batch import screen_batch
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close the pooled OpenAI HTTP connections and send queued spans on shutdown
+    await client.close()
+    langfuse.flush()
+
 
 app = FastAPI(
     title="Medication Interaction Reasoning Assistant (POC)",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 
@@ -26,22 +40,48 @@ class MedResponse(BaseModel):
     disclaimer: str
 
 
+class BatchRequest(BaseModel):
+    patients: List[MedRequest]
+
+
+class BatchResponse(BaseModel):
+    results: List[MedResponse]
+    patients: int
+    unique_pairs: int
+    explanation_cache_hits: int
+    llm_calls: int
+    llm_errors: int
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Explanation cache hit/miss counters and hit ratio."""
+    if explanation_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **explanation_cache.stats()}
+
+
 @app.post("/interactions", response_model=MedResponse)
-def get_interactions(req: MedRequest):
+async def get_interactions(req: MedRequest):
     """
     Main endpoint: creates a Langfuse root span (trace),
     runs the LangGraph, and attaches the final result.
+
+    The graph runs on the event loop, so a request waiting on the LLM
+    holds no thread. Requests taking longer than
+    settings.request_timeout_seconds are cancelled with a 504.
     """
     # Root span = root observation -> becomes the trace root
     with span_ctx(
         "med-interaction-request",
         input_data=req.model_dump(),
     ) as root_span:
-        # Optional: attach trace-level metadata (shows on trace in Langfuse UI)
+        # Trace-level metadata (shows on trace in Langfuse UI). The lists
+        # themselves are already the root span input.
         root_span.update_trace(
             metadata={
-                "medications": req.medications,
-                "comorbidities": req.comorbidities,
+                "medication_count": len(req.medications),
+                "comorbidity_count": len(req.comorbidities),
                 "source": "fastapi",
             }
         )
@@ -51,8 +91,56 @@ def get_interactions(req: MedRequest):
             "comorbidities": req.comorbidities,
         }
 
-        final_state = graph.invoke(initial_state)
+        try:
+            final_state = await asyncio.wait_for(
+                graph.ainvoke(initial_state),
+                timeout=settings.request_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            root_span.update(level="ERROR", status_message="request timed out")
+            raise HTTPException(status_code=504, detail="Interaction reasoning timed out")
+
+        # The full result is the format_result span's output; the root
+        # span only carries the headline.
+        result = final_state["result"]
+        root_span.update(
+            output={
+                "count_flagged_interactions": result["count_flagged_interactions"],
+                "flagged": [(s["label"], s["severity"]) for s in result["summary_list"]],
+            }
+        )
+
+        return result
+
+
+@app.post("/interactions/batch", response_model=BatchResponse)
+async def get_interactions_batch(req: BatchRequest):
+    """
+    Screen many patients at once (e.g. a whole ward). Each distinct pair,
+    in the same comorbidity context, is explained once for the batch;
+    `results` are in the order of `patients`.
+    """
+    if len(req.patients) > settings.batch_max_patients:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.batch_max_patients} patients per batch",
+        )
+
+    with span_ctx(
+        "med-interaction-batch",
+        input_data={"patients": len(req.patients)},
+    ) as root_span:
+        root_span.update_trace(metadata={"patients": len(req.patients), "source": "fastapi-batch"})
+
+        try:
+            results, stats = await asyncio.wait_for(
+                screen_batch([p.model_dump() for p in req.patients]),
+                timeout=settings.batch_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            root_span.update(level="ERROR", status_message="batch timed out")
+            raise HTTPException(status_code=504, detail="Batch interaction reasoning timed out")
 
-        root_span.update(output=final_state.get("result"))
+        root_span.update(output=stats)
 
-        return final_state["result"]
+        return {"results": results, **stats}
@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Tuple
+
+from .config import settings
+from .graph import (
+    build_result,
+    comorbidity_normalizer,
+    explain_many,
+    med_normalizer,
+    rule_index,
+)
+from .observability import span_ctx
+
+
+def _normalize_all(normalizer, lists: List[List[str]]) -> List[List[str]]:
+    # Each distinct string is normalised once for the whole batch.
+    distinct = list({text for texts in lists for text in texts})
+    mapping = dict(zip(distinct, normalizer.normalize_many(distinct)))
+    return [[mapping[t] for t in texts] for texts in lists]
+
+
+async def screen_batch(patients: List[Dict[str, List[str]]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Screen many patients (e.g. a ward at shift change) in one pass.
+
+    Same steps as the graph, but each runs over the whole batch:
+    names are normalised in bulk, candidates come from the rule index per
+    patient, and explain_many explains every distinct (pair, relevant
+    comorbidities) once. LLM calls therefore grow with the distinct pairs
+    on the ward, not the number of patients. Returns the per-patient
+    results, in input order, and batch stats.
+
+    The steps are batched rather than the graph nodes reused, and results
+    differ from /interactions in two ways (tests/test_batch.py):
+    - entries the LLM adds for pairs it was not asked about are dropped,
+      since one call serves several patients and they belong to none;
+    - a failed LLM call gives its pairs rule-only fallback entries
+      (`explanation_error` set) instead of failing the whole request.
+    """
+    medications = [p.get("medications", []) or [] for p in patients]
+    comorbidities = [p.get("comorbidities", []) or [] for p in patients]
+
+    with span_ctx("normalize_batch", input_data={"patients": len(patients)}) as span:
+        meds = _normalize_all(med_normalizer, medications)
+        comorbs = _normalize_all(comorbidity_normalizer, comorbidities)
+        span.update(output={"distinct_names": len({m for ms in meds for m in ms})})
+
+    with span_ctx("find_interactions_batch") as span:
+        candidates = [rule_index.candidates(m, c) for m, c in zip(meds, comorbs)]
+        span.update(output={"candidates": sum(len(c) for c in candidates)})
+
+    with span_ctx("explain_batch") as span:
+        explanations, stats = await explain_many(
+            list(zip(candidates, comorbs)),
+            pairs_per_call=settings.batch_pairs_per_call,
+            concurrency=settings.batch_llm_concurrency,
+        )
+        span.update(output=stats)
+
+    results = [
+        build_result(m, c, inters)
+        for m, c, inters in zip(medications, comorbidities, explanations)
+    ]
+    return results, {"patients": len(patients), **stats}
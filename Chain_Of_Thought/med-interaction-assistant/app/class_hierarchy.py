@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import csv
+import json
+import os
+
+
+class ClassHierarchy:
+    """
+    Drug / condition classes as a DAG: entity or class -> parent classes,
+    e.g. ibuprofen -> nsaid, ckd_stage_3 -> ckd -> renal_impairment.
+
+    `ancestors(name)` is the name itself plus every class above it. It is
+    memoised for names with memberships, since rules are matched against
+    it on every request. Any other name is its own only ancestor and is
+    answered without a memo entry, so arbitrary input names cannot grow
+    the memo past the size of the hierarchy.
+    """
+
+    def __init__(self, parents: Optional[Dict[str, Iterable[str]]] = None):
+        self._parents: Dict[str, List[str]] = {}
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
+        for child, classes in (parents or {}).items():
+            for parent in classes:
+                self.add(child, parent)
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._parents
+
+    def add(self, child: str, parent: str) -> None:
+        child, parent = child.strip().lower(), parent.strip().lower()
+        if not child or not parent or child == parent:
+            return
+        parents = self._parents.setdefault(child, [])
+        if parent not in parents:
+            parents.append(parent)
+            self._ancestors.clear()
+
+    def ancestors(self, name: str) -> Tuple[str, ...]:
+        if name not in self._parents:
+            return (name,)
+        found = self._ancestors.get(name)
+        if found is None:
+            seen = {name: None}
+            stack = [name]
+            while stack:
+                for parent in self._parents.get(stack.pop(), ()):
+                    if parent not in seen:
+                        seen[parent] = None
+                        stack.append(parent)
+            found = self._ancestors[name] = tuple(seen)
+        return found
+
+
+# ---------- Hierarchy files ----------
+
+def load_class_hierarchy(path: str) -> Dict[str, List[str]]:
+    """
+    Read entity -> classes from a .csv file (header row with entity, class;
+    one row per membership) or a .json object {entity: class | [classes]}.
+    Classes can themselves have parent classes.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    parents: Dict[str, List[str]] = {}
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("entity") and row.get("class"):
+                    parents.setdefault(row["entity"], []).append(row["class"])
+        return parents
+    if ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return {child: [classes] if isinstance(classes, str) else list(classes) for child, classes in data.items()}
+    raise ValueError(f"{path}: unsupported class hierarchy file type {ext!r} (use .csv or .json)")
+
+
+def build_class_hierarchy(builtin: Dict[str, Iterable[str]], path: str = "") -> ClassHierarchy:
+    """Hierarchy over the built-in memberships plus those in the file at `path`, if any."""
+    hierarchy = ClassHierarchy(builtin)
+    if path:
+        for child, classes in load_class_hierarchy(path).items():
+            for parent in classes:
+                hierarchy.add(child, parent)
+    return hierarchy
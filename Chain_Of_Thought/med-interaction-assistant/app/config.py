@@ -6,11 +6,66 @@ class Settings(BaseModel):
     # OpenAI
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+    openai_base_url: str = os.getenv("OPENAI_BASE_URL", "")
+
+    # Async OpenAI client: per-call timeout and retries, and the size of the
+    # shared HTTP connection pool
+    openai_timeout_seconds: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30"))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+    openai_max_keepalive_connections: int = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+    # Upper bound on one /interactions request end to end (504 after that)
+    request_timeout_seconds: float = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "60"))
+
+    # Extra interaction rules (.csv / .json, comma-separated paths), loaded
+    # after the built-in INTERACTION_RULES
+    interaction_rule_files: str = os.getenv("INTERACTION_RULE_FILES", "")
+
+    # Extra drug / condition class memberships (.csv / .json) for class-level
+    # rules, added to ENTITY_CLASSES
+    class_hierarchy_file: str = os.getenv("CLASS_HIERARCHY_FILE", "")
+
+    # Extra alias -> canonical vocabularies (.csv / .json) for the
+    # normalisers, added to MED_NORMALIZATION / COMORBIDITY_NORMALIZATION
+    med_vocabulary_file: str = os.getenv("MED_VOCABULARY_FILE", "")
+    comorbidity_vocabulary_file: str = os.getenv("COMORBIDITY_VOCABULARY_FILE", "")
+
+    # Per-pair LLM explanation cache (memory LRU + SQLite file; empty path =
+    # memory only). Entries expire after the TTL (0 = never).
+    explanation_cache_enabled: bool = os.getenv("EXPLANATION_CACHE_ENABLED", "true").lower() == "true"
+    explanation_cache_path: str = os.getenv("EXPLANATION_CACHE_PATH", ".cache/explanations.sqlite3")
+    explanation_cache_max_items: int = int(os.getenv("EXPLANATION_CACHE_MAX_ITEMS", "10000"))
+    explanation_cache_ttl_seconds: float = float(os.getenv("EXPLANATION_CACHE_TTL_SECONDS", "604800"))
+
+    # /interactions/batch: largest accepted batch, end-to-end timeout, and
+    # how uncached pairs are sent to the LLM (pairs per call, calls in flight)
+    batch_max_patients: int = int(os.getenv("BATCH_MAX_PATIENTS", "500"))
+    batch_timeout_seconds: float = float(os.getenv("BATCH_TIMEOUT_SECONDS", "300"))
+    batch_pairs_per_call: int = int(os.getenv("BATCH_PAIRS_PER_CALL", "5"))
+    batch_llm_concurrency: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
 
     # Langfuse (SDK will use env vars, but we keep here for clarity/logging)
     langfuse_public_key: str = os.getenv("LANGFUSE_PUBLIC_KEY", "")
     langfuse_secret_key: str = os.getenv("LANGFUSE_SECRET_KEY", "")
     langfuse_base_url: str = os.getenv("LANGFUSE_BASE_URL", "https://cloud.langfuse.com")
 
+    # Langfuse volume controls: trace sampling (fraction of requests traced),
+    # per-field size cap (JSON chars, 0 = none) and redacted keys for span
+    # input/output/metadata (by default the patient's med and comorbidity
+    # lists and the LLM prompt and completion), the background export batch /
+    # queue sizes (a full queue drops spans), and the SDK's media scan
+    langfuse_tracing_enabled: bool = os.getenv("LANGFUSE_TRACING_ENABLED", "true").lower() == "true"
+    langfuse_sample_rate: float = float(os.getenv("LANGFUSE_SAMPLE_RATE", "1.0"))
+    langfuse_max_field_chars: int = int(os.getenv("LANGFUSE_MAX_FIELD_CHARS", "2000"))
+    langfuse_redact_keys: str = os.getenv(
+        "LANGFUSE_REDACT_KEYS",
+        "medications,comorbidities,normalized_meds,normalized_comorbidities,user_prompt,completion",
+    )
+    langfuse_flush_at: int = int(os.getenv("LANGFUSE_FLUSH_AT", "512"))
+    langfuse_flush_interval: float = float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "5"))
+    langfuse_max_queue_size: int = int(os.getenv("LANGFUSE_MAX_QUEUE_SIZE", "2048"))
+    langfuse_media_upload_enabled: bool = os.getenv("LANGFUSE_MEDIA_UPLOAD_ENABLED", "false").lower() == "true"
+
 
 settings = Settings()
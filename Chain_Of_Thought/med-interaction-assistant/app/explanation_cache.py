@@ -0,0 +1,177 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Keys per SELECT ... IN (...): below SQLite's default variable limit.
+_SQLITE_BATCH = 500
+
+
+def explanation_key(pair: Iterable[str], comorbidities: Iterable[str], model: str, prompt_version: str) -> str:
+    """
+    Cache key for one pair's explanation: the unordered normalised pair,
+    the patient comorbidities relevant to it (sorted), the model and the
+    prompt version.
+    """
+    payload = {
+        "pair": sorted(pair),
+        "comorbidities": sorted(set(comorbidities)),
+        "model": model,
+        "prompt": prompt_version,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """
+    Per-pair LLM explanations: an in-memory LRU in front of a SQLite file.
+
+    Lookups that miss memory fall through to SQLite and are promoted.
+    Entries older than `ttl_seconds` (0 = never) count as misses.
+    path="" keeps everything in memory only.
+
+    Lookups and writes take many keys at once: the SQLite misses of a
+    request are read with one query and its new entries written in one
+    transaction (WAL, synchronous=NORMAL, so one commit and no fsync per
+    entry). The async variants, used by the graph nodes, serve memory on
+    the event loop and run the SQLite part in a worker thread.
+    """
+
+    def __init__(self, path: str = "", max_items: int = 10_000, ttl_seconds: float = 0):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()  # memory LRU and counters
+        self._db_lock = threading.Lock()  # the SQLite connection
+        self._hits = {"memory": 0, "sqlite": 0}
+        self._misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS explanations "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _fresh(self, created: float) -> bool:
+        return not self.ttl_seconds or time.time() - created < self.ttl_seconds
+
+    def _remember(self, key: str, value: Dict[str, Any], created: float) -> None:
+        # Caller holds _lock.
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    # ---------- lookups ----------
+
+    def _get_memory(self, keys: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._memory.get(key)
+                if entry is not None and self._fresh(entry[1]):
+                    self._memory.move_to_end(key)
+                    found[key] = entry[0]
+                else:
+                    missing.append(key)
+            self._hits["memory"] += len(found)
+            if self._db is None:
+                self._misses += len(missing)
+        return found, missing
+
+    def _read_sqlite(self, keys: List[str]) -> Dict[str, tuple]:
+        rows: Dict[str, tuple] = {}
+        with self._db_lock:
+            for i in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[i:i + _SQLITE_BATCH]
+                rows.update(
+                    (key, (value, created))
+                    for key, value, created in self._db.execute(
+                        f"SELECT key, value, created FROM explanations WHERE key IN ({','.join('?' * len(batch))})",
+                        batch,
+                    )
+                )
+        return {key: (json.loads(value), created) for key, (value, created) in rows.items() if self._fresh(created)}
+
+    def _promote(self, keys: List[str], rows: Dict[str, tuple]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            for key, (value, created) in rows.items():
+                self._remember(key, value, created)
+            self._hits["sqlite"] += len(rows)
+            self._misses += len(keys) - len(rows)
+        return {key: value for key, (value, _) in rows.items()}
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached explanations for `keys` (missing keys are absent)."""
+        found, missing = self._get_memory(keys)
+        if missing and self._db is not None:
+            found.update(self._promote(missing, self._read_sqlite(missing)))
+        return found
+
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """get_many() with the SQLite query off the event loop."""
+        found, missing = self._get_memory(keys)
+        if missing and self._db is not None:
+            found.update(self._promote(missing, await asyncio.to_thread(self._read_sqlite, missing)))
+        return found
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([key]).get(key)
+
+    # ---------- writes ----------
+
+    def _set_memory(self, items: Dict[str, Dict[str, Any]]) -> float:
+        created = time.time()
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value, created)
+        return created
+
+    def _write_sqlite(self, items: Dict[str, Dict[str, Any]], created: float) -> None:
+        with self._db_lock:
+            with self._db:  # one transaction, one commit
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO explanations (key, value, created) VALUES (?, ?, ?)",
+                    [(key, json.dumps(value), created) for key, value in items.items()],
+                )
+
+    def set_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        if not items:
+            return
+        created = self._set_memory(items)
+        if self._db is not None:
+            self._write_sqlite(items, created)
+
+    async def aset_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """set_many() with the SQLite write off the event loop."""
+        if not items:
+            return
+        created = self._set_memory(items)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_sqlite, items, created)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.set_many({key: value})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._hits["memory"] + self._hits["sqlite"]
+            lookups = hits + self._misses
+            return {
+                "hits_memory": self._hits["memory"],
+                "hits_sqlite": self._hits["sqlite"],
+                "misses": self._misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "items_in_memory": len(self._memory),
+            }
@@ -1,7 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Tuple
+import asyncio
+import hashlib
 import json
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from langgraph.graph import StateGraph, END
 
 from .state import MedInteractionState
@@ -9,16 +12,55 @@ from .rules import (
     MED_NORMALIZATION,
     COMORBIDITY_NORMALIZATION,
     INTERACTION_RULES,
+    ENTITY_CLASSES,
 )
 from .config import settings
 from .observability import span_ctx, langfuse
+from .rule_index import build_rule_index, pair_key
+from .explanation_cache import ExplanationCache, explanation_key
+from .normalizer import build_normalizer
+from .class_hierarchy import build_class_hierarchy
+
+# One pooled HTTP client for every LLM call: requests reuse keep-alive
+# connections instead of opening one each, and the pool caps how many are
+# in flight against the provider.
+client = AsyncOpenAI(
+    api_key=settings.openai_api_key,
+    base_url=settings.openai_base_url or None,
+    timeout=settings.openai_timeout_seconds,
+    max_retries=settings.openai_max_retries,
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+        ),
+        timeout=settings.openai_timeout_seconds,
+    ),
+)
 
-client = OpenAI(api_key=settings.openai_api_key)
+# Built once at startup: normalize_input and find_interactions only do
+# in-memory lookups per request.
+med_normalizer = build_normalizer(MED_NORMALIZATION, settings.med_vocabulary_file, strip_doses=True)
+comorbidity_normalizer = build_normalizer(COMORBIDITY_NORMALIZATION, settings.comorbidity_vocabulary_file)
+rule_index = build_rule_index(
+    INTERACTION_RULES,
+    [p.strip() for p in settings.interaction_rule_files.split(",") if p.strip()],
+    build_class_hierarchy(ENTITY_CLASSES, settings.class_hierarchy_file),
+)
+explanation_cache = (
+    ExplanationCache(
+        settings.explanation_cache_path,
+        max_items=settings.explanation_cache_max_items,
+        ttl_seconds=settings.explanation_cache_ttl_seconds,
+    )
+    if settings.explanation_cache_enabled
+    else None
+)
 
 
 # ---------- Node: normalize_input ----------
 
-def normalize_input(state: MedInteractionState) -> MedInteractionState:
+async def normalize_input(state: MedInteractionState) -> MedInteractionState:
     with span_ctx(
         "normalize_input",
         input_data={
@@ -29,17 +71,8 @@ def normalize_input(state: MedInteractionState) -> MedInteractionState:
         meds = state.get("medications", []) or []
         comorbs = state.get("comorbidities", []) or []
 
-        normalized_meds: List[str] = []
-        for m in meds:
-            key = m.strip().lower()
-            norm = MED_NORMALIZATION.get(key, key)
-            normalized_meds.append(norm)
-
-        normalized_comorbs: List[str] = []
-        for c in comorbs:
-            key = c.strip().lower()
-            norm = COMORBIDITY_NORMALIZATION.get(key, key)
-            normalized_comorbs.append(norm)
+        normalized_meds: List[str] = med_normalizer.normalize_many(meds)
+        normalized_comorbs: List[str] = comorbidity_normalizer.normalize_many(comorbs)
 
         state["normalized_meds"] = normalized_meds
         state["normalized_comorbidities"] = normalized_comorbs
@@ -56,7 +89,7 @@ def normalize_input(state: MedInteractionState) -> MedInteractionState:
 
 # ---------- Node: find_interactions ----------
 
-def find_interactions(state: MedInteractionState) -> MedInteractionState:
+async def find_interactions(state: MedInteractionState) -> MedInteractionState:
     with span_ctx(
         "find_interactions",
         input_data={
@@ -64,28 +97,10 @@ def find_interactions(state: MedInteractionState) -> MedInteractionState:
             "normalized_comorbidities": state.get("normalized_comorbidities", []),
         },
     ) as span:
-        meds = set(state.get("normalized_meds", []) or [])
-        comorbs = set(state.get("normalized_comorbidities", []) or [])
-
-        candidates: List[Dict[str, Any]] = []
-
-        for rule in INTERACTION_RULES:
-            a = rule["drug_a"]
-            b = rule["drug_b"]
-
-            if (
-                (a in meds and b in meds)
-                or (a in meds and b in comorbs)
-                or (a in comorbs and b in meds)
-            ):
-                candidates.append(
-                    {
-                        "rule_id": rule["id"],
-                        "pair": (a, b),
-                        "base_severity": rule["base_severity"],
-                        "rule_notes": rule["notes"],
-                    }
-                )
+        meds = state.get("normalized_meds", []) or []
+        comorbs = state.get("normalized_comorbidities", []) or []
+
+        candidates: List[Dict[str, Any]] = rule_index.candidates(meds, comorbs)
 
         state["interaction_candidates"] = candidates
 
@@ -96,22 +111,17 @@ def find_interactions(state: MedInteractionState) -> MedInteractionState:
 
 # ---------- Helper: LLM call with generation observation ----------
 
-def _call_llm_for_explanations(
-    candidates: List[Dict[str, Any]],
-    original_meds: List[str],
-    comorbidities: List[str],
-) -> List[Dict[str, Any]]:
-    system_prompt = (
-        "You are a clinical pharmacist assistant that explains potential medication "
-        "interactions for clinicians. You are cautious, concise, and always emphasize "
-        "that your output is not a substitute for clinical judgment."
-    )
+SYSTEM_PROMPT = (
+    "You are a clinical pharmacist assistant that explains potential medication "
+    "interactions for clinicians. You are cautious, concise, and always emphasize "
+    "that your output is not a substitute for clinical judgment."
+)
 
-    user_prompt = f"""
-You are given:
-- A patient's medication list: {original_meds}
-- Comorbidities: {comorbidities}
-- Interaction candidates (from a simple rules engine): {candidates}
+USER_PROMPT_TEMPLATE = """
+You are given interaction candidates from a simple rules engine. Each has the
+pair, the rule's base severity and notes, and the patient's comorbidities
+relevant to that pair:
+{candidates}
 
 Think step-by-step in your own mind, then ONLY output valid JSON with this schema:
 
@@ -133,7 +143,9 @@ Think step-by-step in your own mind, then ONLY output valid JSON with this schem
 }}
 
 Rules:
-1. Start from the provided candidates, but you may add or drop a pair if clearly wrong.
+1. Return exactly one entry per candidate, with drug_a and drug_b copied from
+   its pair. If a candidate is clearly wrong, say so in notes_for_clinician and
+   use severity "unknown".
 2. In mechanism, describe enzyme systems or pharmacodynamic effects if known.
 3. In clinical_consequences, focus on real-world outcomes.
 4. In monitoring_and_mitigation, give specific steps.
@@ -143,6 +155,27 @@ Rules:
    "Use this as a decision-support aid only, not a final recommendation.".
 """
 
+# Part of every explanation cache key: editing the prompt invalidates entries.
+PROMPT_VERSION = hashlib.sha256((SYSTEM_PROMPT + USER_PROMPT_TEMPLATE).encode("utf-8")).hexdigest()[:16]
+
+
+async def _call_llm_for_explanations(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    user_prompt = USER_PROMPT_TEMPLATE.format(
+        candidates=json.dumps(
+            [
+                {
+                    "drug_a": c["pair"][0],
+                    "drug_b": c["pair"][1],
+                    "base_severity": c["base_severity"],
+                    "rule_notes": c["rule_notes"],
+                    "relevant_comorbidities": c["relevant_comorbidities"],
+                }
+                for c in candidates
+            ],
+            indent=2,
+        )
+    )
+
     # Generation-type observation (specialized for LLM calls) 
     with langfuse.start_as_current_observation(
         name="interaction_reasoning_llm",
@@ -150,18 +183,18 @@ Rules:
     ) as gen:
         gen.update(
             input={
-                "system": system_prompt,
-                "user": user_prompt,
+                "system": SYSTEM_PROMPT,
+                "user_prompt": user_prompt,
             },
             model=settings.openai_model,
             metadata={"component": "reason_about_interactions"},
         )
 
-        resp = client.chat.completions.create(
+        resp = await client.chat.completions.create(
             model=settings.openai_model,
             temperature=0.2,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
             response_format={"type": "json_object"},
@@ -178,17 +211,205 @@ Rules:
             }
 
         gen.update(
-            output=content,
+            output={"completion": content},
             usage_details=usage_details,
         )
 
-    parsed = json.loads(content)
-    return parsed.get("interactions", [])
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError as e:
+            gen.update(level="ERROR", status_message="invalid JSON")
+            raise ValueError(f"LLM returned invalid JSON: {e}") from e
+        interactions = parsed.get("interactions", []) if isinstance(parsed, dict) else None
+        if not isinstance(interactions, list):
+            gen.update(level="ERROR", status_message="no interactions list")
+            raise ValueError("LLM response has no interactions list")
+
+    return [inter for inter in interactions if isinstance(inter, dict)]
+
+
+def _explanation_pair(inter: Dict[str, Any]) -> tuple:
+    pair = inter.get("pair", {}) or {}
+    return pair_key(
+        str(pair.get("drug_a", "")).strip().lower(),
+        str(pair.get("drug_b", "")).strip().lower(),
+    )
+
+
+Keyed = Dict[str, Tuple[Dict[str, Any], List[str]]]
+
+
+def _keyed_candidates(candidates: List[Dict[str, Any]], comorbidities: List[str]) -> Keyed:
+    # cache key -> (candidate, relevant comorbidities); several rules for
+    # the same pair are explained once.
+    keyed: Keyed = {}
+    for c in candidates:
+        relevant = rule_index.relevant_comorbidities(c["pair"], comorbidities)
+        key = explanation_key(c["pair"], relevant, settings.openai_model, PROMPT_VERSION)
+        keyed.setdefault(key, (c, relevant))
+    return keyed
+
+
+async def _cached_explanations(keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    if explanation_cache is None:
+        return {}
+    return await explanation_cache.aget_many(keys)
+
+
+async def _cache_explanations(explained: Dict[str, Dict[str, Any]]) -> None:
+    if explanation_cache is not None:
+        await explanation_cache.aset_many(explained)
+
+
+async def _explain_misses(misses: Keyed) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    One LLM call for `misses` (their pairs must be distinct). Returns the
+    explanations by cache key and the entries the LLM added for pairs it
+    was not asked about. Callers cache the explanations.
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    extras: List[Dict[str, Any]] = []
+    by_pair = {pair_key(*c["pair"]): key for key, (c, _) in misses.items()}
+    for inter in await _call_llm_for_explanations(
+        [dict(c, relevant_comorbidities=relevant) for c, relevant in misses.values()]
+    ):
+        key = by_pair.get(_explanation_pair(inter))
+        if key is None or key in found:
+            extras.append(inter)
+            continue
+        found[key] = inter
+    return found, extras
+
+
+async def explain_candidates(
+    candidates: List[Dict[str, Any]],
+    comorbidities: List[str],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    One explanation per candidate pair, in candidate order, plus the number
+    served from explanation_cache. Only pairs missing from the cache go to
+    the LLM (in one call); what it returns for them is cached in one write.
+    Entries the LLM adds for pairs it was not asked about are returned but
+    not cached.
+    """
+    keyed = _keyed_candidates(candidates, comorbidities)
+    found = await _cached_explanations(keyed)
+    hits = len(found)
+
+    misses = {key: entry for key, entry in keyed.items() if key not in found}
+    extras: List[Dict[str, Any]] = []
+    if misses:
+        explained, extras = await _explain_misses(misses)
+        found.update(explained)
+        await _cache_explanations(explained)
+
+    return [found[key] for key in keyed if key in found] + extras, hits
+
+
+def _fallback_explanation(candidate: Dict[str, Any], error: str) -> Dict[str, Any]:
+    # Rule-only entry for a candidate whose LLM call failed: the pair stays
+    # flagged with the rule's severity and notes. Never cached.
+    return {
+        "pair": {"drug_a": candidate["pair"][0], "drug_b": candidate["pair"][1]},
+        "mechanism": candidate["rule_notes"],
+        "clinical_consequences": None,
+        "severity": candidate["base_severity"],
+        "monitoring_and_mitigation": None,
+        "safer_alternatives": None,
+        "notes_for_clinician": (
+            "Use this as a decision-support aid only, not a final recommendation. "
+            "The LLM explanation is unavailable; severity and notes are the rule's."
+        ),
+        "explanation_error": error,
+    }
+
+
+def _chunks(misses: Keyed, size: int) -> List[Keyed]:
+    # Split into calls of at most `size` candidates whose pairs are distinct:
+    # the same pair in two comorbidity contexts is two explanations, and the
+    # LLM's answers are matched back by pair.
+    chunks: List[Keyed] = []
+    pairs: List[set] = []
+    for key, entry in misses.items():
+        pair = pair_key(*entry[0]["pair"])
+        for chunk, seen in zip(chunks, pairs):
+            if len(chunk) < size and pair not in seen:
+                break
+        else:
+            chunk, seen = {}, set()
+            chunks.append(chunk)
+            pairs.append(seen)
+        chunk[key] = entry
+        seen.add(pair)
+    return chunks
+
+
+async def explain_many(
+    patients: List[Tuple[List[Dict[str, Any]], List[str]]],
+    pairs_per_call: int = 5,
+    concurrency: int = 8,
+) -> Tuple[List[List[Dict[str, Any]]], Dict[str, int]]:
+    """
+    explain_candidates for many (candidates, comorbidities) at once.
+
+    The (pair, relevant comorbidities) cache keys of all patients are
+    collected first, so a pair seen in the same context on several patients
+    is looked up and explained once. Uncached ones go to the LLM in calls of
+    up to `pairs_per_call`, at most `concurrency` calls in flight. Each
+    patient then gets its explanations in candidate order. Entries the LLM
+    adds unasked belong to no patient and are dropped.
+
+    A failed call (timeout, 429 after retries, unparseable output) does not
+    fail the batch: its candidates get _fallback_explanation() entries,
+    carrying `explanation_error`, and are not cached. `llm_errors` in the
+    stats counts the failed calls.
+    """
+    per_patient = [_keyed_candidates(candidates, comorbs) for candidates, comorbs in patients]
+    unique: Keyed = {}
+    for keyed in per_patient:
+        for key, entry in keyed.items():
+            unique.setdefault(key, entry)
+
+    found = await _cached_explanations(unique)
+    hits = len(found)
+    misses = {key: entry for key, entry in unique.items() if key not in found}
+    chunks = _chunks(misses, max(1, pairs_per_call))
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def explain(chunk: Keyed):
+        async with semaphore:
+            return await _explain_misses(chunk)
+
+    explained: Dict[str, Dict[str, Any]] = {}
+    failed: Dict[str, Dict[str, Any]] = {}
+    errors = 0
+    results = await asyncio.gather(*(explain(chunk) for chunk in chunks), return_exceptions=True)
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result  # cancellation: the batch timed out
+        if isinstance(result, Exception):
+            errors += 1
+            error = f"{type(result).__name__}: {result}"
+            failed.update((key, _fallback_explanation(c, error)) for key, (c, _) in chunk.items())
+            continue
+        explained.update(result[0])
+    found.update(explained)
+    await _cache_explanations(explained)
+    found.update(failed)
+
+    stats = {
+        "unique_pairs": len(unique),
+        "explanation_cache_hits": hits,
+        "llm_calls": len(chunks),
+        "llm_errors": errors,
+    }
+    return [[found[key] for key in keyed if key in found] for keyed in per_patient], stats
 
 
 # ---------- Node: reason_about_interactions ----------
 
-def reason_about_interactions(state: MedInteractionState) -> MedInteractionState:
+async def reason_about_interactions(state: MedInteractionState) -> MedInteractionState:
     with span_ctx(
         "reason_about_interactions",
         input_data={
@@ -201,62 +422,74 @@ def reason_about_interactions(state: MedInteractionState) -> MedInteractionState
             span.update(output={"interaction_explanations": []})
             return state
 
-        original_meds = state.get("medications", []) or []
-        comorbidities = state.get("comorbidities", []) or []
-
-        explanations = _call_llm_for_explanations(
+        explanations, cache_hits = await explain_candidates(
             candidates=candidates,
-            original_meds=original_meds,
-            comorbidities=comorbidities,
+            comorbidities=state.get("normalized_comorbidities", []) or [],
         )
         state["interaction_explanations"] = explanations
 
-        span.update(output={"interaction_explanations": explanations})
+        span.update(
+            output={"interaction_explanations": explanations},
+            metadata={"explanation_cache_hits": cache_hits, "candidates": len(candidates)},
+        )
 
     return state
 
 
 # ---------- Node: format_result ----------
 
-def format_result(state: MedInteractionState) -> MedInteractionState:
+def build_result(
+    medications: List[str],
+    comorbidities: List[str],
+    interactions: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """The /interactions response body for one patient."""
+    simple_list = []
+
+    for inter in interactions:
+        pair = inter.get("pair", {}) or {}
+        drug_a = pair.get("drug_a", "?")
+        drug_b = pair.get("drug_b", "?")
+
+        label = f"{drug_a} + {drug_b}"
+        simple_list.append(
+            {
+                "label": label,
+                "severity": inter.get("severity"),
+                "mechanism": inter.get("mechanism"),
+                "clinical_consequences": inter.get("clinical_consequences"),
+                "monitoring_and_mitigation": inter.get(
+                    "monitoring_and_mitigation"
+                ),
+            }
+        )
+
+    return {
+        "medications": medications,
+        "comorbidities": comorbidities,
+        "count_flagged_interactions": len(interactions),
+        "interactions": interactions,
+        "summary_list": simple_list,
+        "disclaimer": (
+            "Prototype decision-support tool. Not complete, not validated, "
+            "and not a substitute for a clinical pharmacist or clinician judgment."
+        ),
+    }
+
+
+async def format_result(state: MedInteractionState) -> MedInteractionState:
+    # Input is the reason_about_interactions output; only its size is logged.
     with span_ctx(
         "format_result",
         input_data={
-            "interaction_explanations": state.get("interaction_explanations", []),
+            "interaction_explanations": len(state.get("interaction_explanations", []) or []),
         },
     ) as span:
-        interactions = state.get("interaction_explanations", []) or []
-        simple_list = []
-
-        for inter in interactions:
-            pair = inter.get("pair", {}) or {}
-            drug_a = pair.get("drug_a", "?")
-            drug_b = pair.get("drug_b", "?")
-
-            label = f"{drug_a} + {drug_b}"
-            simple_list.append(
-                {
-                    "label": label,
-                    "severity": inter.get("severity"),
-                    "mechanism": inter.get("mechanism"),
-                    "clinical_consequences": inter.get("clinical_consequences"),
-                    "monitoring_and_mitigation": inter.get(
-                        "monitoring_and_mitigation"
-                    ),
-                }
-            )
-
-        state["result"] = {
-            "medications": state.get("medications", []),
-            "comorbidities": state.get("comorbidities", []),
-            "count_flagged_interactions": len(interactions),
-            "interactions": interactions,
-            "summary_list": simple_list,
-            "disclaimer": (
-                "Prototype decision-support tool. Not complete, not validated, "
-                "and not a substitute for a clinical pharmacist or clinician judgment."
-            ),
-        }
+        state["result"] = build_result(
+            state.get("medications", []),
+            state.get("comorbidities", []),
+            state.get("interaction_explanations", []) or [],
+        )
 
         span.update(output={"result": state["result"]})
 
@@ -296,4 +529,5 @@ def build_graph():
     return workflow.compile()
 
 
+# Nodes are coroutines: run the graph with `await graph.ainvoke(...)`.
 graph = build_graph()
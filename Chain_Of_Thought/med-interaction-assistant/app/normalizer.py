@@ -0,0 +1,250 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+import csv
+import json
+import os
+import re
+
+# Dose strengths ("5mg", "500 mg", "10 mg/5 ml", "0.5%") and the form,
+# route and frequency words that follow drug names on med lists.
+_DOSE = re.compile(
+    r"\b\d+(?:[.,]\d+)?\s*(?:mg|mcg|µg|ug|g|ml|iu|units?|meq|mmol|%)"
+    r"(?:\s*/\s*(?:\d+(?:[.,]\d+)?\s*)?(?:ml|l|h|hr|day|dose|tab))?(?!\w)"
+)
+_PUNCT = re.compile(r"[()\[\],;:*\"']")
+_FORM_WORDS = frozenset(
+    """
+    tab tabs tablet tablets cap caps capsule capsules oral po iv im sc sq subcut inj injection
+    solution soln susp suspension syrup cream ointment gel patch inhaler drops spray
+    er xr sr xl cr dr ec la od bd bid tid qid qd qds tds daily nocte mane prn stat
+    """.split()
+)
+# Words that may surround a name without changing what it refers to: the
+# form/route/frequency words above, salts, and history markers. A phrase
+# match is only accepted when every other token of the input is one of
+# these ("warfarin sodium", "h/o heart failure"), never for qualifiers
+# such as "gestational diabetes" or "ckd stage 4".
+_FILLER_WORDS = _FORM_WORDS | frozenset(
+    """
+    once twice times a day per week weekly morning evening night bedtime at with food meals as needed
+    sodium potassium calcium magnesium hydrochloride hcl maleate mesylate sulfate sulphate tartrate
+    succinate citrate besylate acetate phosphate fumarate bromide chloride hydrobromide
+    h/o hx pmh known history of
+    """.split()
+)
+# Leading words that negate the rest of the entry ("no heart failure",
+# "not on warfarin", "stopped amiodarone"): such entries are not matched.
+_NEGATIONS = frozenset(
+    "no not nil non denies denied without never negative stopped discontinued ceased off".split()
+)
+
+
+def clean_text(text: str, strip_doses: bool = False) -> str:
+    """Lower-case, drop punctuation, collapse whitespace; optionally drop doses and forms."""
+    text = _PUNCT.sub(" ", text.lower())
+    if not strip_doses:
+        return " ".join(text.split())
+    text = _DOSE.sub(" ", text)
+    return " ".join(t for t in text.split() if t not in _FORM_WORDS and not t.replace(".", "").isdigit())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or limit + 1 once it is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Typos are local: only the part between the common prefix and suffix
+    # needs the DP.
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return min(max(len(a), len(b)), limit + 1)
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            cost = 0 if ca == cb else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _deletes(word: str) -> List[str]:
+    return [word[:i] + word[i + 1:] for i in range(len(word))]
+
+
+class Normalizer:
+    """
+    Maps free-text medication / condition names to canonical names.
+
+    Lookup order, first hit wins:
+    1. exact alias after clean_text() (dose, form and frequency removed
+       for medications), e.g. "Coumadin 5mg tab" -> warfarin
+    2. longest alias phrase found in the text (token trie), if every
+       other token is filler (_FILLER_WORDS), e.g. "warfarin sodium" ->
+       warfarin, "h/o chronic kidney disease stage 3" -> ckd_stage_3, but
+       not "gestational diabetes" or "ckd stage 4"
+    3. fuzzy match of the one non-filler word, e.g. "amiodarnoe" ->
+       amiodarone. Words containing digits are never fuzzy-matched
+       ("stage 5" is not a typo of "stage 3"), nor is multi-word text as a
+       whole. A match must keep the first letter and the length within
+       one character: prefixes and suffixes make different drugs
+       (escitalopram / citalopram, prednisolone / prednisone). 1 edit for
+       words shorter than 8 characters, up to max_distance for longer
+       ones. Every alias is indexed under itself and each one-character
+       deletion of it (symmetric deletion). A query probes itself and its one-character
+       deletions, and for long words its two-character deletions. That
+       finds every 1-edit match and the 2-edit matches that those
+       deletions line up (insertions, shifted or adjacent changes),
+       verified with edit_distance(). The cost is a few dozen dict probes,
+       not a scan of the vocabulary. A deletion index of depth 2 would
+       also catch two separate substitutions, at ~50x the memory.
+
+    Entries starting with a negation ("no heart failure", "not on
+    warfarin") are never matched. Unmatched text is returned cleaned with
+    match "none" rather than a guess. Results are memoised per input
+    string (`cache_size`).
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, str],
+        strip_doses: bool = False,
+        max_distance: int = 2,
+        min_fuzzy_length: int = 5,
+        cache_size: int = 65536,
+    ):
+        self.strip_doses = strip_doses
+        self.max_distance = max_distance
+        self.min_fuzzy_length = min_fuzzy_length
+        self._exact: Dict[str, str] = {}
+        self._trie: Dict[str, dict] = {}
+        self._deletes: Dict[str, List[str]] = {}
+        for alias, canonical in vocabulary.items():
+            self.add(alias, canonical)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def add(self, alias: str, canonical: str) -> None:
+        alias = clean_text(alias)
+        if not alias or alias in self._exact:
+            return
+        self._exact[alias] = canonical
+        self._exact.setdefault(canonical, canonical)
+
+        node = self._trie
+        for token in alias.split():
+            node = node.setdefault(token, {})
+        node[""] = canonical
+
+        if len(alias) >= self.min_fuzzy_length:
+            for key in {alias, *_deletes(alias)}:
+                self._deletes.setdefault(key, []).append(alias)
+
+    # ---------- lookups ----------
+
+    def _phrase(self, tokens: List[str]) -> Optional[str]:
+        # Leftmost-longest alias phrase whose surrounding tokens are filler.
+        for start in range(len(tokens)):
+            if start and tokens[start - 1] not in _FILLER_WORDS:
+                return None
+            node, found, end = self._trie, None, start
+            for i, token in enumerate(tokens[start:], start=start + 1):
+                node = node.get(token)
+                if node is None:
+                    break
+                if "" in node:
+                    found, end = node[""], i
+            if found is not None and all(t in _FILLER_WORDS for t in tokens[end:]):
+                return found
+        return None
+
+    def _closest(self, word: str, keys: Iterable[str], limit: int, seen: set) -> Tuple[int, str]:
+        best: Tuple[int, str] = (limit + 1, "")
+        for key in keys:
+            for alias in self._deletes.get(key, ()):
+                if alias in seen:
+                    continue
+                seen.add(alias)
+                if alias[0] != word[0] or abs(len(alias) - len(word)) > 1:
+                    continue
+                distance = edit_distance(word, alias, limit)
+                if (distance, alias) < best:
+                    best = (distance, alias)
+        return best
+
+    def _fuzzy(self, word: str) -> Optional[str]:
+        if len(word) < self.min_fuzzy_length or any(c.isdigit() for c in word):
+            return None
+        limit = 1 if len(word) < 8 else self.max_distance
+        seen: set = set()
+        first = _deletes(word)
+        best = self._closest(word, [word] + first, limit, seen)
+        if best[0] > 1 and limit > 1:
+            second = {d for one in first for d in _deletes(one)}
+            best = min(best, self._closest(word, second, limit, seen))
+        return self._exact[best[1]] if best[0] <= limit else None
+
+    def lookup(self, text: str) -> Tuple[str, str]:
+        """(canonical name, how it matched: exact | phrase | fuzzy | none)."""
+        cleaned = clean_text(text, self.strip_doses)
+        found = self._exact.get(cleaned)
+        if found is not None:
+            return found, "exact"
+        tokens = cleaned.split()
+        if not tokens or tokens[0] in _NEGATIONS:
+            return cleaned, "none"
+        found = self._phrase(tokens)
+        if found is not None:
+            return found, "phrase"
+        words = [t for t in tokens if t not in _FILLER_WORDS]
+        if len(words) == 1:
+            found = self._fuzzy(words[0])
+            if found is not None:
+                return found, "fuzzy"
+        return cleaned, "none"
+
+    def _normalize(self, text: str) -> str:
+        return self.lookup(text)[0]
+
+    def normalize_many(self, texts: Iterable[str]) -> List[str]:
+        return [self.normalize(t) for t in texts]
+
+
+# ---------- Vocabulary files ----------
+
+def load_vocabulary(path: str) -> Dict[str, str]:
+    """
+    Read an alias -> canonical name vocabulary from a .csv file (header
+    row with alias, canonical) or a .json object {alias: canonical}.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            return {row["alias"]: row["canonical"] for row in csv.DictReader(f) if row.get("alias")}
+    if ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            return dict(json.load(f))
+    raise ValueError(f"{path}: unsupported vocabulary file type {ext!r} (use .csv or .json)")
+
+
+def build_normalizer(builtin: Dict[str, str], path: str = "", **kwargs) -> Normalizer:
+    """Normalizer over the built-in aliases plus the vocabulary file at `path`, if any."""
+    vocabulary = dict(builtin)
+    if path:
+        vocabulary.update(load_vocabulary(path))
+    return Normalizer(vocabulary, **kwargs)
@@ -1,10 +1,113 @@
 from typing import Any, Dict, Optional
 from contextlib import contextmanager
+import json
+import os
+import re
 
-from langfuse import get_client
+from langfuse import Langfuse
 
-# Singleton Langfuse client (configured via env vars)
-langfuse = get_client()
+from .config import settings
+
+REDACTED = "[redacted]"
+
+_REDACT_KEYS = frozenset(k.strip().lower() for k in settings.langfuse_redact_keys.split(",") if k.strip())
+# Finds a redacted key in serialised JSON, so only payloads that contain
+# one are walked.
+_REDACT_KEY_JSON = (
+    re.compile("|".join(f'"{re.escape(k)}":' for k in sorted(_REDACT_KEYS)), re.IGNORECASE)
+    if _REDACT_KEYS
+    else None
+)
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: REDACTED if str(k).lower() in _REDACT_KEYS else _redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _cap_field(value: Any) -> Any:
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    limit = settings.langfuse_max_field_chars
+    text = value if isinstance(value, str) else json.dumps(value, default=str, ensure_ascii=False)
+    if _REDACT_KEY_JSON is not None and not isinstance(value, str) and _REDACT_KEY_JSON.search(text):
+        value = _redact(value)
+        text = json.dumps(value, default=str, ensure_ascii=False)
+    if not limit or len(text) <= limit:
+        return value
+    return f"{text[:limit]}... [{len(text) - limit} chars truncated]"
+
+
+def mask_payload(*, data: Any, **kwargs: Any) -> Any:
+    """
+    Langfuse mask hook, applied to every input, output and metadata before
+    the SDK serialises it onto a span.
+
+    Each field (each top-level key of a dict payload) is JSON-encoded once.
+    Values of keys in LANGFUSE_REDACT_KEYS are replaced at any depth. A
+    field longer than LANGFUSE_MAX_FIELD_CHARS is sent as its truncated JSON
+    text, so the SDK's serialiser only ever walks small values.
+    """
+    if not settings.langfuse_max_field_chars and _REDACT_KEY_JSON is None:
+        return data
+    if isinstance(data, dict):
+        return {
+            k: REDACTED if str(k).lower() in _REDACT_KEYS else _cap_field(v)
+            for k, v in data.items()
+        }
+    return _cap_field(data)
+
+
+@contextmanager
+def _sdk_environ(values: Dict[str, str]):
+    # The SDK reads these only from the environment, while the client is
+    # constructed. Set them for that call only and restore the previous
+    # values afterwards.
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def build_langfuse() -> Langfuse:
+    """
+    The Langfuse client, configured from settings.
+
+    Spans are exported by the SDK's OpenTelemetry batch processor on a
+    background thread, flush_at spans at a time or every flush_interval
+    seconds. Its queue holds langfuse_max_queue_size spans; when the
+    exporter falls behind, new spans are dropped rather than blocking
+    requests. Spans here carry text only, so the SDK's media scan (which
+    walks the full payload before the mask runs) is off by default.
+    Unsampled requests get non-recording spans: their payloads are never
+    masked, serialised or exported.
+    """
+    with _sdk_environ(
+        {
+            "OTEL_BSP_MAX_QUEUE_SIZE": str(settings.langfuse_max_queue_size),
+            "LANGFUSE_MEDIA_UPLOAD_ENABLED": str(settings.langfuse_media_upload_enabled).lower(),
+        }
+    ):
+        return Langfuse(
+            tracing_enabled=settings.langfuse_tracing_enabled,
+            sample_rate=settings.langfuse_sample_rate,
+            mask=mask_payload,
+            flush_at=settings.langfuse_flush_at,
+            flush_interval=settings.langfuse_flush_interval,
+        )
+
+
+# Singleton Langfuse client (keys and host from env vars).
+langfuse = build_langfuse()
 
 
 @contextmanager
@@ -24,7 +127,7 @@ def span_ctx(
     """
     with langfuse.start_as_current_observation(
         name=name,
-        as_type=as_type,  # "span", "generation", "tool", "chain", etc. 
+        as_type=as_type,  # "span", "generation", "tool", "chain", etc.
     ) as span:
         if input_data is not None:
             span.update(input=input_data)
@@ -0,0 +1,213 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import csv
+import json
+import os
+
+from .class_hierarchy import ClassHierarchy
+
+REQUIRED_FIELDS = ("id", "drug_a", "drug_b", "base_severity")
+
+PairKey = Tuple[str, str]
+
+
+def pair_key(a: str, b: str) -> PairKey:
+    """Unordered (entity_a, entity_b) key: the same for (a, b) and (b, a)."""
+    return (a, b) if a <= b else (b, a)
+
+
+# Compiled form of a name that is no rule term and has no classes.
+_NO_TERMS: Tuple[int, Tuple[int, ...], int] = (0, (), 0)
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class RuleIndex:
+    """
+    Interaction rules indexed by their unordered pair of terms. A term is
+    an entity (ibuprofen, ckd_stage_3) or, with a ClassHierarchy, a class
+    (nsaid, ckd, qt_prolonger).
+
+    Every term used by a rule gets a bit. An entity compiles, once, to the
+    bitmask of the terms it belongs to (itself and its ancestor classes),
+    and each term keeps a mask of the terms it has rules with. Matching a
+    patient ORs the masks of their meds and comorbidities, then for each
+    term a med holds, `partners & patient_mask` gives the matching rule
+    pairs directly. The cost depends on the patient's terms and the rules
+    that actually fire, not on how many rules or classes are loaded.
+
+    Compiled entities are memoised only for names that are rule terms or
+    in the hierarchy. Any other name belongs to no term, so it compiles to
+    empty masks without a memo entry, and the memo stays bounded by the
+    loaded rules and classes whatever names requests send.
+
+    Rules come back in load order, the same order the linear scan over
+    INTERACTION_RULES produced. A class rule yields one candidate per
+    concrete patient pair it covers (three QT prolongers -> three pairs).
+    """
+
+    def __init__(self, rules: Iterable[Dict[str, Any]] = (), hierarchy: Optional[ClassHierarchy] = None):
+        self.hierarchy = hierarchy or ClassHierarchy()
+        self._by_pair: Dict[PairKey, List[Tuple[int, Dict[str, Any]]]] = {}
+        self._bit: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._partners: List[int] = []
+        # entity -> (member mask, member term bits, mask of their partners)
+        self._entities: Dict[str, Tuple[int, Tuple[int, ...], int]] = {}
+        self._count = 0
+        self.extend(rules)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _term(self, name: str) -> int:
+        bit = self._bit.get(name)
+        if bit is None:
+            bit = self._bit[name] = len(self._terms)
+            self._terms.append(name)
+            self._partners.append(0)
+        return bit
+
+    def add(self, rule: Dict[str, Any]) -> None:
+        a, b = self._term(rule["drug_a"]), self._term(rule["drug_b"])
+        self._by_pair.setdefault(pair_key(rule["drug_a"], rule["drug_b"]), []).append((self._count, rule))
+        self._partners[a] |= 1 << b
+        self._partners[b] |= 1 << a
+        self._entities.clear()
+        self._count += 1
+
+    def extend(self, rules: Iterable[Dict[str, Any]]) -> None:
+        for rule in rules:
+            self.add(rule)
+
+    def _entity(self, name: str) -> Tuple[int, Tuple[int, ...], int]:
+        compiled = self._entities.get(name)
+        if compiled is None:
+            if name not in self._bit and name not in self.hierarchy:
+                return _NO_TERMS
+            bits = tuple(self._bit[t] for t in self.hierarchy.ancestors(name) if t in self._bit)
+            mask = partners = 0
+            for bit in bits:
+                mask |= 1 << bit
+                partners |= self._partners[bit]
+            compiled = self._entities[name] = (mask, bits, partners)
+        return compiled
+
+    def _match(self, meds: Iterable[str], comorbidities: Iterable[str]) -> List[Tuple[int, Dict[str, Any], Set[PairKey]]]:
+        # (load position, rule, concrete entity pairs it covers), in load order.
+        meds = sorted(set(meds))
+        comorbs = sorted(set(comorbidities))
+
+        holders: Dict[int, List[str]] = {}  # term bit -> meds in it
+        comorb_holders: Dict[int, List[str]] = {}
+        med_mask = comorb_mask = 0
+        for m in meds:
+            mask, bits, _ = self._entity(m)
+            med_mask |= mask
+            for bit in bits:
+                holders.setdefault(bit, []).append(m)
+        for c in comorbs:
+            mask, bits, _ = self._entity(c)
+            comorb_mask |= mask
+            for bit in bits:
+                comorb_holders.setdefault(bit, []).append(c)
+
+        found: Dict[int, Tuple[Dict[str, Any], Set[PairKey]]] = {}
+        for a, side_a in holders.items():
+            partners = self._partners[a]
+            # med+med term pairs once, from their lower bit; med+comorbidity
+            # from the med side.
+            for b in _bits(partners & med_mask & ~((1 << a) - 1) | partners & comorb_mask):
+                pairs = {pair_key(x, y) for x in side_a for y in holders.get(b, ()) if x != y}
+                if b in comorb_holders:
+                    pairs.update(pair_key(x, y) for x in side_a for y in comorb_holders[b] if x != y)
+                if not pairs:
+                    continue
+                for position, rule in self._by_pair[pair_key(self._terms[a], self._terms[b])]:
+                    found.setdefault(position, (rule, set()))[1].update(pairs)
+        return [(position, rule, pairs) for position, (rule, pairs) in sorted(found.items())]
+
+    def matching_rules(self, meds: Iterable[str], comorbidities: Iterable[str]) -> List[Dict[str, Any]]:
+        """Rules whose pair is two of `meds`, or one of `meds` and one of `comorbidities`."""
+        return [rule for _, rule, _ in self._match(meds, comorbidities)]
+
+    def _oriented(self, rule: Dict[str, Any], pair: PairKey) -> Tuple[str, str]:
+        # The entity in the rule's drug_a term first, as the rule reads.
+        x, y = pair
+        in_a = 1 << self._bit[rule["drug_a"]]
+        if not self._entity(x)[0] & in_a and self._entity(y)[0] & in_a:
+            return (y, x)
+        return (x, y)
+
+    def relevant_comorbidities(self, pair: Sequence[str], comorbidities: Iterable[str]) -> List[str]:
+        """Those of `comorbidities` that some rule pairs with either entity of `pair` (or its classes)."""
+        partners = self._entity(pair[0])[2] | self._entity(pair[1])[2]
+        return sorted(c for c in set(comorbidities) if self._entity(c)[0] & partners or c in pair)
+
+    def candidates(self, meds: Iterable[str], comorbidities: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Interaction candidates in the shape find_interactions returns them:
+        `pair` is the patient's two entities, `rule_pair` the rule's terms.
+        """
+        return [
+            {
+                "rule_id": rule["id"],
+                "pair": self._oriented(rule, pair),
+                "rule_pair": (rule["drug_a"], rule["drug_b"]),
+                "base_severity": rule["base_severity"],
+                "rule_notes": rule["notes"],
+            }
+            for _, rule, pairs in self._match(meds, comorbidities)
+            for pair in sorted(pairs)
+        ]
+
+
+# ---------- Loading rule files ----------
+
+def _check(rule: Dict[str, Any], where: str) -> Dict[str, Any]:
+    missing = [f for f in REQUIRED_FIELDS if not rule.get(f)]
+    if missing:
+        raise ValueError(f"{where}: rule is missing {', '.join(missing)}")
+    rule = dict(rule)
+    rule["drug_a"] = rule["drug_a"].strip().lower()
+    rule["drug_b"] = rule["drug_b"].strip().lower()
+    rule["notes"] = rule.get("notes") or ""
+    return rule
+
+
+def load_rules(path: str) -> List[Dict[str, Any]]:
+    """
+    Read interaction rules from a .csv or .json file.
+
+    CSV needs a header row with id, drug_a, drug_b, base_severity and
+    (optionally) notes.
+    JSON is a list of rule objects, or {"rules": [...]}. Extra fields are
+    kept on the rule.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            return [_check(row, f"{path}:{i}") for i, row in enumerate(csv.DictReader(f), start=2)]
+    if ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("rules", [])
+        return [_check(rule, f"{path}[{i}]") for i, rule in enumerate(data)]
+    raise ValueError(f"{path}: unsupported rule file type {ext!r} (use .csv or .json)")
+
+
+def build_rule_index(
+    builtin: Sequence[Dict[str, Any]],
+    paths: Iterable[str] = (),
+    hierarchy: Optional[ClassHierarchy] = None,
+) -> RuleIndex:
+    """Index the built-in rules plus every rule file in `paths`, in that order."""
+    index = RuleIndex(builtin, hierarchy)
+    for path in paths:
+        index.extend(load_rules(path))
+    return index
@@ -9,18 +9,55 @@ MED_NORMALIZATION = {
     "ibuprofen": "ibuprofen",
     "advil": "ibuprofen",
     "motrin": "ibuprofen",
+    "naproxen": "naproxen",
+    "aleve": "naproxen",
+    "citalopram": "citalopram",
+    "celexa": "citalopram",
+    "ondansetron": "ondansetron",
+    "zofran": "ondansetron",
 }
 
 COMORBIDITY_NORMALIZATION = {
     "ckd": "ckd",
+    "chronic kidney disease": "ckd",
     "ckd stage 3": "ckd_stage_3",
+    "ckd stage 3a": "ckd_stage_3",
+    "ckd stage 3b": "ckd_stage_3",
     "chronic kidney disease stage 3": "ckd_stage_3",
+    "ckd stage 4": "ckd_stage_4",
+    "chronic kidney disease stage 4": "ckd_stage_4",
+    "ckd stage 5": "ckd_stage_5",
+    "chronic kidney disease stage 5": "ckd_stage_5",
     "heart failure": "hf",
+    "congestive heart failure": "hf",
+    "chf": "hf",
     "hf": "hf",
     "diabetes": "dm",
+    "diabetes mellitus": "dm",
+    "type 1 diabetes": "dm",
+    "type 2 diabetes": "dm",
+    "t2dm": "dm",
     "dm": "dm",
 }
 
+# POC drug / condition classes: entity or class -> parent classes.
+# Rules can name a class on either side; it covers every member below it.
+ENTITY_CLASSES: Dict[str, List[str]] = {
+    "warfarin": ["vitamin_k_antagonist"],
+    "vitamin_k_antagonist": ["anticoagulant"],
+    "amiodarone": ["class_iii_antiarrhythmic", "qt_prolonger", "cyp2c9_inhibitor", "cyp3a4_inhibitor"],
+    "class_iii_antiarrhythmic": ["antiarrhythmic"],
+    "ibuprofen": ["nsaid"],
+    "naproxen": ["nsaid"],
+    "citalopram": ["ssri", "qt_prolonger"],
+    "ondansetron": ["5ht3_antagonist", "qt_prolonger"],
+    "metformin": ["biguanide"],
+    "ckd_stage_3": ["ckd"],
+    "ckd_stage_4": ["ckd"],
+    "ckd_stage_5": ["ckd"],
+    "ckd": ["renal_impairment"],
+}
+
 # Very small POC interaction rules
 INTERACTION_RULES: List[Dict[str, Any]] = [
     {
@@ -32,9 +69,16 @@ INTERACTION_RULES: List[Dict[str, Any]] = [
     },
     {
         "id": "nsaid_ckd",
-        "drug_a": "ibuprofen",
-        "drug_b": "ckd_stage_3",
+        "drug_a": "nsaid",
+        "drug_b": "ckd",
         "base_severity": "moderate",
         "notes": "NSAIDs can worsen renal function, especially in CKD.",
     },
+    {
+        "id": "qt_prolonger_qt_prolonger",
+        "drug_a": "qt_prolonger",
+        "drug_b": "qt_prolonger",
+        "base_severity": "major",
+        "notes": "Additive QT prolongation; risk of torsades de pointes.",
+    },
 ]
@@ -0,0 +1,166 @@
+"""
+Benchmark: concurrent /interactions throughput, blocking vs async endpoint.
+
+Starts benchmarks.mock_completion_server in a child process (fixed model
+latency) and fires batches of concurrent requests at two versions of the
+endpoint, in-process over httpx's ASGI transport:
+
+- sync:  the previous design, a plain `def` endpoint on a synchronous
+         OpenAI client. FastAPI runs it in its worker thread pool, so each
+         request holds a thread for the whole LLM call.
+- async: app.api.app, the `async def` endpoint running the graph with
+         ainvoke on the pooled AsyncOpenAI client.
+
+The explanation cache is off so every request reaches the model. Reports
+requests/s and p50/p95 latency per concurrency level.
+
+Run (from med-interaction-assistant/):
+    python -m benchmarks.bench_async_endpoint --latency-ms 300 --concurrency 10 50 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+
+from benchmarks.mock_completion_server import start_subprocess
+
+PATIENTS = [
+    {"medications": ["Coumadin 5mg tab", "amiodarone 200 mg"], "comorbidities": []},
+    {"medications": ["warfarin", "Amiodarone", "metformin"], "comorbidities": ["diabetes"]},
+    {"medications": ["Advil 400 mg", "metformin"], "comorbidities": ["CKD stage 3"]},
+    {"medications": ["warfarin", "amiodarone", "motrin"], "comorbidities": ["chronic kidney disease stage 3"]},
+]
+
+
+def _sync_app():
+    """The pre-async endpoint: blocking OpenAI client inside a sync `def`."""
+    from fastapi import FastAPI
+    from openai import OpenAI
+
+    from app import graph as g
+    from app.api import MedRequest
+    from app.config import settings
+
+    sync_client = OpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        timeout=settings.openai_timeout_seconds,
+        max_retries=settings.openai_max_retries,
+    )
+    app = FastAPI()
+
+    @app.post("/interactions")
+    def get_interactions(req: MedRequest):
+        meds = g.med_normalizer.normalize_many(req.medications)
+        comorbs = g.comorbidity_normalizer.normalize_many(req.comorbidities)
+        candidates = g.rule_index.candidates(meds, comorbs)
+        if not candidates:
+            return {"interactions": []}
+        prompt = g.USER_PROMPT_TEMPLATE.format(
+            candidates=json.dumps(
+                [
+                    {
+                        "drug_a": c["pair"][0],
+                        "drug_b": c["pair"][1],
+                        "base_severity": c["base_severity"],
+                        "rule_notes": c["rule_notes"],
+                        "relevant_comorbidities": g.rule_index.relevant_comorbidities(c["pair"], comorbs),
+                    }
+                    for c in candidates
+                ],
+                indent=2,
+            )
+        )
+        resp = sync_client.chat.completions.create(
+            model=settings.openai_model,
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": g.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+        )
+        return json.loads(resp.choices[0].message.content or "{}")
+
+    return app
+
+
+async def _load(app, concurrency: int, requests: int, rng: random.Random):
+    import httpx
+
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120
+    ) as http:
+
+        async def one(body):
+            nonlocal failures
+            async with semaphore:
+                start = time.perf_counter()
+                resp = await http.post("/interactions", json=body)
+                latencies.append(time.perf_counter() - start)
+                if resp.status_code != 200:
+                    failures += 1
+
+        bodies = [rng.choice(PATIENTS) for _ in range(requests)]
+        start = time.perf_counter()
+        await asyncio.gather(*(one(body) for body in bodies))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1e3,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=300, help="mock model latency")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--requests", type=int, default=400, help="requests per concurrency level")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Settings are read at import: point the app at the mock and bypass the cache.
+    os.environ.update(
+        OPENAI_BASE_URL=f"http://127.0.0.1:{args.port}/v1",
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY") or "sk-mock",
+        EXPLANATION_CACHE_ENABLED="false",
+    )
+    from app.api import app as async_app
+
+    apps = {"sync": _sync_app(), "async": async_app}
+
+    # One event loop for every level: the app's pooled AsyncOpenAI client
+    # keeps its connections bound to the loop that opened them.
+    async def run_levels():
+        for concurrency in args.concurrency:
+            for name, app in apps.items():
+                r = await _load(app, concurrency, args.requests, random.Random(args.seed))
+                print(
+                    f"concurrency={concurrency:<4} {name:<5}  {r['rps']:7.1f} req/s  "
+                    f"p50 {r['p50_ms']:6.0f} ms  p95 {r['p95_ms']:6.0f} ms  failures {r['failures']}"
+                )
+
+    server = start_subprocess(args.port, args.latency_ms)
+    try:
+        print(f"mock model latency {args.latency_ms:.0f} ms, {args.requests} requests per level")
+        asyncio.run(run_levels())
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
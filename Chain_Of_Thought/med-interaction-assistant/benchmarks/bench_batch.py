@@ -0,0 +1,142 @@
+"""
+Benchmark: ward screening, one /interactions call per patient vs one
+/interactions/batch call.
+
+Generates a synthetic ward: patients drawing their meds and comorbidities
+from a shared formulary, with interaction rules over it loaded via
+INTERACTION_RULE_FILES. Screens the ward both ways against
+benchmarks.mock_completion_server (fixed model latency), each with a fresh
+in-memory explanation cache, and reports wall time, LLM calls and pairs
+sent to the model (counted by the mock). Also checks that both ways flag
+the same pairs for every patient.
+
+Run (from med-interaction-assistant/):
+    python -m benchmarks.bench_batch --patients 200 --latency-ms 1000
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.mock_completion_server import start_subprocess
+
+
+def _ward(args, rng: random.Random):
+    drugs = [f"drug_{i}" for i in range(args.formulary)]
+    conditions = [f"condition_{i}" for i in range(args.conditions)]
+    rules, seen = [], set()
+    while len(rules) < args.rules:
+        a = rng.choice(drugs)
+        b = rng.choice(conditions) if rng.random() < 0.2 else rng.choice(drugs)
+        if a == b or (a, b) in seen or (b, a) in seen:
+            continue
+        seen.add((a, b))
+        rules.append({"id": f"r{len(rules)}", "drug_a": a, "drug_b": b, "base_severity": "moderate", "notes": ""})
+    patients = [
+        {
+            "medications": rng.sample(drugs, rng.randint(args.meds - 3, args.meds + 3)),
+            "comorbidities": rng.sample(conditions, rng.randint(0, 3)),
+        }
+        for _ in range(args.patients)
+    ]
+    return rules, patients
+
+
+def _flagged(result):
+    return sorted(tuple(sorted(i["pair"].values())) for i in result["interactions"])
+
+
+async def _mock_stats(port: int):
+    async with httpx.AsyncClient() as http:
+        return (await http.get(f"http://127.0.0.1:{port}/stats")).json()
+
+
+async def _run(app, patients, concurrency: int, port: int):
+    from app import graph
+    from app.explanation_cache import ExplanationCache
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=600
+    ) as http:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(patient):
+            async with semaphore:
+                resp = await http.post("/interactions", json=patient)
+                resp.raise_for_status()
+                return resp.json()
+
+        report = {}
+        for mode in ("per-patient", "batch"):
+            graph.explanation_cache = ExplanationCache()
+            before = await _mock_stats(port)
+            start = time.perf_counter()
+            if mode == "batch":
+                resp = await http.post("/interactions/batch", json={"patients": patients})
+                resp.raise_for_status()
+                body = resp.json()
+                results = body["results"]
+                print(f"batch stats: unique_pairs={body['unique_pairs']} llm_calls={body['llm_calls']} llm_errors={body['llm_errors']}")
+            else:
+                results = await asyncio.gather(*(one(p) for p in patients))
+            elapsed = time.perf_counter() - start
+            after = await _mock_stats(port)
+            report[mode] = (elapsed, after["completions"] - before["completions"],
+                            after["pairs"] - before["pairs"], [_flagged(r) for r in results])
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--meds", type=int, default=10, help="average meds per patient")
+    parser.add_argument("--formulary", type=int, default=80, help="distinct drugs on the ward")
+    parser.add_argument("--conditions", type=int, default=10)
+    parser.add_argument("--rules", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=1000, help="mock model latency")
+    parser.add_argument("--concurrency", type=int, default=8, help="per-patient requests in flight")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rules, patients = _ward(args, random.Random(args.seed))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_path = os.path.join(tmp, "ward_rules.csv")
+        with open(rules_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rules[0]))
+            writer.writeheader()
+            writer.writerows(rules)
+
+        # Settings are read at import: point the app at the mock and the rules.
+        os.environ.update(
+            OPENAI_BASE_URL=f"http://127.0.0.1:{args.port}/v1",
+            OPENAI_API_KEY=os.getenv("OPENAI_API_KEY") or "sk-mock",
+            INTERACTION_RULE_FILES=rules_path,
+            EXPLANATION_CACHE_PATH="",
+        )
+        from app.api import app
+
+    server = start_subprocess(args.port, args.latency_ms)
+    try:
+        report = asyncio.run(_run(app, patients, args.concurrency, args.port))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"ward: {args.patients} patients, ~{args.meds} meds each, {args.rules} rules, "
+          f"model latency {args.latency_ms:.0f} ms")
+    for mode, (elapsed, calls, pairs, _) in report.items():
+        print(f"{mode:<12} {elapsed:7.2f} s  llm calls {calls:5d}  pairs sent to the model {pairs:5d}")
+    same = report["per-patient"][3] == report["batch"][3]
+    print(f"same flagged pairs per patient: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: class-level interaction rules, naive ancestor scan vs the
+bitset RuleIndex.
+
+Generates a synthetic drug / condition class hierarchy (drugs in 1-3 leaf
+classes, leaf classes under parent classes, conditions in condition
+classes) and rules over it: mostly class x class and drug class x
+condition class, some drug x drug. Screens polypharmacy patients (30 meds,
+a few comorbidities) with app.rule_index.RuleIndex and with a direct scan
+of every rule against every pair of the patient's entities and their
+ancestor sets, and checks both return the same (rule, pair) candidates.
+
+Run (from med-interaction-assistant/):
+    python -m benchmarks.bench_class_rules --classes 400 --rules 5000 --meds 30
+"""
+
+import argparse
+import random
+import time
+from itertools import permutations
+
+from app.class_hierarchy import ClassHierarchy
+from app.rule_index import RuleIndex, pair_key
+
+
+def _hierarchy(args, rng: random.Random):
+    drugs = [f"drug_{i}" for i in range(args.drugs)]
+    conditions = [f"condition_{i}" for i in range(args.conditions)]
+    parents_n = max(1, args.classes // 5)
+    leaves = [f"class_{i}" for i in range(args.classes - parents_n)]
+    parents = [f"parent_class_{i}" for i in range(parents_n)]
+    condition_classes = [f"condition_class_{i}" for i in range(args.condition_classes)]
+
+    memberships = {}
+    for d in drugs:
+        memberships[d] = rng.sample(leaves, rng.randint(1, 3))
+    for leaf in leaves:
+        memberships[leaf] = rng.sample(parents, rng.randint(1, 2))
+    for c in conditions:
+        memberships[c] = rng.sample(condition_classes, rng.randint(1, 2))
+    return drugs, conditions, leaves + parents, condition_classes, memberships
+
+
+def _rules(n: int, drugs, drug_classes, condition_classes, rng: random.Random):
+    rules, seen = [], set()
+    while len(rules) < n:
+        kind = rng.random()
+        if kind < 0.7:
+            a, b = rng.choice(drug_classes), rng.choice(drug_classes)
+        elif kind < 0.9:
+            a, b = rng.choice(drug_classes), rng.choice(condition_classes)
+        else:
+            a, b = rng.sample(drugs, 2)
+        if pair_key(a, b) in seen:
+            continue
+        seen.add(pair_key(a, b))
+        rules.append({"id": f"r{len(rules)}", "drug_a": a, "drug_b": b, "base_severity": "major", "notes": ""})
+    return rules
+
+
+def _naive(rules, hierarchy, meds, comorbs):
+    """Every rule against every med+med and med+comorbidity pair's ancestor sets."""
+    ancestors = {e: set(hierarchy.ancestors(e)) for e in meds + comorbs}
+    found = []
+    for rule in rules:
+        a, b = rule["drug_a"], rule["drug_b"]
+        pairs = {
+            pair_key(x, y)
+            for x, y in permutations(meds, 2)
+            if a in ancestors[x] and b in ancestors[y]
+        }
+        pairs.update(
+            pair_key(m, c)
+            for m in meds
+            for c in comorbs
+            if (a in ancestors[m] and b in ancestors[c]) or (b in ancestors[m] and a in ancestors[c])
+        )
+        found.extend((rule["id"], pair) for pair in sorted(pairs))
+    return found
+
+
+def _indexed(index, meds, comorbs):
+    return [(c["rule_id"], pair_key(*c["pair"])) for c in index.candidates(meds, comorbs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drugs", type=int, default=3000)
+    parser.add_argument("--classes", type=int, default=400, help="drug classes (1/5 of them parent classes)")
+    parser.add_argument("--conditions", type=int, default=300)
+    parser.add_argument("--condition-classes", type=int, default=60)
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--meds", type=int, default=30, help="meds per patient")
+    parser.add_argument("--comorbidities", type=int, default=5, help="comorbidities per patient")
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    drugs, conditions, drug_classes, condition_classes, memberships = _hierarchy(args, rng)
+    rules = _rules(args.rules, drugs, drug_classes, condition_classes, rng)
+    patients = [
+        (rng.sample(drugs, args.meds), rng.sample(conditions, args.comorbidities))
+        for _ in range(args.patients)
+    ]
+
+    start = time.perf_counter()
+    hierarchy = ClassHierarchy(memberships)
+    index = RuleIndex(rules, hierarchy)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for meds, comorbs in patients:
+        index.candidates(meds, comorbs)
+    cold_ms = (time.perf_counter() - start) / len(patients) * 1e3
+
+    start = time.perf_counter()
+    for _ in range(5):
+        for meds, comorbs in patients:
+            index.candidates(meds, comorbs)
+    index_ms = (time.perf_counter() - start) / (5 * len(patients)) * 1e3
+
+    naive_sample = patients[: max(1, args.patients // 20)]
+    start = time.perf_counter()
+    expected = [_naive(rules, hierarchy, m, c) for m, c in naive_sample]
+    naive_ms = (time.perf_counter() - start) / len(naive_sample) * 1e3
+
+    mismatches = sum(_indexed(index, m, c) != e for (m, c), e in zip(naive_sample, expected))
+    flagged = sum(len(index.candidates(m, c)) for m, c in patients) / len(patients)
+
+    print(f"rules={len(rules)} drug classes={len(drug_classes)} "
+          f"condition classes={len(condition_classes)} meds/patient={args.meds}")
+    print(f"hierarchy + index build: {build_s * 1e3:.0f} ms")
+    print(f"naive ancestor scan: {naive_ms:.2f} ms/patient")
+    print(f"bitset index:        {index_ms:.3f} ms/patient warm ({naive_ms / index_ms:.0f}x), "
+          f"{cold_ms:.3f} ms/patient with entities compiled on first sight")
+    print(f"avg candidates per patient: {flagged:.1f}; mismatches vs naive scan: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: medication name normalisation (app.normalizer.Normalizer).
+
+Builds a synthetic vocabulary of generic names, each with a couple of brand
+aliases, writes it to a CSV file and loads it the way the app does at
+startup. Then normalises med-list strings of the kinds seen in practice:
+exact names in mixed case, names with dose/form/frequency suffixes, salt
+forms ("<generic> sodium 5 mg tab") and one- or two-edit misspellings.
+Reports startup time, throughput with the per-string cache cold (every
+input distinct) and warm, and accuracy against the intended canonical name.
+
+Run (from med-interaction-assistant/):
+    python -m benchmarks.bench_normalizer --generics 20000 --inputs 50000
+"""
+
+import argparse
+import csv
+import os
+import random
+import string
+import tempfile
+import time
+
+from app.normalizer import build_normalizer
+
+SYLLABLES = ["ba", "cor", "da", "fen", "gli", "lo", "mar", "nol", "pra", "quin", "ri", "sta", "tor", "vir",
+             "xa", "zol", "pam", "cef", "mab", "tin", "dil", "ox", "pril", "sar", "tan", "mide", "zine"]
+SUFFIXES = ["5mg", "10 mg", "500 mg tablet", "20mg PO daily", "0.5 mg bid", "100 mg/5 ml susp", "40 mg ER"]
+SALTS = ["sodium", "hydrochloride", "hcl", "potassium", "maleate"]
+
+
+def _name(rng: random.Random, taken: set) -> str:
+    while True:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 5)))
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def _typo(word: str, rng: random.Random, edits: int) -> str:
+    for _ in range(edits):
+        i = rng.randrange(1, len(word) - 1)
+        op = rng.choice(["sub", "del", "ins", "swap"])
+        if op == "sub":
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+        elif op == "del":
+            word = word[:i] + word[i + 1:]
+        elif op == "ins":
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+        else:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def _input(aliases, rng: random.Random):
+    alias, canonical = rng.choice(aliases)
+    kind = rng.random()
+    if kind < 0.3:
+        text = alias.upper() if rng.random() < 0.3 else alias.capitalize()
+    elif kind < 0.6:
+        text = f"{alias.capitalize()} {rng.choice(SUFFIXES)}"
+    elif kind < 0.75:
+        text = f"{alias} {rng.choice(SALTS)} {rng.choice(SUFFIXES)}"
+    else:
+        text = f"{_typo(alias, rng, 1 if len(alias) < 8 else rng.randint(1, 2))} {rng.choice(SUFFIXES)}"
+    return text, canonical
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generics", type=int, default=20_000)
+    parser.add_argument("--brands", type=int, default=2, help="brand aliases per generic")
+    parser.add_argument("--inputs", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    taken: set = set()
+    aliases = []
+    for _ in range(args.generics):
+        generic = _name(rng, taken)
+        aliases.append((generic, generic))
+        aliases.extend((_name(rng, taken), generic) for _ in range(args.brands))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "med_vocabulary.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["alias", "canonical"])
+            writer.writerows(aliases)
+        start = time.perf_counter()
+        normalizer = build_normalizer({}, path, strip_doses=True, cache_size=2 * args.inputs)
+        startup_s = time.perf_counter() - start
+
+    inputs = [_input(aliases, rng) for _ in range(args.inputs)]
+    texts = [text for text, _ in inputs]
+
+    start = time.perf_counter()
+    results = normalizer.normalize_many(texts)
+    cold_s = time.perf_counter() - start
+    start = time.perf_counter()
+    normalizer.normalize_many(texts)
+    warm_s = time.perf_counter() - start
+
+    correct = sum(result == canonical for result, (_, canonical) in zip(results, inputs))
+    by_kind: dict = {}
+    for text in texts[:5000]:
+        how = normalizer.lookup(text)[1]
+        by_kind[how] = by_kind.get(how, 0) + 1
+
+    print(f"vocabulary: {len(normalizer)} aliases, loaded and compiled in {startup_s:.2f} s")
+    print(f"cold cache: {args.inputs / cold_s:,.0f} names/s ({cold_s / args.inputs * 1e6:.1f} us/name)")
+    print(f"warm cache: {args.inputs / warm_s:,.0f} names/s")
+    print(f"accuracy: {correct / args.inputs:.1%}; matched by: {dict(sorted(by_kind.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: interaction candidate lookup, linear rule scan vs RuleIndex.
+
+Generates synthetic rules over a vocabulary of drugs and conditions
+(drug+drug and drug+condition pairs), then screens polypharmacy patients
+(25 meds, a few comorbidities) with both the old linear scan over every
+rule and app.rule_index.RuleIndex, and checks they return the same rules.
+Also times loading the rules back from CSV and JSON.
+
+Run (from med-interaction-assistant/):
+    python -m benchmarks.bench_rule_index --rules 100000 --meds 25
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+from app.rule_index import RuleIndex, load_rules
+
+SEVERITIES = ["minor", "moderate", "major", "contraindicated"]
+
+
+def _rules(n: int, drugs, conditions, rng: random.Random):
+    rules, seen = [], set()
+    while len(rules) < n:
+        a = rng.choice(drugs)
+        b = rng.choice(conditions) if rng.random() < 0.2 else rng.choice(drugs)
+        if a == b or (a, b) in seen:
+            continue
+        seen.add((a, b))
+        rules.append(
+            {
+                "id": f"r{len(rules)}",
+                "drug_a": a,
+                "drug_b": b,
+                "base_severity": rng.choice(SEVERITIES),
+                "notes": "synthetic",
+            }
+        )
+    return rules
+
+
+def _linear(rules, meds, comorbs):
+    """The original find_interactions loop."""
+    meds, comorbs = set(meds), set(comorbs)
+    return [
+        rule
+        for rule in rules
+        if (rule["drug_a"] in meds and rule["drug_b"] in meds)
+        or (rule["drug_a"] in meds and rule["drug_b"] in comorbs)
+        or (rule["drug_a"] in comorbs and rule["drug_b"] in meds)
+    ]
+
+
+def _per_call_ms(func, patients, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for meds, comorbs in patients:
+            func(meds, comorbs)
+    return (time.perf_counter() - start) / (len(patients) * repeat) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--drugs", type=int, default=3000, help="drug vocabulary size")
+    parser.add_argument("--conditions", type=int, default=300, help="condition vocabulary size")
+    parser.add_argument("--meds", type=int, default=25, help="meds per patient")
+    parser.add_argument("--comorbidities", type=int, default=5, help="comorbidities per patient")
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    drugs = [f"drug_{i}" for i in range(args.drugs)]
+    conditions = [f"condition_{i}" for i in range(args.conditions)]
+    rules = _rules(args.rules, drugs, conditions, rng)
+    patients = [
+        (rng.sample(drugs, args.meds), rng.sample(conditions, args.comorbidities))
+        for _ in range(args.patients)
+    ]
+
+    start = time.perf_counter()
+    index = RuleIndex(rules)
+    build_s = time.perf_counter() - start
+
+    linear_sample = patients[: max(1, args.patients // 10)]
+    linear_ms = _per_call_ms(lambda m, c: _linear(rules, m, c), linear_sample)
+    index_ms = _per_call_ms(index.matching_rules, patients, repeat=10)
+
+    mismatches = sum(index.matching_rules(m, c) != _linear(rules, m, c) for m, c in linear_sample)
+    flagged = sum(len(index.matching_rules(m, c)) for m, c in patients) / len(patients)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, json_path = os.path.join(tmp, "rules.csv"), os.path.join(tmp, "rules.json")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rules[0]))
+            writer.writeheader()
+            writer.writerows(rules)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(rules, f)
+        load_times = {}
+        for path in (csv_path, json_path):
+            start = time.perf_counter()
+            RuleIndex(load_rules(path))
+            load_times[os.path.splitext(path)[1]] = time.perf_counter() - start
+
+    print(f"rules={len(rules)} meds/patient={args.meds} comorbidities/patient={args.comorbidities}")
+    print(f"index build: {build_s * 1e3:.0f} ms; load+index: csv {load_times['.csv'] * 1e3:.0f} ms, "
+          f"json {load_times['.json'] * 1e3:.0f} ms")
+    print(f"linear scan: {linear_ms:.3f} ms/patient")
+    print(f"pair index:  {index_ms:.3f} ms/patient ({linear_ms / index_ms:.0f}x)")
+    print(f"avg rules flagged per patient: {flagged:.2f}; mismatches vs linear scan: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
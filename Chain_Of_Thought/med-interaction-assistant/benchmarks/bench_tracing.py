@@ -0,0 +1,158 @@
+"""
+Benchmark: per-request tracing overhead, Langfuse off / sampled / on.
+
+Runs /interactions in-process (httpx ASGI transport) for polypharmacy
+patients whose explanations are already cached, so a request is the graph,
+its spans and nothing else. Spans are exported to
+benchmarks.mock_completion_server, which stands in for both the model and
+the Langfuse OTLP endpoint and counts what it receives.
+
+Each mode runs in its own worker process (settings are read at import):
+
+- off:       LANGFUSE_TRACING_ENABLED=false
+- on-full:   every request traced, no cap or redaction, SDK media scan on
+             (the previous behaviour)
+- on-capped: every request traced, default caps and redaction
+- sampled:   LANGFUSE_SAMPLE_RATE (default 0.1), default caps
+
+Reports mean time per request, overhead against "off", and spans
+exported (batches, KB).
+
+Run (from med-interaction-assistant/):
+    python -m benchmarks.bench_tracing --requests 2000 --meds 20
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_completion_server import start_subprocess
+
+def _modes(sample_rate: float):
+    return {
+        "off": {"LANGFUSE_TRACING_ENABLED": "false"},
+        "on-full": {
+            "LANGFUSE_MAX_FIELD_CHARS": "0",
+            "LANGFUSE_REDACT_KEYS": "",
+            "LANGFUSE_MEDIA_UPLOAD_ENABLED": "true",
+        },
+        "on-capped": {},
+        "sampled": {"LANGFUSE_SAMPLE_RATE": str(sample_rate)},
+    }
+
+
+def _write_rules(path: str, drugs, rng: random.Random, n: int):
+    rules, seen = [], set()
+    while len(rules) < n:
+        a, b = rng.sample(drugs, 2)
+        if (a, b) in seen or (b, a) in seen:
+            continue
+        seen.add((a, b))
+        rules.append({"id": f"r{len(rules)}", "drug_a": a, "drug_b": b, "base_severity": "major", "notes": ""})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rules[0]))
+        writer.writeheader()
+        writer.writerows(rules)
+
+
+async def _worker(args):
+    import httpx
+
+    from app.api import app
+    from app.observability import langfuse
+
+    rng = random.Random(args.seed)
+    drugs = [f"drug_{i}" for i in range(args.formulary)]
+    patients = [{"medications": rng.sample(drugs, args.meds), "comorbidities": []} for _ in range(20)]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        flagged = 0
+        for patient in patients:  # warm the explanation cache
+            resp = await http.post("/interactions", json=patient)
+            resp.raise_for_status()
+            flagged += resp.json()["count_flagged_interactions"] / len(patients)
+        langfuse.flush()
+
+        async with httpx.AsyncClient() as mock:
+            before = (await mock.get(f"{args.mock_url}/stats")).json()
+            start = time.perf_counter()
+            for i in range(args.requests):
+                (await http.post("/interactions", json=patients[i % len(patients)])).raise_for_status()
+            elapsed = time.perf_counter() - start
+            langfuse.flush()
+            after = (await mock.get(f"{args.mock_url}/stats")).json()
+
+    print(json.dumps({
+        "ms_per_request": elapsed / args.requests * 1e3,
+        "flagged_per_request": flagged,
+        "exports": after["span_exports"] - before["span_exports"],
+        "export_kb": (after["span_export_bytes"] - before["span_export_bytes"]) / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--meds", type=int, default=20, help="meds per patient")
+    parser.add_argument("--formulary", type=int, default=40)
+    parser.add_argument("--rules", type=int, default=150)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mock-url", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        asyncio.run(_worker(args))
+        return
+
+    mock_url = f"http://127.0.0.1:{args.port}"
+    server = start_subprocess(args.port, latency_ms=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            rules_path = os.path.join(tmp, "rules.csv")
+            _write_rules(rules_path, [f"drug_{i}" for i in range(args.formulary)], random.Random(args.seed), args.rules)
+            base_env = dict(
+                os.environ,
+                OPENAI_BASE_URL=f"{mock_url}/v1",
+                OPENAI_API_KEY="sk-mock",
+                INTERACTION_RULE_FILES=rules_path,
+                EXPLANATION_CACHE_PATH="",
+                LANGFUSE_PUBLIC_KEY="pk-lf-bench",
+                LANGFUSE_SECRET_KEY="sk-lf-bench",
+                LANGFUSE_BASE_URL=mock_url,
+                LANGFUSE_HOST=mock_url,
+            )
+            results = {}
+            for mode, env in _modes(args.sample_rate).items():
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_tracing", "--worker", "--mock-url", mock_url,
+                     "--requests", str(args.requests), "--meds", str(args.meds),
+                     "--formulary", str(args.formulary), "--seed", str(args.seed)],
+                    env=dict(base_env, **env), capture_output=True, text=True,
+                )
+                if out.returncode != 0:
+                    raise RuntimeError(f"{mode} worker failed:\n{out.stderr}")
+                results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+    finally:
+        server.terminate()
+        server.wait()
+
+    off = results["off"]["ms_per_request"]
+    print(f"{args.requests} requests, {args.meds} meds/patient, "
+          f"~{results['off']['flagged_per_request']:.0f} flagged interactions per request")
+    for mode, r in results.items():
+        print(f"{mode:<10} {r['ms_per_request']:7.3f} ms/request  overhead {r['ms_per_request'] - off:+7.3f} ms  "
+              f"exported {r['exports']:4d} batches, {r['export_kb']:9.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Local OpenAI-compatible mock of POST /v1/chat/completions for benchmarks.
+
+Answers the interaction reasoning prompt with one explanation per candidate
+pair found in it, after an artificial delay standing in for model latency.
+Also accepts Langfuse's OTLP span exports (LANGFUSE_BASE_URL=<mock>) and
+counts them, so tracing can be benchmarked without a Langfuse server.
+
+Run standalone:
+    MOCK_LATENCY_MS=300 uvicorn benchmarks.mock_completion_server:app --port 8766
+Then point the service at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=sk-mock uvicorn app.api:app
+"""
+
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request, Response
+
+MOCK_LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "300"))
+
+# Candidate pairs as USER_PROMPT_TEMPLATE lists them (json.dumps, indent=2),
+# searched only before the output schema, which has the same shape
+_PAIR = re.compile(r'"drug_a": "([^"]*)",\s*"drug_b": "([^"]*)"')
+_SCHEMA_START = "Think step-by-step"
+
+
+def _pairs(prompt: str):
+    return _PAIR.findall(prompt.split(_SCHEMA_START, 1)[0])
+
+# Completions and span exports served so far (GET /stats), so benchmarks
+# can count LLM calls and trace volume
+_served = {"completions": 0, "pairs": 0, "span_exports": 0, "span_export_bytes": 0}
+
+app = FastAPI(title="Mock OpenAI chat completions")
+
+
+def _explanations(prompt: str) -> str:
+    return json.dumps(
+        {
+            "interactions": [
+                {
+                    "pair": {"drug_a": a, "drug_b": b},
+                    "mechanism": f"Mock mechanism for {a} + {b}.",
+                    "clinical_consequences": "Mock consequences.",
+                    "severity": "moderate",
+                    "monitoring_and_mitigation": "Mock monitoring.",
+                    "safer_alternatives": "Mock alternatives.",
+                    "notes_for_clinician": (
+                        "Use this as a decision-support aid only, not a final recommendation."
+                    ),
+                }
+                for a, b in _pairs(prompt)
+            ]
+        }
+    )
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: Dict[str, Any]):
+    await asyncio.sleep(MOCK_LATENCY_MS / 1000)
+    prompt = body["messages"][-1]["content"]
+    content = _explanations(prompt)
+    _served["completions"] += 1
+    _served["pairs"] += len(_pairs(prompt))
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        },
+    }
+
+
+@app.post("/api/public/otel/v1/traces")
+async def span_export(request: Request):
+    body = await request.body()
+    _served["span_exports"] += 1
+    _served["span_export_bytes"] += len(body)
+    return Response(status_code=200)
+
+
+@app.get("/stats")
+async def stats():
+    return dict(_served)
+
+
+def start_subprocess(port: int = 8766, latency_ms: float = MOCK_LATENCY_MS) -> subprocess.Popen:
+    """
+    Start the mock in a child process and wait until it accepts connections,
+    so it does not compete with the service under test for the GIL.
+    """
+    env = dict(os.environ, MOCK_LATENCY_MS=str(latency_ms))
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.mock_completion_server:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError(f"mock completion server did not start on port {port}")
@@ -0,0 +1,7 @@
+import os
+
+# Before any app module is imported: no tracing, no explanation cache file,
+# and a placeholder key (tests never reach the OpenAI API).
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("LANGFUSE_TRACING_ENABLED", "false")
+os.environ["EXPLANATION_CACHE_PATH"] = ""
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import batch, graph
+from app.explanation_cache import ExplanationCache
+
+WARD = [
+    {"medications": ["Coumadin 5mg", "amiodarone", "citalopram"], "comorbidities": ["CKD"]},
+    {"medications": ["ibuprofen", "warfarin"], "comorbidities": ["chronic kidney disease"]},
+    {"medications": ["metformin"], "comorbidities": []},
+]
+UNASKED = {"pair": {"drug_a": "aspirin", "drug_b": "warfarin"}, "severity": "major"}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Stands in for _call_llm_for_explanations: one entry per candidate plus one unasked pair."""
+    monkeypatch.setattr(graph, "explanation_cache", ExplanationCache())
+    state = SimpleNamespace(calls=[], fail=set())
+
+    async def call(candidates):
+        state.calls.append([tuple(c["pair"]) for c in candidates])
+        if any(set(c["pair"]) & state.fail for c in candidates):
+            raise TimeoutError("LLM call timed out")
+        return [
+            {
+                "pair": {"drug_a": c["pair"][0], "drug_b": c["pair"][1]},
+                "severity": c["base_severity"],
+                "mechanism": f"explained with {c['relevant_comorbidities']}",
+            }
+            for c in candidates
+        ] + [UNASKED]
+
+    monkeypatch.setattr(graph, "_call_llm_for_explanations", call)
+    return state
+
+
+def test_batch_matches_single_endpoint_except_unasked_entries(llm):
+    async def go():
+        single = [(await graph.graph.ainvoke(dict(p)))["result"] for p in WARD]
+        graph.explanation_cache = ExplanationCache()
+        return single, await batch.screen_batch(WARD)
+
+    single, (results, stats) = asyncio.run(go())
+
+    # /interactions passes through what the LLM added unasked; the batch
+    # cannot attribute it to a patient and drops it.
+    for one, batched in zip(single, results):
+        asked = [i for i in one["interactions"] if i != UNASKED]
+        if asked:
+            assert UNASKED in one["interactions"]
+        assert batched["interactions"] == asked
+        assert batched["count_flagged_interactions"] == len(asked)
+        assert (batched["medications"], batched["comorbidities"]) == (one["medications"], one["comorbidities"])
+    assert [r["count_flagged_interactions"] for r in results] == [2, 1, 0]
+    assert stats["llm_errors"] == 0
+
+
+def test_failed_llm_call_gives_fallback_entries_not_a_failed_batch(llm, monkeypatch):
+    monkeypatch.setattr(batch.settings, "batch_pairs_per_call", 1)
+    llm.fail = {"ibuprofen"}
+
+    results, stats = asyncio.run(batch.screen_batch(WARD))
+
+    assert stats["llm_errors"] == 1
+    nsaid = [i for i in results[1]["interactions"] if "ibuprofen" in i["pair"].values()]
+    assert nsaid == [graph._fallback_explanation(
+        {"pair": ("ibuprofen", "ckd"), "base_severity": "moderate", "rule_notes": nsaid[0]["mechanism"]},
+        "TimeoutError: LLM call timed out",
+    )]
+    assert all("explanation_error" not in i for i in results[0]["interactions"])
+
+    # Fallbacks are not cached: the next batch asks the LLM again.
+    llm.fail.clear()
+    llm.calls.clear()
+    results, stats = asyncio.run(batch.screen_batch(WARD))
+    assert stats["llm_errors"] == 0
+    assert any("ibuprofen" in pair for call in llm.calls for pair in call)
+    assert all("explanation_error" not in i for r in results for i in r["interactions"])
+
+
+@pytest.mark.parametrize("content", ["not json", '{"interactions": "none"}'])
+def test_unparseable_llm_output_is_an_error(monkeypatch, content):
+    response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    async def create(**kwargs):
+        return response
+
+    monkeypatch.setattr(graph, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    monkeypatch.setattr(graph, "explanation_cache", ExplanationCache())
+    candidates = graph.rule_index.candidates(["warfarin", "amiodarone"], [])
+
+    with pytest.raises(ValueError):
+        asyncio.run(graph.explain_candidates(candidates, []))
+
+    explanations, stats = asyncio.run(graph.explain_many([(candidates, [])]))
+    assert stats["llm_errors"] == 1
+    assert [e["severity"] for e in explanations[0]] == ["major"]
+    assert "explanation_error" in explanations[0][0]
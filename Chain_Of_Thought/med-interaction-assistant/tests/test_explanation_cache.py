@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from app.explanation_cache import ExplanationCache, explanation_key
+
+KEY = explanation_key(["warfarin", "amiodarone"], ["ckd"], "model-a", "v1")
+VALUE = {"pair": ["warfarin", "amiodarone"], "explanation": "CYP2C9 inhibition."}
+
+
+def test_hits_and_misses():
+    cache = ExplanationCache()
+    assert cache.get(KEY) is None
+    cache.set(KEY, VALUE)
+
+    assert cache.get(KEY) == VALUE
+    assert cache.get_many([KEY, "other"]) == {KEY: VALUE}
+    stats = cache.stats()
+    assert (stats["hits_memory"], stats["misses"]) == (2, 2)
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "explanations.sqlite3")
+    ExplanationCache(path).set_many({KEY: VALUE, "other": {"explanation": "x"}})
+
+    reopened = ExplanationCache(path)
+    assert reopened.get_many([KEY, "other", "missing"]) == {KEY: VALUE, "other": {"explanation": "x"}}
+    assert reopened.stats()["hits_sqlite"] == 2
+    assert reopened.get(KEY) == VALUE  # promoted to memory
+    assert reopened.stats()["hits_memory"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ExplanationCache(str(tmp_path / "explanations.sqlite3"), ttl_seconds=60)
+    cache._write_sqlite({KEY: VALUE}, time.time() - 120)
+    assert cache.get(KEY) is None
+
+    cache.set(KEY, VALUE)
+    assert cache.get(KEY) == VALUE
+
+
+def test_key_changes_with_model_prompt_and_comorbidities():
+    assert explanation_key(["amiodarone", "warfarin"], ["ckd", "ckd"], "model-a", "v1") == KEY
+    assert explanation_key(["warfarin", "amiodarone"], ["ckd"], "model-b", "v1") != KEY
+    assert explanation_key(["warfarin", "amiodarone"], ["ckd"], "model-a", "v2") != KEY
+    assert explanation_key(["warfarin", "amiodarone"], [], "model-a", "v1") != KEY
+    assert explanation_key(["warfarin", "citalopram"], ["ckd"], "model-a", "v1") != KEY
+
+
+def test_async_sqlite_io_runs_off_the_event_loop(tmp_path):
+    cache = ExplanationCache(str(tmp_path / "explanations.sqlite3"))
+    threads = []
+    for name in ("_read_sqlite", "_write_sqlite"):
+        method = getattr(cache, name)
+
+        def recorded(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+
+        setattr(cache, name, recorded)
+
+    async def go():
+        await cache.aset_many({KEY: VALUE})
+        cache._memory.clear()
+        return threading.get_ident(), await cache.aget_many([KEY])
+
+    loop_thread, found = asyncio.run(go())
+    assert found == {KEY: VALUE}
+    assert len(threads) == 2 and loop_thread not in threads
@@ -0,0 +1,57 @@
+import pytest
+
+from app.normalizer import build_normalizer
+from app.rules import COMORBIDITY_NORMALIZATION, MED_NORMALIZATION
+
+meds = build_normalizer(MED_NORMALIZATION, strip_doses=True)
+conditions = build_normalizer(COMORBIDITY_NORMALIZATION)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Coumadin 5mg tab", ("warfarin", "exact")),
+    ("warfarin sodium 5 mg", ("warfarin", "phrase")),
+    ("metformin 500mg twice daily", ("metformin", "phrase")),
+    ("amiodarnoe", ("amiodarone", "fuzzy")),
+    ("Ibuprofn 400 mg", ("ibuprofen", "fuzzy")),
+])
+def test_medication_names_that_should_match(text, expected):
+    assert meds.lookup(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("CKD", ("ckd", "exact")),
+    ("h/o chronic kidney disease stage 3", ("ckd_stage_3", "phrase")),
+    ("chronic kidney disease stage 5", ("ckd_stage_5", "exact")),
+    ("ckd stage 4", ("ckd_stage_4", "exact")),
+    ("known heart failure", ("hf", "phrase")),
+    ("h/o diabetis", ("dm", "fuzzy")),
+])
+def test_condition_names_that_should_match(text, expected):
+    assert conditions.lookup(text) == expected
+
+
+@pytest.mark.parametrize("normalizer, text", [
+    # a digit change is a different stage, not a typo
+    (conditions, "ckd stage 6"),
+    (conditions, "chronic kidney disease stage 9"),
+    # extra qualifiers make a different condition
+    (conditions, "diabetes insipidus"),
+    (conditions, "gestational diabetes"),
+    (conditions, "gestational diabetis"),
+    (conditions, "heart failre with something"),
+    # negated entries
+    (conditions, "no heart failure"),
+    (conditions, "denies diabetes"),
+    (meds, "not on warfarin"),
+    (meds, "stopped amiodarone 200mg"),
+    # a different drug one prefix away
+    (meds, "escitalopram"),
+])
+def test_unsafe_matches_are_not_guessed(normalizer, text):
+    assert normalizer.lookup(text)[1] == "none"
+
+
+def test_normalize_many_keeps_unmatched_names_cleaned():
+    assert meds.normalize_many(["Warfarin", "Escitalopram 10 mg", "not on warfarin"]) == [
+        "warfarin", "escitalopram", "not on warfarin",
+    ]
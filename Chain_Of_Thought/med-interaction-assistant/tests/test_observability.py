@@ -0,0 +1,55 @@
+import json
+import os
+
+from app.config import settings
+from app.observability import REDACTED, _sdk_environ, mask_payload
+
+
+def test_patient_lists_are_redacted_at_any_depth():
+    request = {"medications": ["warfarin 5mg"], "comorbidities": ["CKD"]}
+    assert mask_payload(data=request) == {"medications": REDACTED, "comorbidities": REDACTED}
+
+    output = {
+        "result": {
+            "Medications": ["warfarin 5mg"],
+            "count_flagged_interactions": 1,
+            "summary_list": [{"label": "warfarin + amiodarone", "severity": "major"}],
+        }
+    }
+    masked = mask_payload(data=output)["result"]
+    assert masked["Medications"] == REDACTED
+    assert masked["count_flagged_interactions"] == 1
+    assert masked["summary_list"] == output["result"]["summary_list"]
+
+    normalized = {"normalized_meds": ["warfarin"], "normalized_comorbidities": ["ckd"]}
+    assert set(mask_payload(data=normalized).values()) == {REDACTED}
+
+
+def test_llm_prompt_and_completion_are_redacted():
+    generation_input = {"system": "You are a clinical pharmacist assistant.", "user_prompt": "warfarin + amiodarone"}
+    assert mask_payload(data=generation_input) == {"system": generation_input["system"], "user_prompt": REDACTED}
+    assert mask_payload(data={"completion": '{"interactions": []}'}) == {"completion": REDACTED}
+
+
+def test_long_fields_are_truncated():
+    limit = settings.langfuse_max_field_chars
+    candidates = [{"rule_id": f"rule_{i}", "rule_notes": "x" * 50} for i in range(limit // 50)]
+    masked = mask_payload(data={"interaction_candidates": candidates, "candidates": 40, "ok": True})
+
+    text = json.dumps(candidates)
+    assert masked["interaction_candidates"] == f"{text[:limit]}... [{len(text) - limit} chars truncated]"
+    assert (masked["candidates"], masked["ok"]) == (40, True)
+    assert mask_payload(data="short") == "short"
+    assert mask_payload(data="y" * (limit + 5)).endswith("... [5 chars truncated]")
+
+
+def test_sdk_environment_is_restored(monkeypatch):
+    monkeypatch.setenv("OTEL_BSP_MAX_QUEUE_SIZE", "10")
+    monkeypatch.delenv("LANGFUSE_MEDIA_UPLOAD_ENABLED", raising=False)
+
+    with _sdk_environ({"OTEL_BSP_MAX_QUEUE_SIZE": "2048", "LANGFUSE_MEDIA_UPLOAD_ENABLED": "false"}):
+        assert os.environ["OTEL_BSP_MAX_QUEUE_SIZE"] == "2048"
+        assert os.environ["LANGFUSE_MEDIA_UPLOAD_ENABLED"] == "false"
+
+    assert os.environ["OTEL_BSP_MAX_QUEUE_SIZE"] == "10"
+    assert "LANGFUSE_MEDIA_UPLOAD_ENABLED" not in os.environ
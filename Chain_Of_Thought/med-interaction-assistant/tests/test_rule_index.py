@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from app.class_hierarchy import ClassHierarchy
+from app.rule_index import RuleIndex, pair_key
+from app.rules import ENTITY_CLASSES, INTERACTION_RULES
+
+
+def naive_candidates(rules, hierarchy, meds, comorbidities):
+    """Every rule against every (med, med or comorbidity) pair and their ancestor sets."""
+    found = set()
+    for rule in rules:
+        for x in set(meds):
+            for y in set(meds) | set(comorbidities):
+                if x == y:
+                    continue
+                up_x, up_y = hierarchy.ancestors(x), hierarchy.ancestors(y)
+                if (rule["drug_a"] in up_x and rule["drug_b"] in up_y) or (
+                    rule["drug_b"] in up_x and rule["drug_a"] in up_y
+                ):
+                    found.add((rule["id"], pair_key(x, y)))
+    return found
+
+
+def indexed_candidates(index, meds, comorbidities):
+    return {(c["rule_id"], pair_key(*c["pair"])) for c in index.candidates(meds, comorbidities)}
+
+
+def _synthetic(rng):
+    drugs = [f"drug_{i}" for i in range(60)]
+    conditions = [f"condition_{i}" for i in range(10)]
+    leaves = [f"class_{i}" for i in range(20)]
+    parents = [f"parent_class_{i}" for i in range(5)]
+    condition_classes = [f"condition_class_{i}" for i in range(4)]
+
+    hierarchy = ClassHierarchy()
+    for d in drugs:
+        for c in rng.sample(leaves, rng.randint(1, 3)):
+            hierarchy.add(d, c)
+    for leaf in leaves:
+        for c in rng.sample(parents, rng.randint(1, 2)):
+            hierarchy.add(leaf, c)
+    for cond in conditions:
+        hierarchy.add(cond, rng.choice(condition_classes))
+
+    terms = drugs + leaves + parents
+    rules = []
+    for i in range(150):
+        kind = rng.random()
+        if kind < 0.6:
+            a, b = rng.choice(terms), rng.choice(terms)
+        else:
+            a, b = rng.choice(terms), rng.choice(conditions + condition_classes)
+        rules.append({"id": f"r{i}", "drug_a": a, "drug_b": b, "base_severity": "major", "notes": ""})
+    return drugs, conditions, hierarchy, rules
+
+
+def test_builtin_class_rules():
+    hierarchy = ClassHierarchy(ENTITY_CLASSES)
+    index = RuleIndex(INTERACTION_RULES, hierarchy)
+    meds = ["warfarin", "amiodarone", "citalopram", "ondansetron", "ibuprofen"]
+    comorbidities = ["ckd_stage_3"]
+
+    found = indexed_candidates(index, meds, comorbidities)
+    assert found == naive_candidates(INTERACTION_RULES, hierarchy, meds, comorbidities)
+    assert ("nsaid_ckd", pair_key("ibuprofen", "ckd_stage_3")) in found
+    assert sum(rule == "qt_prolonger_qt_prolonger" for rule, _ in found) == 3
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_class_rules_match_a_naive_scan(seed):
+    rng = random.Random(seed)
+    drugs, conditions, hierarchy, rules = _synthetic(rng)
+    index = RuleIndex(rules, hierarchy)
+
+    for _ in range(20):
+        meds = rng.sample(drugs, 8) + ["unknown_drug"]
+        comorbidities = rng.sample(conditions, 2) + ["unknown_condition"]
+        assert indexed_candidates(index, meds, comorbidities) == naive_candidates(rules, hierarchy, meds, comorbidities)
+
+
+def test_unknown_names_are_not_memoised():
+    hierarchy = ClassHierarchy(ENTITY_CLASSES)
+    index = RuleIndex(INTERACTION_RULES, hierarchy)
+
+    for i in range(1000):
+        assert index.candidates([f"typo_{i}", "warfarin", "amiodarone"], [f"free text {i}"])
+    assert hierarchy.ancestors("typo_0") == ("typo_0",)
+
+    assert set(index._entities) == {"warfarin", "amiodarone"}
+    assert set(hierarchy._ancestors) <= set(ENTITY_CLASSES)